@@ -1,6 +1,7 @@
 # Copyright © 2021, IBBoard
 # Licensed under GPLv3 or later - see COPYING
 
+from collections import deque
 from enum import Enum, auto
 
 
@@ -59,10 +60,17 @@ class ScatterDirection(Enum):
     SE = 8
 
 
-_wests = [ScatterDirection.NW, ScatterDirection.W, ScatterDirection.SW]
-_easts = [ScatterDirection.NE, ScatterDirection.E, ScatterDirection.SE]
-_norths = [ScatterDirection.NW, ScatterDirection.N, ScatterDirection.NE]
-_souths = [ScatterDirection.SW, ScatterDirection.S, ScatterDirection.SE]
+# The x and y change for one space of scatter in each direction
+SCATTER_OFFSETS = {
+    ScatterDirection.NW: (-1, 1),
+    ScatterDirection.N: (0, 1),
+    ScatterDirection.NE: (1, 1),
+    ScatterDirection.W: (-1, 0),
+    ScatterDirection.E: (1, 0),
+    ScatterDirection.SW: (-1, -1),
+    ScatterDirection.S: (0, -1),
+    ScatterDirection.SE: (1, -1)
+}
 
 
 class ThrowInDirection(Enum):
@@ -81,6 +89,7 @@ class PlayerStatus(Enum):
     PRONE = auto()
     STUNNED = auto()
     STUPID = auto()
+    INJURED = auto()
 
 
 class InjuryRollResult(Enum):
@@ -212,10 +221,14 @@ class Skills(Enum):
 
 
 class Position:
+    __slots__ = ('x', 'y', 'idx', '__offpitch')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.__offpitch = x < 0 or x >= PITCH_WIDTH or y < 0 or y >= PITCH_LENGTH
+        # Index into a flat, row-major board (or -1 when off the pitch)
+        self.idx = -1 if self.__offpitch else y * PITCH_WIDTH + x
 
     def add(self, dx, dy):
         return Position(self.x + dx, self.y + dy)
@@ -242,35 +255,43 @@ class Position:
 
 
 def scatter(position, direction, distance=1):
-    global _wests, _easts, _norths, _souths
-
-    new_x = position.x
-    if direction in _wests:
-        new_x -= distance
-    elif direction in _easts:
-        new_x += distance
+    if not position.is_offpitch() and 0 <= distance <= MAX_SCATTER_DISTANCE:
+        return _SCATTERS[direction][distance][position.idx]
+    return _calculate_scatter(position.x, position.y, direction, distance)
 
-    new_y = position.y
-    if direction in _norths:
-        new_y += distance
-    elif direction in _souths:
-        new_y -= distance
 
-    return Position(new_x, new_y)
+def _calculate_scatter(x, y, direction, distance):
+    dx, dy = SCATTER_OFFSETS[direction]
+    return Position(x + dx * distance, y + dy * distance)
 
 
 def throwin(position, direction_of_play, direction, distance):
-    dx = distance if position.x == 0 else -distance
+    if not position.is_offpitch() and 0 <= distance <= MAX_THROWIN_DISTANCE:
+        destination = _THROWINS[direction_of_play][direction][distance][position.idx]
+        if destination:
+            return destination
+    return _calculate_throwin(position.x, position.y, direction_of_play, direction, distance)
+
+
+def _calculate_throwin(x, y, direction_of_play, direction, distance):
+    dx = distance if x == 0 else -distance
     dy = (direction.value - 2) * distance
     if direction_of_play == PlayDirection.UP_PITCH:
         dy *= -1
-    return position.add(dx, dy)
+    return Position(x + dx, y + dy)
+
+
+# Marks the end of the iterable in Peekable, so that None can be a real item
+_END = object()
 
 
 class Peekable:
+    __slots__ = ('_iterator', '_buffer', 'consumed')
+
     def __init__(self, iterable):
-        self._generator = (item for item in iterable)
-        self._peeked = None
+        self._iterator = iter(iterable)
+        self._buffer = deque()
+        self.consumed = 0
 
     def __iter__(self):
         return self
@@ -279,22 +300,76 @@ class Peekable:
         return self.next()
 
     def next(self):
-        to_return = self._peeked
-        self._peeked = None
-        if to_return is None:
-            to_return = next(self._generator)
+        if self._buffer:
+            to_return = self._buffer.popleft()
+        else:
+            to_return = next(self._iterator)
+        self.consumed += 1
         return to_return
 
-    def peek(self):
-        if self._peeked is None:
-            self._peeked = next(self._generator, None)
-        return self._peeked
+    def peek(self, n=1, default=None):
+        """
+        Get the item `n` places ahead without consuming it, or `default` if the iterable ends before then
+        """
+        buffer = self._buffer
+        while len(buffer) < n:
+            item = next(self._iterator, _END)
+            if item is _END:
+                return default
+            buffer.append(item)
+        return buffer[n - 1]
+
+
+class TracingPeekable(Peekable):
+    """
+    A Peekable that records each item that it gives out, along with its index, in a shared trace
+    """
+    __slots__ = ('_trace',)
+
+    def __init__(self, iterable, trace):
+        super().__init__(iterable)
+        self._trace = trace
+
+    def next(self):
+        item = super().next()
+        self._trace.append((self.consumed - 1, item))
+        return item
+
+
+class TraceBuffer:
+    """
+    A generator for `Replay.set_generator()` that keeps the last `size` commands and log entries that were consumed,
+    so that they can be attached to errors without the cost of logging everything
+    """
+    def __init__(self, size=50):
+        self.__items = deque(maxlen=size)
+
+    @property
+    def size(self):
+        return self.__items.maxlen
+
+    def __call__(self, data):
+        return TracingPeekable(data, self.__items)
+
+    def clear(self):
+        self.__items.clear()
+
+    def get_items(self):
+        """
+        Get the (index, item) of the consumed items, oldest first
+        """
+        return list(self.__items)
+
+
+def format_trace(trace):
+    return [f"{type(item).__name__} {i}: {item}" for i, item in trace]
 
 
 OFF_PITCH_POSITION = Position(-1, -1)
 
 PITCH_LENGTH = 26
 PITCH_WIDTH = 15
+PITCH_CELLS = PITCH_LENGTH * PITCH_WIDTH
 WIDEZONE_WIDTH = 4
 NEAR_ENDZONE_IDX = 0
 FAR_ENDZONE_IDX = PITCH_LENGTH - 1
@@ -304,6 +379,41 @@ RIGHT_WIDEZONE_IDX = PITCH_WIDTH - WIDEZONE_WIDTH
 AFTER_HALFWAY_IDX = PITCH_LENGTH // 2
 BEFORE_HALFWAY_IDX = AFTER_HALFWAY_IDX - 1
 
+# Kick-offs scatter up to a D6 and throw-ins go up to 2D6
+MAX_SCATTER_DISTANCE = 6
+MAX_THROWIN_DISTANCE = 12
+
+
+def _build_ball_tables():
+    # Share one Position object for each space that a table entry can land on, on or off the pitch
+    margin = MAX_THROWIN_DISTANCE
+    grid = [[Position(x, y) for y in range(-margin, PITCH_LENGTH + margin)]
+            for x in range(-margin, PITCH_WIDTH + margin)]
+    cells = [(idx % PITCH_WIDTH + margin, idx // PITCH_WIDTH + margin) for idx in range(PITCH_CELLS)]
+
+    scatters = {}
+    for direction, (dx, dy) in SCATTER_OFFSETS.items():
+        scatters[direction] = tuple(tuple(grid[x + dx * distance][y + dy * distance] for x, y in cells)
+                                    for distance in range(MAX_SCATTER_DISTANCE + 1))
+
+    # The ball is only thrown in from the sidelines
+    throwins = {}
+    for play_direction in PlayDirection:
+        throwins[play_direction] = {}
+        for direction in ThrowInDirection:
+            sideline_dy = (direction.value - 2) * (-1 if play_direction == PlayDirection.UP_PITCH else 1)
+            throwins[play_direction][direction] = tuple(
+                tuple(grid[x + (distance if x == margin else -distance)][y + sideline_dy * distance]
+                      if x == margin or x == margin + LAST_COLUMN_IDX else None
+                      for x, y in cells)
+                for distance in range(MAX_THROWIN_DISTANCE + 1))
+    return scatters, throwins
+
+
+# Where the ball ends up from each space on the pitch, indexed by direction, distance and then board index
+# (and by direction of play first for throw-ins, which are only listed for spaces on the sidelines)
+_SCATTERS, _THROWINS = _build_ball_tables()
+
 
 def player_idx_to_type(idx):
     if (idx > 1):
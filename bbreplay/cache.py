@@ -0,0 +1,95 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from .compiled import FORMAT_VERSION
+
+
+CACHE_VERSION = 1
+PACKAGE_DIR = Path(__file__).parent
+# The modules that turn replays into events. Other modules (caching, compiling, indexing, pre-scanning and
+# profiling) don't change the results, so changing them doesn't invalidate cached results
+FINGERPRINTED_MODULES = ('__init__.py', 'command.py', 'log.py', 'player.py', 'replay.py', 'state.py', 'teams.py')
+_CHUNK_SIZE = 1 << 16
+
+
+def source_fingerprint(package_dir=PACKAGE_DIR):
+    """
+    Hash the source files of the package that process replays, so that results can be invalidated when the
+    processing changes
+    """
+    digest = hashlib.sha256()
+    for name in FINGERPRINTED_MODULES:
+        path = Path(package_dir) / name
+        if not path.exists():
+            continue
+        digest.update(name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReplayCache:
+    """
+    A directory of replay processing results, keyed by the content of the replay database and log and by the
+    fingerprint of the BBReplay sources, so that results are only reused when processing would give the same result
+    """
+    def __init__(self, cache_dir, fingerprint=None):
+        self.__cache_dir = Path(cache_dir)
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+        self.__fingerprint = fingerprint if fingerprint is not None else source_fingerprint()
+
+    @property
+    def fingerprint(self):
+        return self.__fingerprint
+
+    def key(self, db_path, log_path):
+        digest = hashlib.sha256()
+        for part in [str(CACHE_VERSION), self.__fingerprint, _file_hash(db_path), _file_hash(log_path)]:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def __result_path(self, key):
+        return self.__cache_dir / f'{key}.json'
+
+    def get(self, key):
+        """
+        Get the cached result for the key, or None if there isn't one
+        """
+        try:
+            with open(self.__result_path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            # A missing or corrupt entry is just a cache miss
+            return None
+
+    def put(self, key, result):
+        """
+        Cache a JSON-serialisable result for the key
+        """
+        path = self.__result_path(key)
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(result, f)
+        # Replace in one step so that other processes never read a partial entry
+        os.replace(temp_path, path)
+
+    def compiled_replay_path(self, key):
+        """
+        Get the path to store a compiled replay (see `bbreplay.compiled`) of the events for the key. The path
+        includes the compiled format version, so compiled replays from older versions are cache misses.
+        """
+        return self.__cache_dir / f'{key}.v{FORMAT_VERSION}.bbrc'
@@ -461,7 +461,16 @@ def create_command(row):
 
 
 def create_commands(db):
+    return list(iter_commands(db))
+
+
+def iter_commands(db):
+    """
+    Generate the commands from the replay database as the rows are read, without holding them all in memory
+    """
     cur = db.cursor()
-    commands = [create_command(row) for row in cur.execute('SELECT * FROM Replay_NetCommands ORDER BY ID')]
-    cur.close()
-    return commands
+    try:
+        for row in cur.execute('SELECT * FROM Replay_NetCommands ORDER BY ID'):
+            yield create_command(row)
+    finally:
+        cur.close()
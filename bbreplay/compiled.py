@@ -0,0 +1,437 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+"""
+A compiled replay file holds the processed events of a replay, so that they can be read back without the replay
+database, the log or re-processing the match.
+
+The file starts with MAGIC and a version byte, and is followed by records that each have a one byte kind, a varint
+length and a body in a compact binary encoding of JSON-like values, players, positions, enums and
+the namedtuples within events. The first record
+is the header with the team rosters. Each event is a list of its type name and its field values. Boards are written as a
+keyframe (a full GameState checkpoint) at the start of each turn, and as a delta of the parts of the checkpoint
+that changed whenever the board changes between turns. Events refer to the latest board. The last record is the
+index of the offset of each turn's keyframe, and the file ends with the eight byte offset of the index record.
+"""
+
+import struct
+from enum import Enum
+from . import Position, PITCH_WIDTH, TeamType, BlockResult, CoinToss, Role, ActionResult, ThrowResult, \
+    ScatterDirection, ThrowInDirection, InjuryRollResult, CasualtyResult, KickoffEvent, Weather, Skills
+from . import replay as replay_module
+from .player import Player
+from .replay import ActionType, StartTurn, PlayerPosition
+from .state import GameState, PLAYER_SLOTS
+from .teams import Team, CoachType
+
+
+MAGIC = b'BBRC'
+FORMAT_VERSION = 3
+
+_INDEX_OFFSET = struct.Struct('>Q')
+_FLOAT = struct.Struct('>d')
+
+# Record kinds
+_HEADER = 0
+_KEYFRAME = 1
+_DELTA = 2
+_EVENT = 3
+_INDEX = 4
+
+# Value tags
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT_VALUE = 4
+_STR = 5
+_LIST = 6
+_DICT = 7
+_TUPLE = 8
+_ENUM = 9
+_PLAYER = 10
+_PITCH_POSITION = 11
+_OFF_PITCH_POSITION = 12
+_BOARD = 13
+_NAMED_TUPLE = 14
+
+# Checkpoint values that are lists of items whose first value identifies them, so deltas only include the items
+# that changed instead of the whole list
+_KEYED_STATE = frozenset(['board', 'positions', 'moves'])
+
+# Enums are encoded by their position in these lists, so new enums and members must go at the end
+_ENUMS = [TeamType, BlockResult, CoinToss, Role, ActionResult, ThrowResult, ScatterDirection, ThrowInDirection,
+          InjuryRollResult, CasualtyResult, KickoffEvent, Weather, Skills, ActionType, CoachType]
+# Namedtuples inside event values are encoded by their position in this list, so new types must go at the end
+_NAMED_TUPLES = [PlayerPosition]
+_NAMED_TUPLE_CODES = {named_tuple: idx for idx, named_tuple in enumerate(_NAMED_TUPLES)}
+ENUM_TYPES = {enum_type.__name__: enum_type for enum_type in _ENUMS}
+_ENUM_MEMBERS = [tuple(enum_type) for enum_type in _ENUMS]
+_ENUM_CODES = {member: (enum_idx, member_idx)
+               for enum_idx, members in enumerate(_ENUM_MEMBERS) for member_idx, member in enumerate(members)}
+# All of the event namedtuples, by their type name (which isn't always the same as their name in the module)
+EVENT_TYPES = {value.__name__: value for value in vars(replay_module).values()
+               if isinstance(value, type) and issubclass(value, tuple) and hasattr(value, '_fields')}
+
+
+def write_compiled_replay(replay, path):
+    """
+    Process all of the events of a replay and write them to a compiled replay file
+    """
+    with open(path, 'wb') as f:
+        writer = CompiledReplayWriter(f, replay.get_teams())
+        for event in replay.events():
+            writer.write_event(event)
+        writer.close()
+
+
+class CompiledReplayWriter:
+    """
+    Writes events to a compiled replay file as they are generated. `close()` must be called to write the index.
+    """
+    def __init__(self, f, teams):
+        self.__file = f
+        self.__offset = 0
+        self.__frame = None
+        self.__turns = []
+        self.__event_count = 0
+        self.__write(MAGIC)
+        self.__write(bytes([FORMAT_VERSION]))
+        self.__write_record(_HEADER, {'teams': [_encode_team(team) for team in teams]})
+
+    def __write(self, data):
+        self.__file.write(data)
+        self.__offset += len(data)
+
+    def __write_record(self, kind, value):
+        body = bytearray()
+        _pack(value, body)
+        header = bytearray([kind])
+        _pack_varint(len(body), header)
+        self.__write(bytes(header))
+        self.__write(bytes(body))
+
+    def write_event(self, event):
+        board = getattr(event, 'board', None)
+        if type(event) is StartTurn:
+            # Always start a turn with a keyframe so that readers can seek to it
+            self.__turns.append([event.number, event.team.value, self.__offset])
+            self.__frame = None
+        if board is not None:
+            if not isinstance(board, GameState):
+                raise ValueError(f"Cannot compile an event with a {type(board).__name__} board - compiled replays "
+                                 "need the GameState from events() without snapshots")
+            frame = board.checkpoint()
+            if self.__frame is None:
+                self.__write_record(_KEYFRAME, frame)
+            else:
+                delta = _frame_delta(self.__frame, frame)
+                if delta:
+                    self.__write_record(_DELTA, delta)
+            self.__frame = frame
+        self.__write_record(_EVENT, [type(event).__name__] + list(event))
+        self.__event_count += 1
+
+    def close(self):
+        index_offset = self.__offset
+        self.__write_record(_INDEX, {'turns': self.__turns, 'events': self.__event_count})
+        self.__write(_INDEX_OFFSET.pack(index_offset))
+
+
+def _frame_delta(old_frame, new_frame):
+    # A flat list of the index of each changed key in the frame (times two, plus one for keyed changes) and
+    # its new value or changed items. Keys are always in the same order as the keyframe.
+    delta = []
+    for key_idx, (key, value) in enumerate(new_frame.items()):
+        old_value = old_frame[key]
+        if value == old_value:
+            continue
+        if key in _KEYED_STATE:
+            old_items = {item[0]: item for item in old_value}
+            new_items = {item[0]: item for item in value}
+            changes = [item for item_key, item in new_items.items() if old_items.get(item_key) != item]
+            # Removed items only need their key
+            changes.extend([item_key] for item_key in old_items if item_key not in new_items)
+            delta.extend([key_idx * 2 + 1, changes])
+        else:
+            delta.extend([key_idx * 2, value])
+    return delta
+
+
+def _apply_frame_delta(frame, delta):
+    keys = list(frame)
+    for i in range(0, len(delta), 2):
+        code, value = delta[i], delta[i + 1]
+        key = keys[code // 2]
+        if code % 2:
+            items = {item[0]: item for item in frame[key]}
+            for item in value:
+                if len(item) == 1:
+                    del items[item[0]]
+                else:
+                    items[item[0]] = item
+            frame[key] = list(items.values())
+        else:
+            frame[key] = value
+
+
+def _pack_varint(value, out):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _unpack_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _pack(value, out):
+    # Check for the more specific types first, because bools are ints and Positions are tuples
+    if value is None:
+        out.append(_NONE)
+    elif value is True or value is False:
+        out.append(_TRUE if value else _FALSE)
+    elif isinstance(value, Enum):
+        enum_idx, member_idx = _ENUM_CODES[value]
+        out.append(_ENUM)
+        _pack_varint(enum_idx, out)
+        _pack_varint(member_idx, out)
+    elif isinstance(value, int):
+        out.append(_INT)
+        # Zigzag encode so that small negative numbers stay small
+        _pack_varint(value * 2 if value >= 0 else -value * 2 - 1, out)
+    elif isinstance(value, float):
+        out.append(_FLOAT_VALUE)
+        out.extend(_FLOAT.pack(value))
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        out.append(_STR)
+        _pack_varint(len(data), out)
+        out.extend(data)
+    elif isinstance(value, Player):
+        if value.slot is None:
+            raise ValueError(f"Cannot compile {value} because they are not in a team")
+        out.append(_PLAYER)
+        _pack_varint(value.slot, out)
+    elif isinstance(value, Position):
+        if value.idx >= 0:
+            out.append(_PITCH_POSITION)
+            _pack_varint(value.idx, out)
+        else:
+            out.append(_OFF_PITCH_POSITION)
+            _pack(value.x, out)
+            _pack(value.y, out)
+    elif type(value) in _NAMED_TUPLE_CODES:
+        out.append(_NAMED_TUPLE)
+        _pack_varint(_NAMED_TUPLE_CODES[type(value)], out)
+        _pack_varint(len(value), out)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST if isinstance(value, list) else _TUPLE)
+        _pack_varint(len(value), out)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _pack_varint(len(value), out)
+        for key, item in value.items():
+            _pack(key, out)
+            _pack(item, out)
+    elif isinstance(value, GameState):
+        # The writer has already written the keyframe or delta for the board
+        out.append(_BOARD)
+    else:
+        raise ValueError(f"Cannot compile value of type {type(value).__name__}")
+
+
+def _unpack(data, pos, players=None, board=None):
+    tag = data[pos]
+    pos += 1
+    if tag == _NONE:
+        return None, pos
+    elif tag == _FALSE:
+        return False, pos
+    elif tag == _TRUE:
+        return True, pos
+    elif tag == _INT:
+        value, pos = _unpack_varint(data, pos)
+        return (value >> 1 if not value & 1 else -((value + 1) >> 1)), pos
+    elif tag == _FLOAT_VALUE:
+        return _FLOAT.unpack_from(data, pos)[0], pos + _FLOAT.size
+    elif tag == _STR:
+        length, pos = _unpack_varint(data, pos)
+        return bytes(data[pos:pos + length]).decode('utf-8'), pos + length
+    elif tag == _LIST or tag == _TUPLE or tag == _NAMED_TUPLE:
+        if tag == _NAMED_TUPLE:
+            type_idx, pos = _unpack_varint(data, pos)
+        length, pos = _unpack_varint(data, pos)
+        items = []
+        for _ in range(length):
+            item, pos = _unpack(data, pos, players, board)
+            items.append(item)
+        if tag == _NAMED_TUPLE:
+            return _NAMED_TUPLES[type_idx](*items), pos
+        return (items if tag == _LIST else tuple(items)), pos
+    elif tag == _DICT:
+        length, pos = _unpack_varint(data, pos)
+        items = {}
+        for _ in range(length):
+            key, pos = _unpack(data, pos)
+            items[key], pos = _unpack(data, pos, players, board)
+        return items, pos
+    elif tag == _ENUM:
+        enum_idx, pos = _unpack_varint(data, pos)
+        member_idx, pos = _unpack_varint(data, pos)
+        return _ENUM_MEMBERS[enum_idx][member_idx], pos
+    elif tag == _PLAYER:
+        slot, pos = _unpack_varint(data, pos)
+        return players[slot], pos
+    elif tag == _PITCH_POSITION:
+        idx, pos = _unpack_varint(data, pos)
+        return Position(idx % PITCH_WIDTH, idx // PITCH_WIDTH), pos
+    elif tag == _OFF_PITCH_POSITION:
+        x, pos = _unpack(data, pos)
+        y, pos = _unpack(data, pos)
+        return Position(x, y), pos
+    elif tag == _BOARD:
+        return board, pos
+    else:
+        raise ValueError(f"Unknown compiled value tag {tag}")
+
+
+def _read_file_record(f):
+    kind = f.read(1)[0]
+    length = 0
+    shift = 0
+    while True:
+        byte = f.read(1)[0]
+        length |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    value, _ = _unpack(f.read(length), 0)
+    return kind, value
+
+
+def _read_record(data, pos):
+    kind = data[pos]
+    length, pos = _unpack_varint(data, pos + 1)
+    return kind, pos, pos + length
+
+
+def _encode_team(team):
+    return {
+        'name': team.name,
+        'race': team.race,
+        'team_value': team.team_value,
+        'fame': team.fame,
+        'rerolls': team.rerolls,
+        'apothecaries': team.apothecaries,
+        'team_type': team.team_type.value,
+        'coach_type': team.coach_type.value,
+        'players': [[team.get_player_idx(player), player.number, player.name, player.MA, player.ST, player.AG,
+                     player.AV, player.level, player.SPP, player.value, [skill.name for skill in player.skills]]
+                    for player in team.get_players()]
+    }
+
+
+def _decode_team(data):
+    team = Team(data['name'], data['race'], data['team_value'], data['fame'], data['rerolls'],
+                data['apothecaries'], TeamType(data['team_type']), CoachType(data['coach_type']))
+    for idx, number, name, move, strength, agility, armour_value, level, spp, value, skills in data['players']:
+        team.add_player(idx, Player(number, name, move, strength, agility, armour_value, level, spp, value,
+                                    [Skills[skill] for skill in skills]))
+    return team
+
+
+class CompiledReplay:
+    """
+    A replay read from a compiled replay file. Events are equivalent to those from `Replay.events(snapshots=True)`.
+    """
+    def __init__(self, path):
+        self.__path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a compiled replay")
+            version = f.read(1)[0]
+            if version != FORMAT_VERSION:
+                # Version 1 files started with the big-endian length of a JSON header, so this byte was always zero
+                raise ValueError(f"Unsupported compiled replay version {version or 1} in {path}")
+            kind, header = _read_file_record(f)
+            if kind != _HEADER:
+                raise ValueError(f"{path} is not a compiled replay")
+            self.__events_offset = f.tell()
+            f.seek(-_INDEX_OFFSET.size, 2)
+            index_offset, = _INDEX_OFFSET.unpack(f.read(_INDEX_OFFSET.size))
+            f.seek(index_offset)
+            _, index = _read_file_record(f)
+        self.__index_offset = index_offset
+        self.__event_count = index['events']
+        self.__turns = [(turn, TeamType(team), offset) for turn, team, offset in index['turns']]
+        self.home_team, self.away_team = (_decode_team(team) for team in header['teams'])
+
+    def get_teams(self):
+        return self.home_team, self.away_team
+
+    def get_team(self, team_type):
+        if team_type == TeamType.HOME:
+            return self.home_team
+        elif team_type == TeamType.AWAY:
+            return self.away_team
+        else:
+            raise ValueError(f"Cannot get team for {team_type}")
+
+    def get_turns(self):
+        """
+        Get the (turn, team type) of each turn in the replay, in order
+        """
+        return [(turn, team) for turn, team, _ in self.__turns]
+
+    def __len__(self):
+        return self.__event_count
+
+    def events(self, from_turn=None):
+        """
+        Generate the events of the match. With `from_turn`, events start at the first turn at or after that turn
+        number without reading the earlier events.
+        """
+        offset = self.__events_offset
+        if from_turn is not None:
+            offset = next((turn_offset for turn, _, turn_offset in self.__turns if turn >= from_turn),
+                          self.__index_offset)
+        players = [None] * PLAYER_SLOTS
+        for team in self.get_teams():
+            for player in team.get_players():
+                players[player.slot] = player
+        state = GameState(self.home_team, self.away_team, TeamType.HOME)
+        frame = None
+        board = None
+        with open(self.__path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(self.__index_offset - offset)
+        pos = 0
+        while pos < len(data):
+            kind, start, pos = _read_record(data, pos)
+            if kind == _EVENT:
+                record, _ = _unpack(data, start, players, board)
+                yield EVENT_TYPES[record[0]](*record[1:])
+            elif kind == _KEYFRAME or kind == _DELTA:
+                value, _ = _unpack(data, start)
+                if kind == _KEYFRAME:
+                    frame = value
+                else:
+                    _apply_frame_delta(frame, value)
+                state.restore(frame)
+                board = state.snapshot()
+            else:
+                raise ValueError(f"Unexpected compiled replay record kind {kind}")
@@ -0,0 +1,54 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+from collections import defaultdict, namedtuple
+from .replay import EndTurn, SetupComplete
+
+
+IndexEntry = namedtuple('IndexEntry', ['replay_id', 'event', 'turn', 'team'])
+
+
+class PositionIndex:
+    """
+    An index of board hashes at every SetupComplete and EndTurn event, for finding layouts (such as kick-off
+    setups) that recur between replays
+    """
+    def __init__(self):
+        self.__entries = defaultdict(list)
+        self.__mirrored_entries = defaultdict(list)
+
+    def add(self, replay_id, event):
+        """
+        Record the board of a SetupComplete or EndTurn event. Other events are ignored.
+        """
+        if isinstance(event, SetupComplete):
+            board = event.board
+            turn_team = board.turn_team
+            entry = IndexEntry(replay_id, SetupComplete.__name__, board.turn,
+                               turn_team.team_type if turn_team else None)
+        elif isinstance(event, EndTurn):
+            board = event.board
+            entry = IndexEntry(replay_id, EndTurn.__name__, event.number, event.team)
+        else:
+            return
+        self.__entries[board.board_hash].append(entry)
+        self.__mirrored_entries[board.mirrored_board_hash].append(entry)
+
+    def add_replay(self, replay_id, replay):
+        for event in replay.events():
+            self.add(replay_id, event)
+
+    def find(self, board_hash):
+        """
+        Find the recorded boards with an identical layout to the board with the given hash
+        """
+        return list(self.__entries.get(board_hash, []))
+
+    def find_mirrored(self, board_hash):
+        """
+        Find the recorded boards whose layout is the inverse of the board with the given hash
+        """
+        return list(self.__mirrored_entries.get(board_hash, []))
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.__entries.values())
@@ -577,7 +577,70 @@ def parse_log_entries(log_path):
         return parse_log_entry_lines(f)
 
 
+def parse_match_log_entry(log_path):
+    with open(log_path, 'r') as f:
+        return parse_match_log_entry_lines(f)
+
+
+def parse_match_log_entry_lines(lines):
+    """
+    Parse the MatchLogEntry at the start of the match without parsing the rest of the log. Returns None if the first
+    entry of the match isn't a MatchLogEntry.
+    """
+    match_started = False
+    in_block = False
+    for line in lines:
+        line = line.strip()
+        if not match_started:
+            if line == "|  +- Enter CStateMatchTossCreateResults":
+                match_started = True
+            else:
+                continue
+        if line.startswith("|  +- Enter CStateMatch"):
+            in_block = True
+        elif line.startswith("|  +- Exit CStateMatch"):
+            in_block = False
+        elif in_block:
+            result = gamelog_re.search(line)
+            if result:
+                log_entry = parse_log_entry(result.group(1), None, None)
+                if log_entry:
+                    return log_entry if isinstance(log_entry, MatchLogEntry) else None
+    return None
+
+
 def parse_log_entry_lines(lines):
+    return list(iter_log_entry_lines(lines))
+
+
+def iter_log_entries(log_path):
+    """
+    Generate the log entries of a log file as it is read, without holding the whole log in memory
+    """
+    with open(log_path, 'r') as f:
+        yield from iter_log_entry_lines(f)
+
+
+# Casualty and apothecary entries get moved back in front of these (see `iter_log_entry_lines`)
+_REORDERABLE_LOG_ENTRIES = (BounceLogEntry, CatchEntry, ArmourValueRollEntry, InjuryRollEntry)
+
+
+def _release_log_entries(log_entries):
+    # Everything before the last entry that can't have entries moved in front of it is in its final order
+    for i in range(len(log_entries) - 1, 0, -1):
+        if type(log_entries[i]) not in _REORDERABLE_LOG_ENTRIES:
+            released = log_entries[:i]
+            del log_entries[:i]
+            return released
+    return []
+
+
+def iter_log_entry_lines(lines):
+    """
+    Generate the log entries from the lines of a log. Entries are buffered until later entries can no longer
+    be moved in front of them, so the buffer stays small however long the log is.
+    """
+    # The entries that might still be reordered, after the first entry that can't be
     log_entries = []
     extra_log_entries = []
     partial_entry = None
@@ -590,6 +653,8 @@ def parse_log_entry_lines(lines):
     was_spell = False
 
     for line in lines:
+        if len(log_entries) > 1:
+            yield from _release_log_entries(log_entries)
         line = line.strip()
         if not match_started:
             if line == "|  +- Enter CStateMatchTossCreateResults":
@@ -677,4 +742,4 @@ def parse_log_entry_lines(lines):
                 log_entries.append(DisconnectEntry(TeamType.HOME))
             elif line == "|  | Team Away is set as responsible for the disconnection.":
                 log_entries.append(DisconnectEntry(TeamType.AWAY))
-    return log_entries
+    yield from log_entries
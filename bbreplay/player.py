@@ -1,8 +1,6 @@
 # Copyright © 2021, IBBoard
 # Licensed under GPLv3 or later - see COPYING
 
-from . import PlayerStatus, OFF_PITCH_POSITION
-
 
 MA_TO_STAT = {
     17: 2,
@@ -43,14 +41,6 @@ AV_TO_STAT = {
 }
 
 
-class Positionable:
-    def __init__(self):
-        self.position = OFF_PITCH_POSITION
-
-    def is_on_pitch(self):
-        return not self.position.is_offpitch()
-
-
 def create_player(team, number, name, move, strength, agility, armour_value, level, spp, value):
     try:
         # Use Float to handle "XX." values (nothing after the decimal point)
@@ -64,10 +54,10 @@ def create_player(team, number, name, move, strength, agility, armour_value, lev
     return Player(number, name, ma_stat, st_stat, ag_stat, av_stat, level, spp, value, [])
 
 
-class Player(Positionable):
+class Player:
     def __init__(self, number, name, move, strength, agility, armour_value, level, spp, value, skills):
-        super().__init__()
         self.team = None
+        self.slot = None
         self.number = number
         self.name = name
         self.MA = move
@@ -77,9 +67,17 @@ class Player(Positionable):
         self.level = level
         self.SPP = spp
         self.value = value
-        self.status = PlayerStatus.OKAY
         self.skills = skills
 
+    @property
+    def position(self):
+        # Positions moved to GameState so that several games can share the same players
+        raise AttributeError("Player.position has been removed - use GameState.get_player_position(player)")
+
+    @property
+    def status(self):
+        raise AttributeError("Player.status has been removed - use GameState.get_player_status(player)")
+
     def __repr__(self):
         return f"Player(number={self.number}, name={self.name}, " \
-               f"level={self.level}, spp={self.SPP}, value={self.value}, {self.position})"
+               f"level={self.level}, spp={self.SPP}, value={self.value})"
@@ -0,0 +1,128 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+"""
+A quick structural check that the commands and log entries of a replay line up, using only their types, teams
+and turn numbers. It predicts where `Replay.events()` will fail without processing the match.
+"""
+
+import sqlite3
+from collections import namedtuple
+from . import TeamType
+from .command import create_commands, Command, SetupCommand, SetupCompleteCommand, KickoffCommand, \
+    PreKickoffCompleteCommand, TouchbackCommand, EndTurnCommand, DeclineRerollCommand, CoinTossCommand, \
+    RoleCommand, AbandonMatchCommand
+from .log import parse_log_entries, KickDirectionLogEntry, TurnOverEntry
+
+
+# A turn in the commands, within the drive that started with the numbered kick-off
+TurnSummary = namedtuple('TurnSummary', ['drive', 'turn', 'team', 'end_turn_command'])
+PrescanProblem = namedtuple('PrescanProblem', ['drive', 'turn', 'team', 'message'])
+PrescanReport = namedtuple('PrescanReport', ['kickoff_commands', 'kickoff_entries', 'end_turn_commands',
+                                             'turnover_entries', 'turns', 'problems'])
+
+KICKOFF_COMMANDS = (SetupCommand, SetupCompleteCommand, KickoffCommand, PreKickoffCompleteCommand, TouchbackCommand)
+_IGNORED_COMMANDS = (CoinTossCommand, RoleCommand, AbandonMatchCommand, DeclineRerollCommand)
+_TEAMS = (TeamType.HOME, TeamType.AWAY)
+
+
+def prescan_replay(db_path, log_path):
+    db = sqlite3.connect(db_path)
+    try:
+        commands = create_commands(db)
+    finally:
+        db.close()
+    return prescan(commands, parse_log_entries(log_path))
+
+
+def prescan(commands, log_entries):
+    """
+    Check that the turn-level structure of the commands matches the log and return a PrescanReport. Problems
+    are in the order that processing would find them, so the first one is where processing is likely to fail.
+    """
+    command_drives = _command_drives(commands)
+    log_drives = _log_drives(log_entries)
+    kickoff_commands = sum(1 for cmd in commands if type(cmd) is KickoffCommand)
+    end_turn_commands = sum(1 for cmd in commands if type(cmd) is EndTurnCommand and not cmd.is_verbose)
+    turnover_entries = sum(len(turnovers) for turnovers in log_drives)
+
+    problems = []
+    for drive, (turns, turnovers) in enumerate(zip(command_drives, log_drives)):
+        problem = _check_drive(drive, turns, turnovers)
+        if problem:
+            problems.append(problem)
+    if len(command_drives) != len(log_drives):
+        drive = min(len(command_drives), len(log_drives))
+        turns = command_drives[drive] if drive < len(command_drives) else []
+        first_turn = turns[0] if turns else None
+        problems.append(PrescanProblem(drive, first_turn.turn if first_turn else None,
+                                       first_turn.team if first_turn else None,
+                                       f"{kickoff_commands} kick-off commands but {len(log_drives)} kick-off "
+                                       "log entries"))
+
+    return PrescanReport(kickoff_commands, len(log_drives), end_turn_commands, turnover_entries,
+                         [turn for turns in command_drives for turn in turns], problems)
+
+
+def _command_drives(commands):
+    drives = []
+    turns = None
+    in_kickoff = False
+    current = None
+    for cmd in commands:
+        if cmd.is_verbose or isinstance(cmd, _IGNORED_COMMANDS) or type(cmd) is Command:
+            continue
+        if isinstance(cmd, KICKOFF_COMMANDS):
+            if not in_kickoff:
+                turns = []
+                drives.append(turns)
+                in_kickoff = True
+                current = None
+            continue
+        if turns is None:
+            continue
+        in_kickoff = False
+        if current is None or cmd.turn != current['turn']:
+            current = {'turn': cmd.turn, 'team': None, 'end_turn_command': False}
+            turns.append(current)
+        if current['team'] is None and cmd.team in _TEAMS:
+            current['team'] = cmd.team
+        if isinstance(cmd, EndTurnCommand):
+            current['end_turn_command'] = True
+    return [[TurnSummary(drive, turn['turn'], turn['team'], turn['end_turn_command']) for turn in turns]
+            for drive, turns in enumerate(drives)]
+
+
+def _log_drives(log_entries):
+    drives = []
+    for log_entry in log_entries:
+        if isinstance(log_entry, KickDirectionLogEntry):
+            drives.append([])
+        elif isinstance(log_entry, TurnOverEntry) and drives:
+            drives[-1].append(log_entry)
+    return drives
+
+
+def _check_drive(drive, turns, turnovers):
+    remaining = list(turnovers)
+    for i, turn in enumerate(turns):
+        if turn.end_turn_command:
+            continue
+        if remaining and remaining[0].team == turn.team:
+            remaining.pop(0)
+        elif i == len(turns) - 1:
+            # The last turn of a drive can end with a touchdown or the end of the half instead of a turnover
+            pass
+        elif remaining:
+            return PrescanProblem(drive, turn.turn, turn.team,
+                                  f"Turn ended without an EndTurnCommand but the next turnover in the log is for "
+                                  f"{remaining[0].team}")
+        else:
+            return PrescanProblem(drive, turn.turn, turn.team,
+                                  "Turn ended without an EndTurnCommand but there are no more turnovers in the log")
+    if remaining:
+        last_turn = turns[-1] if turns else None
+        return PrescanProblem(drive, last_turn.turn if last_turn else None, last_turn.team if last_turn else None,
+                              f"{len(remaining)} more turnovers in the log than turns that ended without an "
+                              "EndTurnCommand")
+    return None
@@ -0,0 +1,103 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+"""
+Opt-in profiling of where `Replay.events()` spends its time, by the `_process_*` method of the replay that
+generated the events
+"""
+
+import functools
+import inspect
+import time
+
+
+PROFILED_PREFIXES = ('_process_', '__process_')
+# Private methods that don't follow the naming pattern but do a share of the processing
+PROFILED_PRIVATE_METHODS = ('__resolve_ball',)
+
+
+class ReplayProfiler:
+    """
+    Records the calls, cumulative time and events generated for each `_process_*` method (and the private
+    `__process_*` and `__resolve_ball` methods) of the replays that it is attached to. Times and event counts
+    include nested calls, so `_process_turn` includes `_process_movement`. Times don't include the time that
+    the code using `Replay.events()` spends handling each event.
+    """
+    def __init__(self):
+        self.__stats = {}
+
+    def attach(self, replay):
+        """
+        Profile the replay's processing methods. This only affects the given replay object (and the copies that
+        its event generators use), and event generators for it that are started afterwards.
+        """
+        replay_type = type(replay)
+        methods = {}
+        for name, method in inspect.getmembers(replay_type, inspect.isfunction):
+            profiled_name = _unmangle(replay_type, name)
+            if profiled_name.startswith(PROFILED_PREFIXES) or profiled_name in PROFILED_PRIVATE_METHODS:
+                methods[name] = _profile_method(method, self.__stats.setdefault(profiled_name, [0, 0.0, 0]))
+        # Override the methods in a subclass so that they are profiled for any copy of the replay, and so that
+        # calls to name-mangled private methods are profiled too
+        methods['__module__'] = replay_type.__module__
+        replay.__class__ = type(replay_type.__name__, (replay_type,), methods)
+
+    def merge(self, stats):
+        """
+        Add stats from `get_stats()` of another profiler, such as for other replays in a batch
+        """
+        for name, values in stats.items():
+            totals = self.__stats.setdefault(name, [0, 0.0, 0])
+            totals[0] += values['calls']
+            totals[1] += values['time']
+            totals[2] += values['events']
+
+    def get_stats(self):
+        """
+        Get the calls, time (in seconds) and events of each method that has been called, by method name
+        """
+        return {name: {'calls': calls, 'time': total_time, 'events': events}
+                for name, (calls, total_time, events) in sorted(self.__stats.items()) if calls}
+
+
+def _unmangle(cls, name):
+    # Private methods are stored as _ClassName__method for the class that defined them
+    for klass in cls.__mro__:
+        prefix = f'_{klass.__name__}__'
+        if name.startswith(prefix):
+            return name[len(prefix) - 2:]
+    return name
+
+
+def _profile_method(method, stats):
+    @functools.wraps(method)
+    def profiled(*args, **kwargs):
+        stats[0] += 1
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            stats[1] += time.perf_counter() - start
+        # Some methods return another method's generator instead of being generators themselves
+        if inspect.isgenerator(result):
+            return _profile_generator(result, stats)
+        return result
+    return profiled
+
+
+def _profile_generator(generator, stats):
+    # Only time the generator while it is running, not while the caller has the event
+    timer = time.perf_counter
+    try:
+        while True:
+            start = timer()
+            try:
+                event = next(generator)
+            except StopIteration as ex:
+                return ex.value
+            finally:
+                stats[1] += timer() - start
+            stats[2] += 1
+            yield event
+    finally:
+        generator.close()
@@ -1,20 +1,24 @@
 # Copyright © 2021, IBBoard
 # Licensed under GPLv3 or later - see COPYING
 
+import copy
 import itertools
 import sqlite3
 import os.path
-from collections import namedtuple
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum, auto
 from . import Peekable, other_team, CoinToss, TeamType, ActionResult, BlockResult, Skills, InjuryRollResult, \
-    scatter, throwin, KickoffEvent, Role, ThrowResult, _norths, _souths, \
-    PITCH_LENGTH, PITCH_WIDTH, LAST_COLUMN_IDX, NEAR_ENDZONE_IDX, FAR_ENDZONE_IDX, OFF_PITCH_POSITION
+    scatter, throwin, KickoffEvent, Role, ThrowResult, SCATTER_OFFSETS, TraceBuffer, \
+    PITCH_CELLS, PITCH_LENGTH, PITCH_WIDTH, LAST_COLUMN_IDX, NEAR_ENDZONE_IDX, FAR_ENDZONE_IDX, OFF_PITCH_POSITION, \
+    Position
 from .command import *
 from .log import WeatherLogEntry, parse_log_entries, MatchLogEntry, StupidEntry, DodgeEntry, SkillEntry, \
     PickupEntry, TentacledEntry, RerollEntry, TurnOverEntry, BounceLogEntry, FoulAppearanceEntry, LeapEntry, \
     ThrowInDirectionLogEntry, CatchEntry, KORecoveryEntry, ThrowEntry, GoingForItEntry, WildAnimalEntry, \
     SkillRollEntry, ApothecaryLogEntry, LeaderRerollEntry, SpellEntry, ThrowTeammateEntry, LandingEntry, \
-    ArmourValueRollEntry, AlwaysHungryEntry, DisconnectEntry
+    ArmourValueRollEntry, AlwaysHungryEntry, DisconnectEntry, KickDirectionLogEntry, KickoffEventLogEntry, \
+    InjuryRollEntry, CasualtyRollEntry, parse_match_log_entry, iter_log_entries
 from .state import GameState
 from .teams import create_team
 
@@ -33,6 +37,17 @@ class ActionType(Enum):
     WILD_ANIMAL = auto()
 
 
+class PlayerPosition(namedtuple('PlayerPosition', ['player', 'position'])):
+    """
+    A player and their position in a TeamSetupComplete event. Other attributes come from the player, so code
+    that used `player.position` on the old list of players still works.
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(self.player, name)
+
+
 class AbandonMatchException(Exception):
     def __init__(self, _team):
         self.team = _team
@@ -81,35 +96,127 @@ ThrowIn = namedtuple('ThrowIn', ['start_space', 'end_space', 'direction', 'dista
 Touchdown = namedtuple('Touchdown', ['player', 'board'])
 Touchback = namedtuple('Touchback', ['player', 'board'])
 Spell = namedtuple('Spell', ['target', 'spell', 'board'])
+ProcessingError = namedtuple('ProcessingError', ['team', 'turn', 'error_type', 'message', 'board'])
 
 END_REASON_TOUCHDOWN = 'Touchdown!'
 END_REASON_RIOT = 'Riot!'
+END_REASON_ERROR = 'Processing error'
+
+# Events that the replay doesn't depend on while processing, so `events(include=...)` and `run()` can skip
+# creating them
+SKIPPABLE_EVENTS = frozenset([Movement, FailedMovement, TeamSetupComplete, Pushback, FollowUp, Bounce, Scatter,
+                              ThrowIn])
+
+# The states of the ball while it is resolved after a bounce, throw-in or catch
+# Rolls for the other team's players that come from the team knocking them down, so they belong to the same turn
+_SKIPPED_OPPONENT_ENTRIES = (ArmourValueRollEntry, InjuryRollEntry, CasualtyRollEntry)
+
+_BALL_BOUNCE = 0
+_BALL_THROWIN = 1
+_BALL_CATCH = 2
 
+# The GameState at the start of a turn, and how many commands and log entries had been consumed
+TurnCheckpoint = namedtuple('TurnCheckpoint', ['turn', 'team', 'receiver', 'state', 'command_cursor', 'log_cursor'])
 
-def create_replay(db_path, log_path):
+
+def create_replay(db_path, log_path, parallel=False, lazy=False, streaming=False):
+    """
+    Load a replay from its database and log. With `parallel=True` (or `'thread'`), the database is loaded in
+    a worker thread while the log is parsed. With `parallel='process'`, the log is parsed in a subprocess
+    while the database is loaded, which is faster for large logs because parsing doesn't share the GIL.
+
+    With `lazy=True`, a LazyReplay is returned that only loads each part of the replay when it is first used.
+    With `streaming=True`, the commands and log entries are read as the events are generated (see `Replay`).
+    """
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"No replay database file at {db_path}")
-    db = sqlite3.connect(db_path)
-    home_team = create_team(db, TeamType.HOME)
-    away_team = create_team(db, TeamType.AWAY)
-    commands = create_commands(db)
-    log_entries = parse_log_entries(log_path)
+    if streaming:
+        if parallel or lazy:
+            raise ValueError("Streaming replays read the database and log as they go, so cannot be parallel or lazy")
+        db = sqlite3.connect(db_path)
+        home_team = create_team(db, TeamType.HOME)
+        away_team = create_team(db, TeamType.AWAY)
+        replay = Replay(home_team, away_team, _stream_commands(db), iter_log_entries(log_path), streaming=True)
+        replay.validate()
+        return replay
+    elif lazy:
+        if parallel:
+            raise ValueError("Lazy replays load each part when it is first used, so cannot load in parallel")
+        replay = LazyReplay(db_path, log_path)
+        replay.validate()
+        return replay
+    elif parallel == 'process':
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            log_future = executor.submit(parse_log_entries, log_path)
+            home_team, away_team, commands = _load_database(db_path)
+            log_entries = log_future.result()
+    elif parallel is True or parallel == 'thread':
+        # SQLite connections can't be shared between threads, so the worker opens its own
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            db_future = executor.submit(_load_database, db_path)
+            log_entries = parse_log_entries(log_path)
+            home_team, away_team, commands = db_future.result()
+    elif not parallel:
+        home_team, away_team, commands = _load_database(db_path)
+        log_entries = parse_log_entries(log_path)
+    else:
+        raise ValueError(f"Unknown parallel loading mode {parallel}")
     replay = Replay(home_team, away_team, commands, log_entries)
     replay.validate()
     return replay
 
 
+def _stream_commands(db):
+    try:
+        yield from iter_commands(db)
+    finally:
+        db.close()
+
+
+def _load_database(db_path):
+    db = sqlite3.connect(db_path)
+    try:
+        return create_team(db, TeamType.HOME), create_team(db, TeamType.AWAY), create_commands(db)
+    finally:
+        db.close()
+
+
 class Replay:
-    def __init__(self, home_team, away_team, commands, log_entries):
+    def __init__(self, home_team, away_team, commands, log_entries, streaming=False):
+        """
+        With `streaming=True`, the replay only keeps iterators over the commands and log entries, so that they can
+        be garbage collected as they're processed. Events can then only be generated once and there are no turn
+        checkpoints to resume from.
+        """
         self.home_team = home_team
         self.away_team = away_team
-        self.__commands = commands
-        self.__log_entries = log_entries
+        self.__streaming = streaming
+        self.__streamed = False
+        if streaming:
+            self.__commands = iter(commands)
+            # Peekable so that validation can look ahead at the match entry without losing it
+            self.__log_entries = Peekable(log_entries)
+        else:
+            self.__commands = commands
+            self.__log_entries = log_entries
         self.__generator = self.__default_generator
+        self.__checkpoints = {}
+        self.__command_handlers = dict(COMMAND_HANDLERS)
+        self.__kickoff_handlers = dict(KICKOFF_HANDLERS)
+        self.__block_choice_handlers = dict(BLOCK_CHOICE_HANDLERS)
+        self.__resolved_command_handlers = {}
+        self.__resolved_block_choice_handlers = {}
+        self.__handler_calls = Counter()
+        self.__skipped_events = frozenset()
+        self.__recover = False
 
     def validate(self):
-        log_entry = self.__log_entries[1]
+        if self.__streaming:
+            self._validate_match_log_entry(self.__log_entries.peek(2))
+        else:
+            self._validate_match_log_entry(self.__log_entries[1])
 
+    def _validate_match_log_entry(self, log_entry):
         if type(log_entry) is not MatchLogEntry:
             raise ValueError("Log did not start with MatchLog entry")
         if log_entry.home_name != self.home_team.name:
@@ -140,21 +247,164 @@ class Replay:
         else:
             self.__generator = self.__default_generator
 
-    def events(self):
-        log_entries = self.__generator(log_entry for log_entry in self.__log_entries)
-
-        def iterate_commands():
-            for cmd in self.__commands:
-                if cmd.is_verbose:
-                    continue
-                elif isinstance(cmd, AbandonMatchCommand):
-                    raise AbandonMatchException(cmd.team)
-                yield cmd
+    def register_command_handler(self, command_type, handler):
+        """
+        Register a handler for commands of the given type (and its subclasses) during a turn.
+
+        Handlers are called as `handler(replay, cmd, prev_cmd_type, cmds, log_entries, board)` with the command
+        still waiting in `cmds` and return an iterable of events, or None to move on to the next command.
+        """
+        self.__command_handlers[command_type] = handler
+        self.__resolved_command_handlers.clear()
+
+    def register_kickoff_handler(self, kickoff_event, handler):
+        """
+        Register a handler for a kick-off event result.
+
+        Handlers are called as `handler(replay, kickoff_result, cmds, log_entries, board)` and return an iterable
+        of events.
+        """
+        self.__kickoff_handlers[kickoff_event] = handler
+
+    def register_block_choice_handler(self, command_type, handler):
+        """
+        Register a handler for commands of the given type that come before the block dice choice.
+
+        Handlers are called as `handler(replay, blocking_player, block_dice, cmds, log_entries, board)` and
+        return a generator of events that returns the new block dice log entry and block choice command.
+        """
+        self.__block_choice_handlers[command_type] = handler
+        self.__resolved_block_choice_handlers.clear()
+
+    def get_handler_counts(self):
+        """
+        Get how many times each command, kick-off and block choice handler has been called, by handler name
+        """
+        counts = Counter()
+        for handler, count in self.__handler_calls.items():
+            counts[getattr(handler, '__name__', repr(handler))] += count
+        return counts
+
+    def run(self, handlers, from_turn=None):
+        """
+        Process the match and call the handler for each event's type, as an alternative to `events()` for
+        consumers that only care about some types of events.
+
+        `handlers` maps event types (such as `Movement` or `EndTurn`) to a function that takes the event.
+        Events without a handler are skipped in the same way as for `events(include=...)`.
+        `from_turn` works in the same way as for `events()`.
+        """
+        for event in self.events(from_turn=from_turn, include=handlers):
+            handlers[type(event)](event)
+
+    def events(self, snapshots=False, from_turn=None, journal=False, include=None, exclude=None, recover=False,
+               checkpoints=False):
+        """
+        Generate the events of the match.
+
+        By default, every event with a `board` refers to the same GameState, which changes as the match
+        progresses. With `snapshots=True`, each event gets an immutable BoardSnapshot of the state when
+        the event happened instead, so events can be buffered before they are used.
+
+        With `from_turn`, events start at the first turn at or after that turn number. Turns that happen during
+        a kick-off (such as a Blitz) are part of the kick-off, so events start at the next normal turn.
+
+        With `checkpoints=True`, the replay records a checkpoint at the start of each normal turn, so later calls
+        with `from_turn` resume from the nearest checkpoint instead of processing the earlier turns again.
+        Checkpoints need the generator to count the items that it has consumed, like Peekable does.
+
+        With `journal=True`, the GameState journals its changes from the first event with a board, with one
+        step per event with a board. Viewers can then use `board.undo()` and `board.redo()` to step back and
+        forth between events, as long as they redo all of the steps before getting the next event.
+
+        With `include` and/or `exclude`, only events whose type is included and not excluded are generated.
+        The board still changes in the same way, but events that nothing else depends on (see SKIPPABLE_EVENTS)
+        aren't created at all, which makes processing faster for consumers that only want a few types of event.
+
+        With `recover=True`, a turn that can't be processed doesn't stop the match. Instead, there is a
+        ProcessingError event, the rest of the turn's commands and log entries are skipped, and the turn ends with
+        an EndTurn event for END_REASON_ERROR. Players are moved to where the skipped commands moved them, and
+        players that the skipped log entries knocked down, injured or gave the ball to are updated to match.
+        A kick-off that can't be processed can't be recovered from, because the log can't be lined up with the
+        turns after it, so the events end with a ProcessingError instead of raising the error.
+
+        When the generator is a TraceBuffer, each call records the commands and log entries that it consumes in its
+        own TraceBuffer of the same size, which is the `trace` attribute of the events. Exceptions get a
+        `replay_trace` attribute with the last commands and log entries that were consumed before the error.
+        """
+        if snapshots and journal:
+            raise ValueError("Journals need the live board, so cannot be used with snapshots")
+        if checkpoints and self.__streaming:
+            raise ValueError("Streaming replays cannot resume from checkpoints, so they don't record them")
+        if self.__streaming:
+            if self.__streamed:
+                raise ValueError("Streaming replays can only generate their events once")
+            self.__streamed = True
+        replay = self
+        filtered = include is not None or exclude is not None
+        tracing = isinstance(self.__generator, TraceBuffer)
+        if filtered or recover or tracing:
+            # Use a shallow copy so that these options don't affect other event generators for this replay
+            replay = copy.copy(self)
+        if tracing:
+            replay.__generator = TraceBuffer(self.__generator.size)
+        if filtered:
+            include = frozenset(include) if include is not None else None
+            exclude = frozenset(exclude) if exclude is not None else frozenset()
+            replay.__skipped_events = frozenset(event_type for event_type in SKIPPABLE_EVENTS
+                                                if not _is_wanted(event_type, include, exclude))
+        if recover:
+            replay.__recover = True
+            # Recovered turns aren't what really happened, so keep their checkpoints separate
+            replay.__checkpoints = dict(self.__checkpoints)
+        checkpoint = replay.get_checkpoint(from_turn) if from_turn is not None else None
+        if checkpoint:
+            events = replay.__resume_events(checkpoint, from_turn, checkpoints)
+        else:
+            events = replay.__events(from_turn, checkpoints)
+        if filtered:
+            events = _filter_events(events, include, exclude)
+        if snapshots:
+            events = _snapshot_events(events)
+        elif journal:
+            events = _journal_events(events)
+        if tracing:
+            events = _TracedEvents(events, replay.__generator)
+        return events
+
+    def get_checkpoints(self):
+        return list(self.__checkpoints.values())
+
+    def get_checkpoint(self, turn):
+        """
+        Get the checkpoint that is nearest to the start of the given turn without being after it, or None
+        """
+        earlier = [checkpoint for checkpoint in self.__checkpoints.values() if checkpoint.turn <= turn]
+        if not earlier:
+            return None
+        start = [checkpoint for checkpoint in earlier if checkpoint.turn == turn]
+        if start:
+            return min(start, key=lambda checkpoint: checkpoint.command_cursor)
+        return max(earlier, key=lambda checkpoint: checkpoint.command_cursor)
+
+    def __iterate_commands(self):
+        for cmd in self.__commands:
+            if cmd.is_verbose:
+                continue
+            elif isinstance(cmd, AbandonMatchCommand):
+                raise AbandonMatchException(cmd.team)
+            yield cmd
 
-        cmds = self.__generator(cmd for cmd in iterate_commands())
+    def __events(self, from_turn, checkpoints):
+        log_entries = self.__generator(log_entry for log_entry in self.__log_entries)
+        cmds = self.__generator(cmd for cmd in self.__iterate_commands())
+        if checkpoints:
+            _check_consumed(cmds)
+            _check_consumed(log_entries)
 
         randomisation = next(log_entries)
-        yield MatchEvent()
+        if from_turn is None:
+            yield MatchEvent()
 
         _ = next(log_entries)  # Dispose of match entry
         toss_cmd = find_next_known_command(cmds)
@@ -180,37 +430,163 @@ class Replay:
             toss_result = CoinToss.TAILS
         else:
             toss_result = CoinToss.HEADS
-        yield CoinTossEvent(toss_team, toss_choice, toss_result, role_team, role_cmd.choice)
+        if from_turn is None:
+            yield CoinTossEvent(toss_team, toss_choice, toss_result, role_team, role_cmd.choice)
         receiver = role_team if role_cmd.choice == Role.RECEIVE else other_team(role_team)
         board = GameState(self.home_team, self.away_team, receiver)
         weather = next(log_entries)
         board.set_weather(weather.result)
-        yield WeatherTuple(board.weather)
+        if from_turn is None:
+            yield WeatherTuple(board.weather)
 
+        yield from self.__process_drives(cmds, log_entries, board, receiver, 0, 0, from_turn, checkpoints)
+
+    def __resume_events(self, checkpoint, from_turn, checkpoints):
+        command_cursor = checkpoint.command_cursor
+        log_cursor = checkpoint.log_cursor
+        cmds = self.__generator(itertools.islice(self.__iterate_commands(), command_cursor, None))
+        log_entries = self.__generator(itertools.islice(self.__log_entries, log_cursor, None))
+        if checkpoints:
+            _check_consumed(cmds)
+            _check_consumed(log_entries)
+        board = GameState(self.home_team, self.away_team, checkpoint.receiver)
+        board.restore(checkpoint.state)
+        yield from self.__process_drives(cmds, log_entries, board, checkpoint.receiver,
+                                         command_cursor, log_cursor, from_turn, checkpoints, checkpoint.team)
+
+    def __process_drives(self, cmds, log_entries, board, receiver, command_offset, log_offset, from_turn,
+                         checkpoints, first_team=None):
+        # Events are skipped until the first normal turn at or after from_turn, so kick-off turns never match
+        skipping = from_turn is not None
         while True:
             try:
-                yield from self._process_kickoff(cmds, log_entries, board)
+                if first_team is None:
+                    kickoff_events = self._process_kickoff(cmds, log_entries, board)
+                    if self.__recover:
+                        kickoff_events = _recover_kickoff(kickoff_events, board)
+                    for event in kickoff_events:
+                        if type(event) is ProcessingError:
+                            yield event
+                            return
+                        elif not skipping:
+                            yield event
+                    first_team = board.receiving_team
                 drive_ended = False
-                team_order = itertools.cycle((board.receiving_team, board.kicking_team))
+                team_order = itertools.cycle((first_team, other_team(first_team)))
+                first_team = None
                 while not drive_ended:
-                    for event in self._process_turn(cmds, log_entries, next(team_order), board):
+                    team = next(team_order)
+                    turn_events = self._process_turn(cmds, log_entries, team, board)
+                    if self.__recover:
+                        turn_events = self.__recover_turn(turn_events, team, cmds, log_entries, board)
+                    for event in turn_events:
                         event_type = type(event)
-                        if event_type in [Touchdown]:
+                        if event_type is StartTurn:
+                            if checkpoints:
+                                self.__checkpoints[(board.turn, team)] = \
+                                    TurnCheckpoint(board.turn, team, receiver, board.checkpoint(),
+                                                   command_offset + cmds.consumed, log_offset + log_entries.consumed)
+                            if skipping and board.turn >= from_turn:
+                                skipping = False
+                        elif event_type in [Touchdown]:
                             drive_ended = True
                         elif event_type is EndMatch:
                             return
-                        yield event
+                        if not skipping:
+                            yield event
                         if event_type == EndTurn:
                             if board.turn == 8 and board.turn_team.team_type != receiver:
                                 board.halftime()
-                                yield HalfTime(board)
+                                if not skipping:
+                                    yield HalfTime(board)
                                 drive_ended = True
                             elif board.turn == 16 and board.turn_team.team_type == receiver:
                                 return
             except AbandonMatchException as e:
-                yield AbandonMatch(e.team, board)
+                if not skipping:
+                    yield AbandonMatch(e.team, board)
                 return
 
+    def __recover_turn(self, events, team, cmds, log_entries, board):
+        first_cmd = cmds.peek()
+        started = False
+        try:
+            for event in events:
+                if type(event) is StartTurn:
+                    started = True
+                yield event
+        except (ValueError, NotImplementedError) as ex:
+            yield ProcessingError(team, board.turn, type(ex).__name__, str(ex), board)
+            if not started:
+                board.start_turn(team)
+            turn = first_cmd.turn if first_cmd else None
+            ended_by_command = self.__skip_turn_commands(team, turn, cmds, board)
+            self.__apply_skipped_log_entries(_skip_turn_log_entries(team, ended_by_command, log_entries), board)
+            yield EndTurn(team, board.turn, END_REASON_ERROR, board)
+            board.end_turn(team)
+
+    def __skip_turn_commands(self, team, turn, cmds, board):
+        """
+        Skip the rest of the commands for the turn and move players to where the skipped commands moved, pushed
+        and followed them. Returns whether the turn ended with an EndTurnCommand.
+        """
+        ended_by_command = False
+        blocker = None
+        target = None
+        target_position = None
+        while True:
+            cmd = cmds.peek()
+            if cmd is None or cmd.turn != turn:
+                break
+            next(cmds)
+            if isinstance(cmd, EndTurnCommand) and cmd.team == team:
+                ended_by_command = True
+                break
+            elif isinstance(cmd, MovementCommand) and not cmd.position.is_offpitch():
+                _move_skipped_player(self.get_team(cmd.team).get_player(cmd.player_idx), cmd.position, board)
+            elif isinstance(cmd, TargetPlayerCommand) and cmd.target_team != cmd.team:
+                blocker = self.get_team(cmd.team).get_player(cmd.player_idx)
+                target = self.get_team(cmd.target_team).get_player(cmd.target_player)
+                target_position = None
+            elif isinstance(cmd, PushbackCommand) and target and target_position is None:
+                # Only the first pushback moves the target - any later ones are chain pushes
+                target_position = board.get_player_position(target)
+                _move_skipped_player(target, cmd.position, board)
+            elif isinstance(cmd, FollowUpChoiceCommand) and cmd.choice and target_position:
+                _move_skipped_player(blocker, target_position, board)
+        return ended_by_command
+
+    def __apply_skipped_log_entries(self, log_entries, board):
+        """
+        Update the board with what we can tell from skipped log entries: armour rolls knock players down, injuries
+        other than stunned remove them, successful pickups and catches give players the ball, and bounces move a
+        dropped ball
+        """
+        for log_entry in log_entries:
+            if isinstance(log_entry, BounceLogEntry):
+                ball_position = scatter(board.get_ball_position(), log_entry.direction)
+                if not board.get_ball_carrier() and not ball_position.is_offpitch():
+                    board.set_ball_position(ball_position)
+                continue
+            elif not isinstance(log_entry, (PickupEntry, CatchEntry, ArmourValueRollEntry, InjuryRollEntry)):
+                continue
+            try:
+                player = self.get_team(log_entry.team).get_player_by_number(log_entry.player)
+            except (KeyError, ValueError):
+                continue
+            if not board.is_on_pitch(player):
+                continue
+            if isinstance(log_entry, (PickupEntry, CatchEntry)):
+                if log_entry.result == ActionResult.SUCCESS:
+                    board.set_ball_carrier(player)
+            elif isinstance(log_entry, ArmourValueRollEntry):
+                board.set_prone(player)
+                if board.get_ball_carrier() == player:
+                    board.set_ball_carrier(None)
+            elif log_entry.result != InjuryRollResult.STUNNED:
+                board.reset_position(board.get_player_position(player))
+                board.set_injured(player)
+
     def get_commands(self):
         return self.__commands
 
@@ -298,7 +674,8 @@ class Replay:
                     old_position = ball_dest
                     ball_dest = scatter(ball_dest, log_entry.direction)
                     board.set_ball_position(ball_dest)
-                    yield Bounce(old_position, ball_dest, log_entry.direction, board)
+                    if Bounce not in self.__skipped_events:
+                        yield Bounce(old_position, ball_dest, log_entry.direction, board)
                 if ball_dest.is_offpitch():
                     touchback = True
 
@@ -315,57 +692,58 @@ class Replay:
         kickoff_result = kickoff_event.result
         board.kickoff_event = kickoff_result
         yield KickoffEventTuple(kickoff_result)
-        if kickoff_result == KickoffEvent.GET_THE_REF:
-            # We don't currently track bribes, but each team will get one
-            pass
-        elif kickoff_result == KickoffEvent.RIOT:
-            if board.turn == 1 or board.turn == 9:
-                board.start_turn(board.receiving_team)
-                yield StartTurn(board.receiving_team, board.turn, board)
-                yield EndTurn(board.receiving_team, board.turn, END_REASON_RIOT, board)
-                board.end_turn(board.receiving_team)
-                board.start_turn(board.kicking_team)
-                yield StartTurn(board.kicking_team, board.turn, board)
-                yield EndTurn(board.kicking_team, board.turn, END_REASON_RIOT, board)
-                board.end_turn(board.kicking_team)
-            elif board.turn == 8 or board.turn == 16:
-                board.roll_back_turn()
-                pass
-            else:
-                raise NotImplementedError(f"{kickoff_result} not yet implemented in current conditions")
-        elif kickoff_result == KickoffEvent.PERFECT_DEFENCE:
-            yield from self._process_team_setup(board.kicking_team, cmds, board)
-            board.setup_complete()
-            yield SetupComplete(board)
-        elif kickoff_result == KickoffEvent.HIGH_KICK:
-            high_kick_catch = next(log_entries)
-            catcher = self.get_team(high_kick_catch.team).get_player_by_number(high_kick_catch.player)
-            old_position = catcher.position
-            new_position = board.get_ball_position()
-            board.reset_position(old_position)
-            board.set_position(new_position, catcher)
-            if high_kick_catch.result == ActionResult.SUCCESS:
-                board.set_ball_carrier(catcher)
-            yield Movement(catcher, old_position, new_position, board)
-            yield Action(catcher, ActionType.CATCH, high_kick_catch.result, board)
-        elif kickoff_result == KickoffEvent.CHEERING_FANS or kickoff_result == KickoffEvent.BRILLIANT_COACHING:
-            # XXX: We need to check reroll log events to identify who got the free reroll
-            pass
-        elif kickoff_result == KickoffEvent.CHANGING_WEATHER:
-            while isinstance(log_entries.peek(), WeatherLogEntry):
-                weather = next(log_entries)  # Sometimes this duplicates, but we don't care
-            board.set_weather(weather.result)
-            yield WeatherTuple(board.weather)
-        elif kickoff_result == KickoffEvent.QUICK_SNAP:
-            board.quick_snap()
-            yield from self._process_turn(cmds, log_entries, board.receiving_team, board)
-        elif kickoff_result == KickoffEvent.BLITZ:
-            board.blitz()
-            yield from self._process_turn(cmds, log_entries, board.kicking_team, board)
-        elif kickoff_result == KickoffEvent.PITCH_INVASION:
-            raise NotImplementedError("Cannot process 'Pitch Invasion' event because injured players aren't identified")
-        else:
+        handler = self.__kickoff_handlers.get(kickoff_result)
+        if handler is None:
             raise NotImplementedError(f"{kickoff_result} not yet implemented")
+        self.__handler_calls[handler] += 1
+        yield from handler(self, kickoff_result, cmds, log_entries, board)
+
+    def _process_riot(self, kickoff_result, board):
+        if board.turn == 1 or board.turn == 9:
+            board.start_turn(board.receiving_team)
+            yield StartTurn(board.receiving_team, board.turn, board)
+            yield EndTurn(board.receiving_team, board.turn, END_REASON_RIOT, board)
+            board.end_turn(board.receiving_team)
+            board.start_turn(board.kicking_team)
+            yield StartTurn(board.kicking_team, board.turn, board)
+            yield EndTurn(board.kicking_team, board.turn, END_REASON_RIOT, board)
+            board.end_turn(board.kicking_team)
+        elif board.turn == 8 or board.turn == 16:
+            board.roll_back_turn()
+        else:
+            raise NotImplementedError(f"{kickoff_result} not yet implemented in current conditions")
+
+    def _process_perfect_defence(self, cmds, board):
+        yield from self._process_team_setup(board.kicking_team, cmds, board)
+        board.setup_complete()
+        yield SetupComplete(board)
+
+    def _process_high_kick(self, log_entries, board):
+        high_kick_catch = next(log_entries)
+        catcher = self.get_team(high_kick_catch.team).get_player_by_number(high_kick_catch.player)
+        old_position = board.get_player_position(catcher)
+        new_position = board.get_ball_position()
+        board.reset_position(old_position)
+        board.set_position(new_position, catcher)
+        if high_kick_catch.result == ActionResult.SUCCESS:
+            board.set_ball_carrier(catcher)
+        if Movement not in self.__skipped_events:
+            yield Movement(catcher, old_position, new_position, board)
+        yield Action(catcher, ActionType.CATCH, high_kick_catch.result, board)
+
+    def _process_changing_weather(self, log_entries, board):
+        while isinstance(log_entries.peek(), WeatherLogEntry):
+            weather = next(log_entries)  # Sometimes this duplicates, but we don't care
+        board.set_weather(weather.result)
+        yield WeatherTuple(board.weather)
+
+    def _process_quick_snap(self, cmds, log_entries, board):
+        board.quick_snap()
+        yield from self._process_turn(cmds, log_entries, board.receiving_team, board)
+
+    def _process_blitz_kickoff(self, cmds, log_entries, board):
+        board.blitz()
+        yield from self._process_turn(cmds, log_entries, board.kicking_team, board)
 
     def _process_team_setup(self, team_type, cmds, board):
         cmd = next(cmds, None)
@@ -375,8 +753,8 @@ class Replay:
             if cmd.team != team_type:
                 raise ValueError(f"Expecting SetupCommand for {team_type} but got {cmd.team}")
             player = team.get_player(cmd.player_idx)
-            old_coords = player.position
-            if player.is_on_pitch():
+            old_coords = board.get_player_position(player)
+            if board.is_on_pitch(player):
                 board.reset_position(old_coords)
 
             coords = cmd.position
@@ -392,12 +770,14 @@ class Replay:
             endzone_contents = board[NEAR_ENDZONE_IDX][i]
             if endzone_contents:
                 board[NEAR_ENDZONE_IDX][i] = None
-                endzone_contents.position = OFF_PITCH_POSITION
+                board.set_position(OFF_PITCH_POSITION, endzone_contents)
             endzone_contents = board[FAR_ENDZONE_IDX][i]
             if endzone_contents:
                 board[FAR_ENDZONE_IDX][i] = None
-                endzone_contents.position = OFF_PITCH_POSITION
-        yield TeamSetupComplete(team_type, team.get_players())
+                board.set_position(OFF_PITCH_POSITION, endzone_contents)
+        if TeamSetupComplete not in self.__skipped_events:
+            yield TeamSetupComplete(team_type, [PlayerPosition(player, board.get_player_position(player))
+                                                for player in team.get_players()])
 
     def _process_turn(self, cmds, log_entries, expected_team, board):
         cmd = None
@@ -445,36 +825,14 @@ class Replay:
                 log_entry = next(log_entries)
                 validate_log_entry(log_entry, TurnOverEntry, expected_team)
                 events = [EndTurn(expected_team, board.turn, log_entry.reason, board)]
-            elif isinstance(cmd, TargetPlayerCommand):
-                targeting_player = self.get_team(cmd.team).get_player(cmd.player_idx)
-                target_by_idx = self.get_team(cmd.target_team).get_player(cmd.target_player)
-                is_block = targeting_player.team != target_by_idx.team
-                if is_block:
-                    events = self._process_block(targeting_player, target_by_idx, cmds, log_entries, board)
-                elif not cmd.position.is_offpitch():
-                    # Regular throws use 255,255 but throw teammate uses the target coords
-                    events = self._process_throw_teammate(targeting_player, target_by_idx, cmds, log_entries, board)
-                else:
-                    events = self._process_throw(targeting_player, target_by_idx, cmds, log_entries, board)
-            elif isinstance(cmd, MovementCommand):
-                player = self.get_team(cmd.team).get_player(cmd.player_idx)
-                # We stop when the movement stops, so the returned command is the EndMovementCommand
-                events = self._process_movement(player, cmds, log_entries, board)
-            elif isinstance(cmd, SpellCommand):
-                events = self._process_spell(cmds, log_entries, board)
-            elif cmd_type is Command:
-                next(cmds)
-                continue
-            elif cmd_type is DeclineRerollCommand or (cmd_type is DiceChoiceCommand
-                                                      and prev_cmd_type is DeclineRerollCommand):
-                # FIXME: We should be handling these, but it's not always clear how they associate with events
-                next(cmds)
-                continue
-            elif cmd_type is EndTurnCommand:
-                next(cmds)
-                events = [EndTurn(cmd.team, board.turn, 'End Turn', board)]
             else:
-                raise NotImplementedError(f"No handling for {cmd}")
+                handler = _resolve_handler(self.__command_handlers, self.__resolved_command_handlers, cmd_type)
+                if handler is None:
+                    raise NotImplementedError(f"No handling for {cmd}")
+                self.__handler_calls[handler] += 1
+                events = handler(self, cmd, prev_cmd_type, cmds, log_entries, board)
+                if events is None:
+                    continue
 
             for event in events:
                 yield event
@@ -541,7 +899,7 @@ class Replay:
         reroll_success = False
         if reroll_skill and reroll_skill in player.skills \
            and not any(cancelling_skill in opponent.skills
-                       for opponent in board.get_surrounding_players(player.position)):
+                       for opponent in board.get_surrounding_players(board.get_player_position(player))):
             log_entry = next(log_entries)
             validate_log_entry(log_entry, SkillEntry, player.team.team_type, player.number)
             actions.append(Reroll(player.team.team_type, reroll_skill.name.title()))
@@ -603,7 +961,7 @@ class Replay:
     def _process_injury_roll(self, player, cmds, log_entries, board):
         injury_roll = next(log_entries)
         if injury_roll.result != InjuryRollResult.STUNNED:
-            board.reset_position(player.position)
+            board.reset_position(board.get_player_position(player))
             board.set_injured(player)
         yield InjuryRoll(player, injury_roll.result)
         if injury_roll.result == InjuryRollResult.INJURED:
@@ -623,7 +981,7 @@ class Replay:
                                             cmds, log_entries, board)
 
     def _process_apothecary(self, player, injury, casualty_result, cmds, log_entries, board):
-        if player.position.is_offpitch():
+        if not board.is_on_pitch(player):
             # Assume we're using older rules where apothecaries can't help players in the crowd
             return
         if injury == InjuryRollResult.STUNNED:
@@ -737,6 +1095,21 @@ class Replay:
 
         yield from self.__process_block_rolls(targeting_player, target_by_idx, cmds, moved, log_entries, board)
 
+    def _process_block_pro_reroll(self, blocking_player, block_dice, cmds, log_entries, board):
+        reroll = next(log_entries)
+        yield Action(blocking_player, ActionType.PRO, reroll.result, board)
+        if reroll.result == ActionResult.SUCCESS:
+            yield Reroll(reroll.team, 'Pro')
+            _ = next(log_entries)  # Burn the random duplication
+        elif len(block_dice.results) == 2 and block_dice.results[0] == block_dice.results[1]:
+            _ = next(cmds)  # Burn the reroll prompt that shows as a block dice choice
+        return next(log_entries), next(cmds)
+
+    def _process_block_reroll(self, blocking_player, cmds, log_entries, board):
+        _, actions = self.__process_reroll_command(log_entries, blocking_player, board)
+        yield from actions
+        return next(log_entries), next(cmds)
+
     def __process_block_rolls(self, targeting_player, target_by_idx, cmds, moved,
                               log_entries, board, frenzied_block=False):
         if Skills.FOUL_APPEARANCE in target_by_idx.skills:
@@ -787,21 +1160,11 @@ class Replay:
         board.throw_block(blocking_player)
         block_dice = next(log_entries)
         block_choice = next(cmds)
-        if isinstance(block_choice, ProRerollCommand):
-            reroll = next(log_entries)
-            yield Action(blocking_player, ActionType.PRO, reroll.result, board)
-            if reroll.result == ActionResult.SUCCESS:
-                yield Reroll(reroll.team, 'Pro')
-                _ = next(log_entries)  # Burn the random duplication
-            elif len(block_dice.results) == 2 and block_dice.results[0] == block_dice.results[1]:
-                _ = next(cmds)  # Burn the reroll prompt that shows as a block dice choice
-            block_dice = next(log_entries)
-            block_choice = next(cmds)
-        elif isinstance(block_choice, RerollCommand):
-            _, actions = self.__process_reroll_command(log_entries, blocking_player, board)
-            yield from actions
-            block_dice = next(log_entries)
-            block_choice = next(cmds)
+        handler = _resolve_handler(self.__block_choice_handlers, self.__resolved_block_choice_handlers,
+                                   type(block_choice))
+        if handler is not None:
+            self.__handler_calls[handler] += 1
+            block_dice, block_choice = yield from handler(self, blocking_player, block_dice, cmds, log_entries, board)
         chosen_block_dice = block_dice.results[block_choice.dice_idx]
         yield Block(blocking_player, target_by_idx,
                     block_dice.results, chosen_block_dice)
@@ -823,12 +1186,12 @@ class Replay:
                 attacker_avoided = True
                 defender_avoided = True
 
-        block_position = target_by_idx.position
+        block_position = board.get_player_position(target_by_idx)
 
         if chosen_block_dice == BlockResult.PUSHED or chosen_block_dice == BlockResult.DEFENDER_DOWN \
            or chosen_block_dice == BlockResult.DEFENDER_STUMBLES:
-            origin_coords = blocking_player.position
-            old_coords = target_by_idx.position
+            origin_coords = board.get_player_position(blocking_player)
+            old_coords = board.get_player_position(target_by_idx)
             pushbacks = calculate_pushbacks(origin_coords, old_coords, board)
             board.reset_position(old_coords)
 
@@ -851,9 +1214,10 @@ class Replay:
                     cmd = next(cmds)
                     new_coords = cmd.position
                     dest_content = board.get_position(new_coords)
-                    origin_coords = pushed_player.position
+                    origin_coords = board.get_player_position(pushed_player)
                     board.set_position(new_coords, pushed_player)
-                    yield Pushback(pushing_player, pushed_player, old_coords, new_coords, board)
+                    if Pushback not in self.__skipped_events:
+                        yield Pushback(pushing_player, pushed_player, old_coords, new_coords, board)
                     if dest_content:
                         pushing_player = pushed_player
                         pushed_player = dest_content
@@ -865,7 +1229,8 @@ class Replay:
             else:
                 new_coords = pushbacks[0]
                 board.set_position(new_coords, target_by_idx)
-                yield Pushback(blocking_player, target_by_idx, old_coords, new_coords, board)
+                if Pushback not in self.__skipped_events:
+                    yield Pushback(blocking_player, target_by_idx, old_coords, new_coords, board)
 
             can_fend = Skills.FEND in target_by_idx.skills \
                 and (not moved or Skills.JUGGERNAUT not in blocking_player.skills)
@@ -887,10 +1252,11 @@ class Replay:
                 raise ValueError(f"Unexpected follow-up situation - next command is {type(cmds.peek()).__name__}")
 
             if follow_up:
-                old_coords = blocking_player.position
+                old_coords = board.get_player_position(blocking_player)
                 board.reset_position(old_coords)
                 board.set_position(block_position, blocking_player)
-                yield FollowUp(blocking_player, target_by_idx, old_coords, block_position, board)
+                if FollowUp not in self.__skipped_events:
+                    yield FollowUp(blocking_player, target_by_idx, old_coords, block_position, board)
 
         attacker_avoided = False
         defender_avoided = False
@@ -921,7 +1287,7 @@ class Replay:
             yield from self._process_armour_roll(blocking_player, cmds, log_entries, board)
 
         ball_bounces = False
-        if target_by_idx.position.is_offpitch():
+        if not board.is_on_pitch(target_by_idx):
             yield from self._process_injury_roll(target_by_idx, cmds, log_entries, board)
             if board.get_ball_carrier() == target_by_idx:
                 board.set_ball_position(block_position)  # Drop the ball so the throw-in works
@@ -931,7 +1297,7 @@ class Replay:
                 and not defender_avoided:
             yield from self._process_armour_roll(target_by_idx, cmds, log_entries, board)
 
-            pushed_into_ball = target_by_idx.position == board.get_ball_position()
+            pushed_into_ball = board.get_player_position(target_by_idx) == board.get_ball_position()
             if board.get_ball_carrier() == target_by_idx or pushed_into_ball:
                 ball_bounces = True
 
@@ -974,7 +1340,7 @@ class Replay:
         if isinstance(cmds.peek(), MovementCommand):
             yield from self._process_movement(player, cmds, log_entries, board)
         pass_cmd = cmds.peek()
-        player_pos = player.position
+        player_pos = board.get_player_position(player)
         if abs(pass_cmd.x - player_pos.x) > 1 or abs(pass_cmd.y - player_pos.y) > 1:
             yield from self._process_pass(player, cmds, log_entries, board)
             if not board.get_ball_carrier():
@@ -1062,7 +1428,8 @@ class Replay:
             landing_position = scatter(landing_position, scatter_3.direction)
             board.reset_position(pickup_command.position)
             board.set_position(landing_position, target_by_idx)
-            yield Scatter(throw_command.position, landing_position, board)
+            if Scatter not in self.__skipped_events:
+                yield Scatter(throw_command.position, landing_position, board)
         # else it was a fumble and players lands where they started
 
         landing_entry = next(log_entries)
@@ -1095,7 +1462,7 @@ class Replay:
         failed_movement = False
         pickup_entry = None
         diving_tackle_entry = None
-        start_space = player.position
+        start_space = board.get_player_position(player)
         turnover = False
         is_prone = board.is_prone(player)
         is_ball_carrier = board.get_ball_carrier() == player
@@ -1117,7 +1484,8 @@ class Replay:
                     board.set_position(target_space, player)
                     if target_space == board.get_ball_position():
                         yield from self._process_ball_movement(cmds, log_entries, board)
-                yield FailedMovement(player, start_space, target_space)
+                if FailedMovement not in self.__skipped_events:
+                    yield FailedMovement(player, start_space, target_space)
                 start_space = target_space
                 continue
 
@@ -1239,10 +1607,12 @@ class Replay:
                     yield from self.__unset_prone(player, log_entries, board)
                     is_prone = False
                 board.move(player, start_space, target_space)
-                yield Movement(player, start_space, target_space, board)
+                if Movement not in self.__skipped_events:
+                    yield Movement(player, start_space, target_space, board)
             elif turnover:
                 board.move(player, start_space, target_space)
-                yield FailedMovement(player, start_space, target_space)
+                if FailedMovement not in self.__skipped_events:
+                    yield FailedMovement(player, start_space, target_space)
                 if is_ball_carrier:
                     yield from self._process_ball_movement(cmds, log_entries, board)
                     board.set_ball_carrier(None)
@@ -1251,7 +1621,8 @@ class Replay:
                 if is_prone:
                     yield from self.__unset_prone(player, log_entries, board)
                     is_prone = False
-                yield FailedMovement(player, start_space, target_space)
+                if FailedMovement not in self.__skipped_events:
+                    yield FailedMovement(player, start_space, target_space)
 
             if diving_tackle_entry:
                 diving_tackle = next(cmds)
@@ -1260,7 +1631,7 @@ class Replay:
                 team = self.get_team(diving_tackle_entry.team)
                 diving_player = team.get_player_by_number(diving_tackle_entry.player)
                 # Don't use the move() function because it's not regular movement
-                board.reset_position(diving_player.position)
+                board.reset_position(board.get_player_position(diving_player))
                 board.set_position(start_space, diving_player)
                 board.set_prone(diving_player)
                 yield DivingTackle(diving_player, start_space)
@@ -1351,7 +1722,8 @@ class Replay:
             start_position = board.get_ball_position()
             ball_position = scatter(start_position, scatter_entry.direction)
             board.set_ball_position(ball_position)
-            yield Bounce(start_position, ball_position, scatter_entry.direction, board)
+            if Bounce not in self.__skipped_events:
+                yield Bounce(start_position, ball_position, scatter_entry.direction, board)
         elif result == ThrowResult.ACCURATE_PASS:
             ball_position = throw_command.position
             board.set_ball_position(ball_position)
@@ -1363,92 +1735,103 @@ class Replay:
             ball_position = scatter(ball_position, scatter_2.direction)
             ball_position = scatter(ball_position, scatter_3.direction)
             board.set_ball_position(ball_position)
-            yield Scatter(throw_command.position, ball_position, board)
+            if Scatter not in self.__skipped_events:
+                yield Scatter(throw_command.position, ball_position, board)
 
         if result != ThrowResult.FUMBLE or board.get_position(board.get_ball_position()):
-            yield from self._process_catch(ball_position, cmds, log_entries, board,
-                                           bounce_on_empty=result != ThrowResult.FUMBLE)
+            yield from self._process_catch(cmds, log_entries, board)
 
-    def _process_catch(self, ball_position, cmds, log_entries, board, bounce_on_empty=False):
-        catcher = board.get_position(ball_position)
-        caught = False
-        if catcher and not board.is_prone(catcher):
-            catch_entry = next(log_entries)
-            for event in self._process_action_result(catch_entry, CatchEntry, cmds, log_entries, catcher,
-                                                     ActionType.CATCH, board, is_active=False):
-                if isinstance(event, Action) and event.action == ActionType.CATCH \
-                        and event.result == ActionResult.SUCCESS:
-                    board.set_ball_carrier(catcher)
-                    caught = True
-                yield event
-        if not caught or (not catcher and bounce_on_empty):
-            yield from self._process_ball_movement(cmds, log_entries, board)
+    def _process_catch(self, cmds, log_entries, board):
+        return self.__resolve_ball(_BALL_CATCH, cmds, log_entries, board)
 
     def _process_ball_movement(self, cmds, log_entries, board):
-        if isinstance(log_entries.peek(), ThrowInDirectionLogEntry):
-            yield from self._process_throwin(cmds, log_entries, board)
-            return
+        return self.__resolve_ball(_BALL_BOUNCE, cmds, log_entries, board)
 
+    def _process_throwin(self, cmds, log_entries, board):
+        return self.__resolve_ball(_BALL_THROWIN, cmds, log_entries, board)
+
+    def __resolve_ball(self, state, cmds, log_entries, board):
+        # Catches, bounces and throw-ins can lead to each other any number of times, so we loop until
+        # the ball comes to rest instead of recursing for each one
+        while state is not None:
+            if state == _BALL_CATCH:
+                catcher = board.get_position(board.get_ball_position())
+                state = _BALL_BOUNCE
+                if catcher and not board.is_prone(catcher):
+                    catch_entry = next(log_entries)
+                    for event in self._process_action_result(catch_entry, CatchEntry, cmds, log_entries, catcher,
+                                                             ActionType.CATCH, board, is_active=False):
+                        if isinstance(event, Action) and event.action == ActionType.CATCH \
+                                and event.result == ActionResult.SUCCESS:
+                            board.set_ball_carrier(catcher)
+                            state = None
+                        yield event
+            elif state == _BALL_THROWIN:
+                log_entry = next(log_entries)
+                if not isinstance(log_entry, ThrowInDirectionLogEntry):
+                    raise ValueError(f"Expected ThrowInDirection log entry but got {type(log_entry).__name__}")
+                distance_entry = next(log_entries)
+                previous_ball_position = board.get_ball_position()
+                ball_position = throwin(previous_ball_position, board.get_play_direction(),
+                                        log_entry.direction, distance_entry.distance)
+                board.set_ball_position(ball_position)
+                if ThrowIn not in self.__skipped_events:
+                    yield ThrowIn(previous_ball_position, ball_position, log_entry.direction,
+                                  distance_entry.distance, board)
+                state = _BALL_BOUNCE
+            elif isinstance(log_entries.peek(), ThrowInDirectionLogEntry):
+                state = _BALL_THROWIN
+            else:
+                state = yield from self.__bounce_ball(log_entries, board)
+
+    def __bounce_ball(self, log_entries, board):
         log_entry = next(log_entries)
         if not isinstance(log_entry, BounceLogEntry):
             raise ValueError(f"Expected BounceLogEntry but got {type(log_entry).__name__}")
+        direction = log_entry.direction
         old_ball_position = board.get_ball_position()
-        ball_position = scatter(old_ball_position, log_entry.direction)
+        ball_position = scatter(old_ball_position, direction)
         board.set_ball_position(ball_position)
-        bounce_event = Bounce(old_ball_position, ball_position, log_entry.direction, board)
+        emit_bounce = Bounce not in self.__skipped_events
         if ball_position.is_offpitch():
-            yield bounce_event
+            if emit_bounce:
+                yield Bounce(old_ball_position, ball_position, direction, board)
             if ball_position.x < 0 or ball_position.x >= PITCH_WIDTH:
-                offset = 0
                 # Throw-ins from fumbled pickups seem to come from the space where the ball
                 # would have landed if there was an off-board space rather than the one adjacent
                 # to where the pickup was attempted
-                if log_entry.direction in _norths:
-                    offset = 1
-                elif log_entry.direction in _souths:
-                    offset = -1
+                _, offset = SCATTER_OFFSETS[direction]
                 board.set_ball_position(old_ball_position.add(0, offset))
-            yield from self._process_throwin(cmds, log_entries, board)
+            return _BALL_THROWIN
         elif board.get_position(ball_position):
             # Bounced to an occupied space, so we need to continue for a catch or a bounce off a prone body
             player_in_space = board.get_position(ball_position)
             if board.is_prone(player_in_space):
-                yield bounce_event
-                yield from self._process_ball_movement(cmds, log_entries, board)
+                if emit_bounce:
+                    yield Bounce(old_ball_position, ball_position, direction, board)
+                return _BALL_BOUNCE
+            log_entry = log_entries.peek()
+            if isinstance(log_entry, CatchEntry):
+                if emit_bounce:
+                    yield Bounce(old_ball_position, ball_position, direction, board)
+                return _BALL_CATCH
+            elif isinstance(log_entry, BounceLogEntry):
+                # The first bounce was a ghost bounce that never happened, so ignore it
+                board.set_ball_position(old_ball_position)
+                return _BALL_BOUNCE
             else:
-                log_entry = log_entries.peek()
-                if isinstance(log_entry, CatchEntry):
-                    yield bounce_event
-                    yield from self._process_catch(ball_position, cmds, log_entries, board)
-                elif isinstance(log_entry, BounceLogEntry):
-                    # The first bounce was a ghost bounce that never happened, so ignore it
-                    board.set_ball_position(old_ball_position)
-                    yield from self._process_ball_movement(cmds, log_entries, board)
-                else:
-                    raise ValueError("Expected CatchEntry or BounceEntry after bounce, "
-                                     f"got {type(log_entry).__name__}")
+                raise ValueError("Expected CatchEntry or BounceEntry after bounce, "
+                                 f"got {type(log_entry).__name__}")
         else:
             # Bounced to an empty space
             # But sometimes it gets a ghost bounce
             if isinstance(log_entries.peek(), BounceLogEntry):
-                log_entry = next(log_entries)
-                ball_position = scatter(old_ball_position, log_entry.direction)
+                direction = next(log_entries).direction
+                ball_position = scatter(old_ball_position, direction)
                 board.set_ball_position(ball_position)
-                bounce_event = Bounce(old_ball_position, ball_position, log_entry.direction, board)
-            yield bounce_event
-
-    def _process_throwin(self, cmds, log_entries, board):
-        log_entry = next(log_entries)
-        if not isinstance(log_entry, ThrowInDirectionLogEntry):
-            raise ValueError(f"Expected ThrowInDirection log entry but got {type(log_entry).__name__}")
-        distance_entry = next(log_entries)
-        previous_ball_position = board.get_ball_position()
-        ball_position = throwin(previous_ball_position, board.get_play_direction(),
-                                log_entry.direction, distance_entry.distance)
-        board.set_ball_position(ball_position)
-        yield ThrowIn(previous_ball_position, ball_position, log_entry.direction, distance_entry.distance,
-                      board)
-        yield from self._process_ball_movement(cmds, log_entries, board)
+            if emit_bounce:
+                yield Bounce(old_ball_position, ball_position, direction, board)
+            return None
 
     def _process_spell(self, cmds, log_entries, board):
         # Fireball and lightning may not be too different, as there's just a different number of targets
@@ -1481,6 +1864,320 @@ class Replay:
             yield from self._process_ball_movement(cmds, self.__generator(bounces), board)
 
 
+class LazyReplay(Replay):
+    """
+    A Replay that loads each team, the commands and the log from the replay files when they are first used,
+    so that getting the teams doesn't need the whole replay to be loaded
+    """
+    def __init__(self, db_path, log_path):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"No replay database file at {db_path}")
+        self.__db_path = db_path
+        self.__log_path = log_path
+        self.__teams = {}
+        self.__log_entries = _LazyList(lambda: parse_log_entries(self.__log_path))
+        super().__init__(None, None, _LazyList(self.__load_commands), self.__log_entries)
+
+    # Replay sets the teams to None, which means "load when first used"
+    @property
+    def home_team(self):
+        return self.__get_team(TeamType.HOME)
+
+    @home_team.setter
+    def home_team(self, team):
+        self.__teams[TeamType.HOME] = team
+
+    @property
+    def away_team(self):
+        return self.__get_team(TeamType.AWAY)
+
+    @away_team.setter
+    def away_team(self, team):
+        self.__teams[TeamType.AWAY] = team
+
+    def __get_team(self, team_type):
+        team = self.__teams.get(team_type)
+        if team is None:
+            db = sqlite3.connect(self.__db_path)
+            try:
+                team = create_team(db, team_type)
+            finally:
+                db.close()
+            self.__teams[team_type] = team
+        return team
+
+    def __load_commands(self):
+        db = sqlite3.connect(self.__db_path)
+        try:
+            return create_commands(db)
+        finally:
+            db.close()
+
+    def validate(self):
+        if self.__log_entries.loaded:
+            super().validate()
+        else:
+            self._validate_match_log_entry(parse_match_log_entry(self.__log_path))
+
+
+class _LazyList:
+    """
+    A read-only list whose items are loaded by calling `loader` when they are first used
+    """
+    def __init__(self, loader):
+        self.__loader = loader
+        self.__items = None
+
+    @property
+    def loaded(self):
+        return self.__items is not None
+
+    def __load(self):
+        if self.__items is None:
+            self.__items = self.__loader()
+        return self.__items
+
+    def __iter__(self):
+        return iter(self.__load())
+
+    def __len__(self):
+        return len(self.__load())
+
+    def __getitem__(self, key):
+        return self.__load()[key]
+
+
+def _check_consumed(generator):
+    if not hasattr(generator, 'consumed'):
+        raise ValueError(f"Checkpoints need a generator with a consumed count, but got {type(generator).__name__}")
+
+
+def _recover_kickoff(events, board):
+    try:
+        yield from events
+    except (ValueError, NotImplementedError) as ex:
+        yield ProcessingError(board.kicking_team, board.turn, type(ex).__name__, str(ex), board)
+
+
+def _move_skipped_player(player, destination, board):
+    if destination.is_offpitch() or board.get_position(destination):
+        return
+    position = board.get_player_position(player)
+    if board.get_position(position) == player:
+        board.reset_position(position)
+    board.set_position(destination, player)
+
+
+def _skip_turn_log_entries(team, ended_by_command, log_entries):
+    # Log entries don't record the turn, so skip to the team's turnover, or to the other team's entries
+    # if the team ended its own turn. Entries that start a new drive always belong to the next turn.
+    skipped = []
+    while True:
+        log_entry = log_entries.peek()
+        if log_entry is None or isinstance(log_entry, (DisconnectEntry, KORecoveryEntry, KickDirectionLogEntry,
+                                                       KickoffEventLogEntry)):
+            break
+        entry_team = getattr(log_entry, 'team', None)
+        if isinstance(log_entry, TurnOverEntry):
+            if entry_team == team:
+                skipped.append(next(log_entries))
+            break
+        elif ended_by_command and entry_team is not None and entry_team != team \
+                and not isinstance(log_entry, _SKIPPED_OPPONENT_ENTRIES):
+            break
+        skipped.append(next(log_entries))
+    return skipped
+
+
+def _is_wanted(event_type, include, exclude):
+    return (include is None or event_type in include) and event_type not in exclude
+
+
+def _filter_events(events, include, exclude):
+    for event in events:
+        if _is_wanted(type(event), include, exclude):
+            yield event
+
+
+def _snapshot_events(events):
+    has_board = {}
+    for event in events:
+        event_type = type(event)
+        event_has_board = has_board.get(event_type)
+        if event_has_board is None:
+            event_has_board = 'board' in event_type._fields
+            has_board[event_type] = event_has_board
+        if event_has_board and event.board is not None:
+            event = event._replace(board=event.board.snapshot())
+        yield event
+
+
+class _TracedEvents:
+    """
+    The events from one `events()` call, with the TraceBuffer of the commands and log entries that they consumed
+    """
+    __slots__ = ('__events', 'trace')
+
+    def __init__(self, events, trace):
+        self.__events = events
+        self.trace = trace
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.__events)
+        except StopIteration:
+            raise
+        except Exception as ex:
+            ex.replay_trace = self.trace.get_items()
+            raise
+
+    def close(self):
+        self.__events.close()
+
+
+def _journal_events(events):
+    journalled_board = None
+    for event in events:
+        board = getattr(event, 'board', None)
+        if board is not None:
+            if board is not journalled_board:
+                board.enable_journal()
+                journalled_board = board
+            else:
+                board.end_step()
+        yield event
+
+
+def _resolve_handler(handlers, resolved, cmd_type):
+    try:
+        return resolved[cmd_type]
+    except KeyError:
+        pass
+    handler = handlers.get(cmd_type)
+    if handler is None:
+        # Subclasses share their parent's handler, but the base Command is only for commands that we can't parse
+        handler = next((handlers[cls] for cls in cmd_type.__mro__[1:] if cls is not Command and cls in handlers),
+                       None)
+    resolved[cmd_type] = handler
+    return handler
+
+
+def _handle_target_player(replay, cmd, prev_cmd_type, cmds, log_entries, board):
+    targeting_player = replay.get_team(cmd.team).get_player(cmd.player_idx)
+    target_by_idx = replay.get_team(cmd.target_team).get_player(cmd.target_player)
+    if targeting_player.team != target_by_idx.team:
+        return replay._process_block(targeting_player, target_by_idx, cmds, log_entries, board)
+    elif not cmd.position.is_offpitch():
+        # Regular throws use 255,255 but throw teammate uses the target coords
+        return replay._process_throw_teammate(targeting_player, target_by_idx, cmds, log_entries, board)
+    else:
+        return replay._process_throw(targeting_player, target_by_idx, cmds, log_entries, board)
+
+
+def _handle_movement(replay, cmd, prev_cmd_type, cmds, log_entries, board):
+    player = replay.get_team(cmd.team).get_player(cmd.player_idx)
+    # We stop when the movement stops, so the returned command is the EndMovementCommand
+    return replay._process_movement(player, cmds, log_entries, board)
+
+
+def _handle_spell(replay, cmd, prev_cmd_type, cmds, log_entries, board):
+    return replay._process_spell(cmds, log_entries, board)
+
+
+def _skip_command(replay, cmd, prev_cmd_type, cmds, log_entries, board):
+    next(cmds)
+    return None
+
+
+def _handle_dice_choice(replay, cmd, prev_cmd_type, cmds, log_entries, board):
+    if prev_cmd_type is not DeclineRerollCommand:
+        raise NotImplementedError(f"No handling for {cmd}")
+    # FIXME: We should be handling these, but it's not always clear how they associate with events
+    next(cmds)
+    return None
+
+
+def _handle_end_turn(replay, cmd, prev_cmd_type, cmds, log_entries, board):
+    next(cmds)
+    return [EndTurn(cmd.team, board.turn, 'End Turn', board)]
+
+
+COMMAND_HANDLERS = {
+    TargetPlayerCommand: _handle_target_player,
+    MovementCommand: _handle_movement,
+    SpellCommand: _handle_spell,
+    Command: _skip_command,
+    DeclineRerollCommand: _skip_command,
+    DiceChoiceCommand: _handle_dice_choice,
+    EndTurnCommand: _handle_end_turn,
+}
+
+
+def _kickoff_no_action(replay, kickoff_result, cmds, log_entries, board):
+    # We don't currently track bribes from Get the Ref (each team will get one) or check reroll log events
+    # to identify who got the free reroll from Cheering Fans and Brilliant Coaching
+    return ()
+
+
+def _kickoff_riot(replay, kickoff_result, cmds, log_entries, board):
+    return replay._process_riot(kickoff_result, board)
+
+
+def _kickoff_perfect_defence(replay, kickoff_result, cmds, log_entries, board):
+    return replay._process_perfect_defence(cmds, board)
+
+
+def _kickoff_high_kick(replay, kickoff_result, cmds, log_entries, board):
+    return replay._process_high_kick(log_entries, board)
+
+
+def _kickoff_changing_weather(replay, kickoff_result, cmds, log_entries, board):
+    return replay._process_changing_weather(log_entries, board)
+
+
+def _kickoff_quick_snap(replay, kickoff_result, cmds, log_entries, board):
+    return replay._process_quick_snap(cmds, log_entries, board)
+
+
+def _kickoff_blitz(replay, kickoff_result, cmds, log_entries, board):
+    return replay._process_blitz_kickoff(cmds, log_entries, board)
+
+
+def _kickoff_pitch_invasion(replay, kickoff_result, cmds, log_entries, board):
+    raise NotImplementedError("Cannot process 'Pitch Invasion' event because injured players aren't identified")
+
+
+KICKOFF_HANDLERS = {
+    KickoffEvent.GET_THE_REF: _kickoff_no_action,
+    KickoffEvent.RIOT: _kickoff_riot,
+    KickoffEvent.PERFECT_DEFENCE: _kickoff_perfect_defence,
+    KickoffEvent.HIGH_KICK: _kickoff_high_kick,
+    KickoffEvent.CHEERING_FANS: _kickoff_no_action,
+    KickoffEvent.BRILLIANT_COACHING: _kickoff_no_action,
+    KickoffEvent.CHANGING_WEATHER: _kickoff_changing_weather,
+    KickoffEvent.QUICK_SNAP: _kickoff_quick_snap,
+    KickoffEvent.BLITZ: _kickoff_blitz,
+    KickoffEvent.PITCH_INVASION: _kickoff_pitch_invasion,
+}
+
+
+def _block_pro_reroll(replay, blocking_player, block_dice, cmds, log_entries, board):
+    return replay._process_block_pro_reroll(blocking_player, block_dice, cmds, log_entries, board)
+
+
+def _block_reroll(replay, blocking_player, block_dice, cmds, log_entries, board):
+    return replay._process_block_reroll(blocking_player, cmds, log_entries, board)
+
+
+BLOCK_CHOICE_HANDLERS = {
+    ProRerollCommand: _block_pro_reroll,
+    RerollCommand: _block_reroll,
+}
+
+
 def find_next_known_command(generator):
     cur = next(generator)
     while type(cur) == Command:
@@ -1491,11 +2188,8 @@ def find_next_known_command(generator):
 def is_dodge(board, player, destination):
     if board.quick_snap_turn:
         return False
-    elif player.position == destination:
-        return False
-    else:
-        entities = board.get_surrounding_players(player.position)
-        return any(entity.team != player.team and board.has_tacklezone(entity) for entity in entities)
+    position = board.get_player_position(player)
+    return position != destination and board.get_tacklezones(other_team(player.team.team_type), position) > 0
 
 
 def validate_log_entry(log_entry, expected_type, expected_team, expected_number=None):
@@ -1517,10 +2211,8 @@ def validate_skill_log_entry(log_entry, player, skill):
         raise ValueError(f"Got skill entry for {skill} but player has {player.skills}")
 
 
-def calculate_pushbacks(blocker_coords, old_coords, board):
+def _pushback_candidates(x_diff, y_diff, old_coords):
     # Note: We invert the calculation so that we can avoid multiplying by -1 later
-    x_diff = old_coords.x - blocker_coords.x
-    y_diff = old_coords.y - blocker_coords.y
     if x_diff != 0:
         if y_diff != 0:
             possible_coords = [old_coords.add(x_diff, y_diff), old_coords.add(x_diff, 0), old_coords.add(0, y_diff)]
@@ -1528,8 +2220,23 @@ def calculate_pushbacks(blocker_coords, old_coords, board):
             possible_coords = [old_coords.add(x_diff, -1), old_coords.add(x_diff, 0), old_coords.add(x_diff, 1)]
     else:
         possible_coords = [old_coords.add(-1, y_diff), old_coords.add(0, y_diff), old_coords.add(1, y_diff)]
-    pushbacks = [coord for coord in possible_coords if on_pitch(coord) and not board.get_position(coord)]
-    if not pushbacks and any(not on_pitch(coord) for coord in possible_coords):
+    return tuple(coord for coord in possible_coords if on_pitch(coord)), \
+        any(not on_pitch(coord) for coord in possible_coords)
+
+
+def _pushback_direction_idx(x_diff, y_diff):
+    return (x_diff + 1) * 3 + y_diff + 1
+
+
+def calculate_pushbacks(blocker_coords, old_coords, board):
+    x_diff = old_coords.x - blocker_coords.x
+    y_diff = old_coords.y - blocker_coords.y
+    if -1 <= x_diff <= 1 and -1 <= y_diff <= 1 and (x_diff or y_diff) and not old_coords.is_offpitch():
+        candidates, can_leave_pitch = PUSHBACKS[_pushback_direction_idx(x_diff, y_diff)][old_coords.idx]
+    else:
+        candidates, can_leave_pitch = _pushback_candidates(x_diff, y_diff, old_coords)
+    pushbacks = [coord for coord in candidates if not board.get_position(coord)]
+    if not pushbacks and can_leave_pitch:
         pushbacks = [OFF_PITCH_POSITION]
     return pushbacks
 
@@ -1540,3 +2247,19 @@ def on_pitch(coord):
 
 def calculate_pushback(blocker_coords, old_coords, board):
     return calculate_pushbacks(blocker_coords, old_coords, board)[0]
+
+
+# The on-pitch pushback spaces and whether the push can go off the pitch for a player at each board index,
+# indexed by the direction of the push from an adjacent blocker (see _pushback_direction_idx)
+def _build_pushbacks():
+    pushbacks = [None] * 9
+    for x_diff in [-1, 0, 1]:
+        for y_diff in [-1, 0, 1]:
+            if x_diff or y_diff:
+                pushbacks[_pushback_direction_idx(x_diff, y_diff)] = \
+                    tuple(_pushback_candidates(x_diff, y_diff, Position(idx % PITCH_WIDTH, idx // PITCH_WIDTH))
+                          for idx in range(PITCH_CELLS))
+    return pushbacks
+
+
+PUSHBACKS = _build_pushbacks()
@@ -1,14 +1,240 @@
 # Copyright © 2021, IBBoard
 # Licensed under GPLv3 or later - see COPYING
 
-from collections import defaultdict
-from . import BEFORE_HALFWAY_IDX, FAR_ENDZONE_IDX, NEAR_ENDZONE_IDX, PlayDirection, other_team, Skills, TeamType, \
-    ActionResult, PITCH_LENGTH, PITCH_WIDTH, OFF_PITCH_POSITION, Weather
+import itertools
+import random
+from . import BEFORE_HALFWAY_IDX, FAR_ENDZONE_IDX, NEAR_ENDZONE_IDX, PlayDirection, PlayerStatus, other_team, Skills, \
+    TeamType, ActionResult, KickoffEvent, PITCH_CELLS, PITCH_LENGTH, PITCH_WIDTH, OFF_PITCH_POSITION, Position, Weather
+from .teams import MAX_PLAYER_COUNT
 
 
 HALF_TIME_TURN = 8
 
 
+def _neighbour_indices(x, y):
+    neighbours = []
+    for i in [-1, 0, 1]:
+        neighbour_x = x + i
+        if neighbour_x < 0 or neighbour_x >= PITCH_WIDTH:
+            continue
+        for j in [-1, 0, 1]:
+            neighbour_y = y + j
+            if neighbour_y < 0 or neighbour_y >= PITCH_LENGTH:
+                continue
+            if i == 0 and j == 0:
+                continue
+            neighbours.append(neighbour_y * PITCH_WIDTH + neighbour_x)
+    return tuple(neighbours)
+
+
+# Board indexes of the spaces around each space on the pitch, indexed by the space's own board index
+NEIGHBOURS = tuple(_neighbour_indices(idx % PITCH_WIDTH, idx // PITCH_WIDTH) for idx in range(PITCH_CELLS))
+
+# Zobrist keys for board hashing. The seed is fixed so that hashes are comparable between runs and matches.
+_ZOBRIST_RANDOM = random.Random(0xBB2)
+# Keys for a player on each space, indexed by team value * 2 + prone
+ZOBRIST_PLAYER_KEYS = tuple(tuple(_ZOBRIST_RANDOM.getrandbits(64) for _ in range(PITCH_CELLS)) for _ in range(4))
+# Keys for the ball on each space, indexed by whether it is being carried
+ZOBRIST_BALL_KEYS = tuple(tuple(_ZOBRIST_RANDOM.getrandbits(64) for _ in range(PITCH_CELLS)) for _ in range(2))
+
+
+# The number of Player.slot values, for lists that are indexed by slot
+PLAYER_SLOTS = 2 * MAX_PLAYER_COUNT
+
+# Kinds of change recorded in the GameState journal
+_CELL = 0
+_POSITION = 1
+_BALL = 2
+_STATUS = 3
+_MOVES = 4
+
+
+def _mirror_idx(idx):
+    # Position.invert() rotates the pitch, which reverses the board indexes
+    return PITCH_CELLS - 1 - idx
+
+
+def _board_hashes(cells, prone, ball_position, ball_carrier):
+    # Hashing the whole board when a hash is asked for keeps the cost out of every board change
+    board_hash = 0
+    mirrored_board_hash = 0
+    for idx, contents in enumerate(cells):
+        if contents and contents.team:
+            keys = ZOBRIST_PLAYER_KEYS[contents.team.team_type.value * 2 + (contents in prone)]
+            board_hash ^= keys[idx]
+            mirrored_board_hash ^= keys[_mirror_idx(idx)]
+    if not ball_position.is_offpitch():
+        keys = ZOBRIST_BALL_KEYS[ball_carrier is not None]
+        board_hash ^= keys[ball_position.idx]
+        mirrored_board_hash ^= keys[_mirror_idx(ball_position.idx)]
+    return board_hash, mirrored_board_hash
+
+
+class BoardRow:
+    """
+    A view of one row of the board, so that `board[row][col]` works like it did when the board was a list of lists
+    """
+    def __init__(self, state, cells, row):
+        self.__state = state
+        self.__cells = cells
+        self.__row = row
+        self.__offset = row * PITCH_WIDTH
+
+    def __col(self, col):
+        if col < 0:
+            col += PITCH_WIDTH
+        if col < 0 or col >= PITCH_WIDTH:
+            raise IndexError(f"Column {col} is off the pitch")
+        return col
+
+    def __getitem__(self, col):
+        return self.__cells[self.__offset + self.__col(col)]
+
+    def __setitem__(self, col, contents):
+        self.__state.set_position(Position(self.__col(col), self.__row), contents)
+
+    def __len__(self):
+        return PITCH_WIDTH
+
+    def __iter__(self):
+        return iter(self.__cells[self.__offset:self.__offset + PITCH_WIDTH])
+
+
+class BoardSnapshot:
+    """
+    An immutable view of a GameState at a single point in time.
+
+    Snapshots are created by `GameState.snapshot()`. Unchanged rows and player details are shared with
+    earlier snapshots of the same game, so each snapshot only copies what changed since the last one.
+    """
+    __slots__ = ('__teams', '__rows', '__positions', '__prone', '__injured', '__stupid', '__ball_position',
+                 '__ball_carrier', '__turn', '__turn_team', '__score', '__rerolls', '__apothecaries', '__weather',
+                 '__kickoff_event', '__quick_snap_turn', '__receiving_team', '__hashes')
+
+    def __init__(self, teams, rows, positions, prone, injured, stupid, ball_position, ball_carrier, turn,
+                 turn_team, score, rerolls, apothecaries, weather, kickoff_event, quick_snap_turn, receiving_team,
+                 hashes=None):
+        self.__teams = teams
+        self.__rows = rows
+        self.__positions = positions
+        self.__prone = prone
+        self.__injured = injured
+        self.__stupid = stupid
+        self.__ball_position = ball_position
+        self.__ball_carrier = ball_carrier
+        self.__turn = turn
+        self.__turn_team = turn_team
+        self.__score = score
+        self.__rerolls = rerolls
+        self.__apothecaries = apothecaries
+        self.__weather = weather
+        self.__kickoff_event = kickoff_event
+        self.__quick_snap_turn = quick_snap_turn
+        self.__receiving_team = receiving_team
+        self.__hashes = hashes
+
+    @property
+    def teams(self):
+        return self.__teams
+
+    @property
+    def turn(self):
+        return self.__turn
+
+    @property
+    def turn_team(self):
+        return self.__turn_team
+
+    @property
+    def score(self):
+        return self.__score
+
+    @property
+    def rerolls(self):
+        return self.__rerolls
+
+    @property
+    def apothecaries(self):
+        return self.__apothecaries
+
+    @property
+    def weather(self):
+        return self.__weather
+
+    @property
+    def kickoff_event(self):
+        return self.__kickoff_event
+
+    @property
+    def quick_snap_turn(self):
+        return self.__quick_snap_turn
+
+    @property
+    def receiving_team(self):
+        return self.__receiving_team
+
+    @property
+    def kicking_team(self):
+        return other_team(self.__receiving_team)
+
+    @property
+    def board_hash(self):
+        return self.__get_hashes()[0]
+
+    @property
+    def mirrored_board_hash(self):
+        return self.__get_hashes()[1]
+
+    def __get_hashes(self):
+        if self.__hashes is None:
+            self.__hashes = _board_hashes(itertools.chain.from_iterable(self.__rows), self.__prone,
+                                          self.__ball_position, self.__ball_carrier)
+        return self.__hashes
+
+    def snapshot(self):
+        return self
+
+    def get_position(self, position):
+        return self.__rows[position.y][position.x] if not position.is_offpitch() else None
+
+    def get_player_position(self, player):
+        return self.__positions.get(player, OFF_PITCH_POSITION)
+
+    def get_ball_position(self):
+        return self.__ball_position
+
+    def get_ball_carrier(self):
+        return self.__ball_carrier
+
+    def __getitem__(self, idx):
+        return self.__rows[idx]
+
+    def has_tacklezone(self, player):
+        return player not in self.__prone and player not in self.__stupid
+
+    def is_prone(self, player):
+        return player in self.__prone
+
+    def is_injured(self, player):
+        return player in self.__injured
+
+    def is_stupid(self, player):
+        return player in self.__stupid
+
+    def get_surrounding_players(self, position):
+        if position.is_offpitch():
+            neighbours = _neighbour_indices(position.x, position.y)
+        else:
+            neighbours = NEIGHBOURS[position.idx]
+        rows = self.__rows
+        entities = (rows[idx // PITCH_WIDTH][idx % PITCH_WIDTH] for idx in neighbours)
+        return [entity for entity in entities if entity]
+
+    def get_tacklezones(self, team, position):
+        return sum(1 for player in self.get_surrounding_players(position)
+                   if player.team and player.team.team_type == team and self.has_tacklezone(player))
+
+
 class GameState:
     def __init__(self, home_team, away_team, receiving_team):
         self.teams = [home_team, away_team]
@@ -18,6 +244,7 @@ class GameState:
         self.turn_team = None
         self.__rerolls = [home_team.rerolls, away_team.rerolls]
         self.apothecaries = [home_team.apothecaries, away_team.apothecaries]
+        self.__journal = None
         self.__reset_board()
         self.__turn = 0
         self.__prone = set()
@@ -26,6 +253,7 @@ class GameState:
         self.__tested_stupid = set()
         self.__wild_animal = set()
         self.__tested_wild_animal = set()
+        self.__snapshot_statuses = None
         self.__ball_position = OFF_PITCH_POSITION
         self.__ball_carrier = None
         self.weather = None
@@ -33,11 +261,15 @@ class GameState:
         self.quick_snap_turn = False
         self.__setups = [[], []]
         self.__last_setup_turn = 0
-        self.__moves = defaultdict(int)
+        # How far each player has moved this turn, indexed by Player.slot
+        self.__moves = [0] * PLAYER_SLOTS
         self.__used_reroll = False
         self.__leader_reroll = [False, False]
         self.__used_leaders = set()
         self.__touchdown_row = [-1, -1]
+        self.__journal_steps = []
+        self.__journal_position = 0
+        self.__step_header = None
 
     @property
     def turn(self):
@@ -65,6 +297,27 @@ class GameState:
     def kicking_team(self):
         return other_team(self.__receiving_team)
 
+    @property
+    def board_hash(self):
+        """
+        A Zobrist hash of the players and ball on the pitch that is the same for the same layout in any match.
+        The hash is calculated when it is first needed and kept until the layout changes.
+        """
+        return self.__get_hashes()[0]
+
+    @property
+    def mirrored_board_hash(self):
+        """
+        The `board_hash` that the layout would have if every position was inverted with `Position.invert()`
+        """
+        return self.__get_hashes()[1]
+
+    def __get_hashes(self):
+        if self.__hashes is None:
+            self.__hashes = _board_hashes(self.__board, self.__prone, self.get_ball_position(),
+                                          self.__ball_carrier)
+        return self.__hashes
+
     @property
     def rerolls(self):
         home_rerolls, away_rerolls = self.__rerolls
@@ -77,9 +330,9 @@ class GameState:
     def prepare_setup(self):
         crossed_half_time = (self.turn <= HALF_TIME_TURN) != (self.__last_setup_turn <= HALF_TIME_TURN)
         self.__reset_board()
-        self.__prone.clear()
-        self.__stupid.clear()
-        self.__wild_animal.clear()
+        self.__clear_statuses(self.__prone)
+        self.__clear_statuses(self.__stupid)
+        self.__clear_statuses(self.__wild_animal)
         for team_setup in self.__setups:
             deployed_subs = set()
             subs = (player for player, position in team_setup if position.is_offpitch())
@@ -95,7 +348,7 @@ class GameState:
                     deployed_subs.add(replacement_player)
 
         if crossed_half_time:
-            self.__used_leaders.clear()
+            self.__clear_statuses(self.__used_leaders)
             self.__rerolls = [team.rerolls for team in self.teams]
 
         self.set_ball_position(OFF_PITCH_POSITION)
@@ -104,18 +357,18 @@ class GameState:
         for team in self.teams:
             team_setup = []
             for player in team.get_players():
-                team_setup.append((player, player.position))
+                team_setup.append((player, self.get_player_position(player)))
             self.__setups[team.team_type.value] = team_setup
         self.turn_team = self.teams[self.__receiving_team.value]
 
-        if any(player.is_on_pitch() and Skills.LEADER in player.skills
+        if any(self.is_on_pitch(player) and Skills.LEADER in player.skills
                and player not in self.__used_leaders
                for player in self.teams[TeamType.HOME.value].get_players()):
             self.__leader_reroll[TeamType.HOME.value] = True
         else:
             self.__leader_reroll[TeamType.HOME.value] = False
 
-        if any(player.is_on_pitch() and Skills.LEADER in player.skills
+        if any(self.is_on_pitch(player) and Skills.LEADER in player.skills
                and player not in self.__used_leaders
                for player in self.teams[TeamType.AWAY.value].get_players()):
             self.__leader_reroll[TeamType.AWAY.value] = True
@@ -134,7 +387,8 @@ class GameState:
 
     def is_touchdown_state(self):
         ball_carrier = self.get_ball_carrier()
-        return ball_carrier and ball_carrier.position.y == self.__touchdown_row[ball_carrier.team.team_type.value]
+        return ball_carrier \
+            and self.get_player_position(ball_carrier).y == self.__touchdown_row[ball_carrier.team.team_type.value]
 
     def touchdown(self, player):
         team = player.team.team_type
@@ -148,10 +402,14 @@ class GameState:
     def start_turn(self, team):
         if team != self.turn_team.team_type and team != TeamType.HOTSEAT:
             raise ValueError(f'Out of order start turn - expected {self.turn_team.team_type} but got {team}')
-        self.__tested_stupid.clear()
-        self.__tested_wild_animal.clear()
-        self.__wild_animal.clear()
-        self.__moves.clear()
+        self.__clear_statuses(self.__tested_stupid)
+        self.__clear_statuses(self.__tested_wild_animal)
+        self.__clear_statuses(self.__wild_animal)
+        if self.__journal is None:
+            self.__moves = [0] * PLAYER_SLOTS
+        else:
+            for player in self.__get_players():
+                self.__set_moves(player, 0)
         self.__used_reroll = False
 
     def end_turn(self, team):
@@ -166,68 +424,185 @@ class GameState:
         self.__turn -= 2
 
     def move(self, player, from_space, to_space):
-        self.__moves[player] += max(abs(from_space.x - to_space.x), abs(from_space.y - to_space.y))
+        self.__set_moves(player, self.__moves[player.slot]
+                         + max(abs(from_space.x - to_space.x), abs(from_space.y - to_space.y)))
         self.reset_position(from_space)
         self.set_position(to_space, player)
 
     def throw_block(self, player):
-        self.__moves[player] += 1
+        self.__set_moves(player, self.__moves[player.slot] + 1)
 
     def get_distance_moved(self, player):
-        return self.__moves[player]
+        return self.__moves[player.slot]
+
+    def __set_moves(self, player, moves):
+        if self.__journal is not None:
+            self.__record(_MOVES, player, self.__moves[player.slot], moves)
+        self.__moves[player.slot] = moves
 
     def set_position(self, position, contents):
         if not position.is_offpitch():
-            self.__board[position.y][position.x] = contents
+            self.__set_cell(position.idx, contents)
         if contents:
-            contents.position = position
+            self.__set_player_position(contents, position)
+
+    def __set_cell(self, idx, contents):
+        if self.__journal is not None:
+            self.__record(_CELL, idx, self.__board[idx], contents)
+        self.__board[idx] = contents
+        self.__tacklezones = None
+        self.__hashes = None
+        self.__snapshot_rows[idx // PITCH_WIDTH] = None
+
+    def __set_player_position(self, player, position):
+        # A position of None removes the player from the game, which only happens when the board is reset
+        if self.__journal is not None:
+            self.__record(_POSITION, player, self.__positions.get(player), position)
+        if position is not None:
+            self.__positions[player] = position
+        else:
+            del self.__positions[player]
+        self.__snapshot_positions = None
+        if player is self.__ball_carrier:
+            self.__hashes = None
 
     def reset_position(self, position):
         self.set_position(position, None)
 
     def get_position(self, position):
-        return self.__board[position.y][position.x]
+        return self.__board[position.idx] if not position.is_offpitch() else None
 
     def set_ball_position(self, position):
-        self.__ball_carrier = None
-        self.__ball_position = position
+        self.__set_ball(position, None)
 
     def set_ball_carrier(self, player):
         if not player and self.__ball_carrier:
-            self.__ball_position = self.__ball_carrier.position
-        self.__ball_carrier = player
+            self.__set_ball(self.get_player_position(self.__ball_carrier), player)
+        else:
+            self.__set_ball(self.__ball_position, player)
+
+    def __set_ball(self, position, carrier):
+        if self.__journal is not None:
+            self.__record(_BALL, None, (self.__ball_position, self.__ball_carrier), (position, carrier))
+        self.__ball_position = position
+        self.__ball_carrier = carrier
+        self.__hashes = None
 
     def get_ball_position(self):
         if self.__ball_carrier:
-            return self.__ball_carrier.position
+            return self.get_player_position(self.__ball_carrier)
         else:
             return self.__ball_position
 
     def get_ball_carrier(self):
         return self.__ball_carrier
 
+    def get_player_position(self, player):
+        return self.__positions.get(player, OFF_PITCH_POSITION)
+
+    def is_on_pitch(self, player):
+        return not self.get_player_position(player).is_offpitch()
+
+    def get_player_status(self, player):
+        if player in self.__injured:
+            return PlayerStatus.INJURED
+        elif player in self.__prone:
+            return PlayerStatus.PRONE
+        elif player in self.__stupid:
+            return PlayerStatus.STUPID
+        else:
+            return PlayerStatus.OKAY
+
     def __getitem__(self, idx):
-        return self.__board[idx]
+        if idx < 0:
+            idx += PITCH_LENGTH
+        if idx < 0 or idx >= PITCH_LENGTH:
+            raise IndexError(f"Row {idx} is off the pitch")
+        return BoardRow(self, self.__board, idx)
 
     def has_tacklezone(self, player):
-        return not self.is_prone(player) and player not in self.__stupid
+        return player not in self.__prone and player not in self.__stupid
+
+    def get_tacklezones(self, team, position):
+        """
+        Get the number of tackle zones that the given team exerts on the given space
+        """
+        if position.is_offpitch():
+            return sum(1 for player in self.get_surrounding_players(position)
+                       if player.team and player.team.team_type == team and self.has_tacklezone(player))
+        if self.__tacklezones is not None:
+            return self.__tacklezones[team.value][position.idx]
+        # Counting the neighbours for one space is cheaper than keeping every count up to date as the board changes
+        board = self.__board
+        prone = self.__prone
+        stupid = self.__stupid
+        count = 0
+        for idx in NEIGHBOURS[position.idx]:
+            contents = board[idx]
+            if contents and contents.team and contents.team.team_type == team \
+                    and contents not in prone and contents not in stupid:
+                count += 1
+        return count
+
+    def get_tacklezone_counts(self, team):
+        """
+        Get the number of tackle zones that the given team exerts on every space, indexed by board index.
+        The counts are built when first needed and kept until the board or a player's tackle zone changes.
+        """
+        if self.__tacklezones is None:
+            tacklezones = [[0] * PITCH_CELLS, [0] * PITCH_CELLS]
+            prone = self.__prone
+            stupid = self.__stupid
+            for idx, contents in enumerate(self.__board):
+                if contents and contents.team and contents not in prone and contents not in stupid:
+                    team_tacklezones = tacklezones[contents.team.team_type.value]
+                    for neighbour in NEIGHBOURS[idx]:
+                        team_tacklezones[neighbour] += 1
+            self.__tacklezones = (tuple(tacklezones[0]), tuple(tacklezones[1]))
+        return self.__tacklezones[team.value]
+
+    def __refresh_player_cell(self, player):
+        position = self.__positions.get(player)
+        if position is not None and not position.is_offpitch() and self.__board[position.idx] is player:
+            self.__tacklezones = None
+            self.__hashes = None
+
+    def __set_status(self, statuses, player, status):
+        if (player in statuses) == status:
+            return
+        if status:
+            statuses.add(player)
+        else:
+            statuses.remove(player)
+        if self.__journal is not None:
+            self.__record(_STATUS, (statuses, player), not status, status)
+        self.__snapshot_statuses = None
+        self.__refresh_player_cell(player)
+
+    def __clear_statuses(self, statuses):
+        for player in list(statuses):
+            self.__set_status(statuses, player, False)
+
+    def __get_players(self):
+        for team in self.teams:
+            yield from team.get_players()
 
     def set_prone(self, player):
-        self.__prone.add(player)
+        self.__set_status(self.__prone, player, True)
 
     def unset_prone(self, player, penalise_movement=True):
-        self.__prone.remove(player)
+        self.__set_status(self.__prone, player, False)
         if penalise_movement:
-            self.__moves[player] += 3
+            self.__set_moves(player, self.__moves[player.slot] + 3)
 
     def is_prone(self, player):
         return player in self.__prone
 
     def set_injured(self, player):
-        self.__injured.add(player)
+        self.__set_status(self.__injured, player, True)
 
     def unset_injured(self, player):
-        self.__injured.remove(player)
+        self.__set_status(self.__injured, player, False)
 
     def is_injured(self, player):
         return player in self.__injured
@@ -236,11 +611,8 @@ class GameState:
         return player in self.__stupid
 
     def __do_test(self, player, result, tested_players, failed_players):
-        tested_players.add(player)
-        if result != ActionResult.SUCCESS:
-            failed_players.add(player)
-        elif self.is_stupid(player):
-            failed_players.remove(player)
+        self.__set_status(tested_players, player, True)
+        self.__set_status(failed_players, player, result != ActionResult.SUCCESS)
 
     def stupidity_test(self, player, result):
         self.__do_test(player, result, self.__tested_stupid, self.__stupid)
@@ -258,21 +630,233 @@ class GameState:
         return player in self.__tested_wild_animal
 
     def get_surrounding_players(self, position):
-        entities = []
-        for i in [-1, 0, 1]:
-            x = position.x + i
-            if x < 0 or x >= PITCH_WIDTH:
-                continue
-            for j in [-1, 0, 1]:
-                y = position.y + j
-                if y < 0 or y >= PITCH_LENGTH:
-                    continue
-                if i == 0 and j == 0:
-                    continue
-                entity = self.__board[y][x]
-                if entity:
-                    entities.append(entity)
-        return entities
+        if position.is_offpitch():
+            # Players in the crowd can still be next to the edge of the pitch
+            neighbours = _neighbour_indices(position.x, position.y)
+        else:
+            neighbours = NEIGHBOURS[position.idx]
+        board = self.__board
+        return [board[idx] for idx in neighbours if board[idx]]
+
+    def snapshot(self):
+        """
+        Get an immutable BoardSnapshot of the current state that will not change as the game continues
+        """
+        rows = self.__snapshot_rows
+        for row, cached_row in enumerate(rows):
+            if cached_row is None:
+                offset = row * PITCH_WIDTH
+                rows[row] = tuple(self.__board[offset:offset + PITCH_WIDTH])
+        if self.__snapshot_positions is None:
+            self.__snapshot_positions = dict(self.__positions)
+        if self.__snapshot_statuses is None:
+            self.__snapshot_statuses = (frozenset(self.__prone), frozenset(self.__injured), frozenset(self.__stupid))
+        prone, injured, stupid = self.__snapshot_statuses
+        return BoardSnapshot(self.teams, tuple(rows), self.__snapshot_positions, prone, injured, stupid,
+                             self.get_ball_position(), self.__ball_carrier, self.turn, self.turn_team,
+                             tuple(self.score), self.rerolls, tuple(self.apothecaries), self.weather,
+                             self.kickoff_event, self.quick_snap_turn, self.receiving_team,
+                             self.__hashes)
+
+    def checkpoint(self):
+        """
+        Get a compact, JSON-serialisable record of the state that can be passed to `restore()`.
+
+        Players are recorded by their slot, from their team and roster index, so the checkpoint can be
+        restored into any GameState for the same teams.
+        """
+        def encode(player):
+            return player.slot
+
+        def encode_players(players):
+            return sorted(encode(player) for player in players)
+
+        def encode_position(position):
+            return [position.x, position.y]
+
+        return {
+            'turn': self.__turn,
+            'turn_team': self.turn_team.team_type.value if self.turn_team else None,
+            'receiving_team': self.__receiving_team.value,
+            'first_receiving_team': self.__first_receiving_team.value,
+            'score': list(self.score),
+            'rerolls': list(self.__rerolls),
+            'apothecaries': list(self.apothecaries),
+            'board': [[idx, encode(contents)] for idx, contents in enumerate(self.__board) if contents],
+            'positions': [[encode(player)] + encode_position(self.get_player_position(player))
+                          for team in self.teams for player in team.get_players()],
+            'ball_position': encode_position(self.__ball_position),
+            'ball_carrier': encode(self.__ball_carrier) if self.__ball_carrier else None,
+            'prone': encode_players(self.__prone),
+            'injured': encode_players(self.__injured),
+            'stupid': encode_players(self.__stupid),
+            'tested_stupid': encode_players(self.__tested_stupid),
+            'wild_animal': encode_players(self.__wild_animal),
+            'tested_wild_animal': encode_players(self.__tested_wild_animal),
+            'weather': self.weather.name if self.weather else None,
+            'kickoff_event': self.kickoff_event.name if self.kickoff_event else None,
+            'quick_snap_turn': self.quick_snap_turn,
+            'setups': [[[encode(player)] + encode_position(position) for player, position in team_setup]
+                       for team_setup in self.__setups],
+            'last_setup_turn': self.__last_setup_turn,
+            'moves': [[slot, moves] for slot, moves in enumerate(self.__moves) if moves],
+            'used_reroll': self.__used_reroll,
+            'leader_reroll': list(self.__leader_reroll),
+            'used_leaders': encode_players(self.__used_leaders),
+            'touchdown_row': list(self.__touchdown_row)
+        }
+
+    def restore(self, checkpoint):
+        """
+        Restore the state from a record created by `checkpoint()`.
+
+        If the journal is enabled then it restarts from the restored state.
+        """
+        decode = self.__decode_player
+        journal_enabled = self.__journal is not None
+        self.__journal = None
+
+        def decode_players(codes):
+            return set(decode(code) for code in codes)
+
+        self.__turn = checkpoint['turn']
+        turn_team = checkpoint['turn_team']
+        self.turn_team = self.teams[turn_team] if turn_team is not None else None
+        self.__receiving_team = TeamType(checkpoint['receiving_team'])
+        self.__first_receiving_team = TeamType(checkpoint['first_receiving_team'])
+        self.score = list(checkpoint['score'])
+        self.__rerolls = list(checkpoint['rerolls'])
+        self.apothecaries = list(checkpoint['apothecaries'])
+        self.__prone = decode_players(checkpoint['prone'])
+        self.__injured = decode_players(checkpoint['injured'])
+        self.__stupid = decode_players(checkpoint['stupid'])
+        self.__tested_stupid = decode_players(checkpoint['tested_stupid'])
+        self.__wild_animal = decode_players(checkpoint['wild_animal'])
+        self.__tested_wild_animal = decode_players(checkpoint['tested_wild_animal'])
+        self.__used_leaders = decode_players(checkpoint['used_leaders'])
+        self.__snapshot_statuses = None
+        self.__reset_board()
+        for idx, code in checkpoint['board']:
+            self.set_position(Position(idx % PITCH_WIDTH, idx // PITCH_WIDTH), decode(code))
+        # Players aren't always where the board says (e.g. injured players that were removed from the pitch)
+        for code, x, y in checkpoint['positions']:
+            self.__positions[decode(code)] = Position(x, y)
+        self.__ball_position = Position(*checkpoint['ball_position'])
+        ball_carrier = checkpoint['ball_carrier']
+        self.__ball_carrier = decode(ball_carrier) if ball_carrier is not None else None
+        self.__hashes = None
+        weather = checkpoint['weather']
+        self.weather = Weather[weather] if weather else None
+        kickoff_event = checkpoint['kickoff_event']
+        self.kickoff_event = KickoffEvent[kickoff_event] if kickoff_event else None
+        self.quick_snap_turn = checkpoint['quick_snap_turn']
+        self.__setups = [[(decode(code), Position(x, y)) for code, x, y in team_setup]
+                         for team_setup in checkpoint['setups']]
+        self.__last_setup_turn = checkpoint['last_setup_turn']
+        self.__moves = [0] * PLAYER_SLOTS
+        for slot, moves in checkpoint['moves']:
+            self.__moves[slot] = moves
+        self.__used_reroll = checkpoint['used_reroll']
+        self.__leader_reroll = list(checkpoint['leader_reroll'])
+        self.__touchdown_row = list(checkpoint['touchdown_row'])
+        if journal_enabled:
+            self.enable_journal()
+
+    def enable_journal(self):
+        """
+        Start recording each change to the state so that `undo()` and `redo()` can step backwards and forwards
+        through the game. Changes are grouped into steps by calling `end_step()`.
+        """
+        self.__journal = []
+        self.__journal_steps = []
+        self.__journal_position = 0
+        self.__step_header = self.__header()
+
+    def end_step(self):
+        """
+        Group the changes since the last step into a new step in the journal, even if nothing changed
+        """
+        if self.__journal is None:
+            return
+        header = self.__header()
+        if self.__journal_position != len(self.__journal_steps):
+            raise ValueError("Cannot change the game while there are undone steps")
+        self.__journal_steps.append((tuple(self.__journal), self.__step_header, header))
+        self.__journal_position += 1
+        self.__journal = []
+        self.__step_header = header
+
+    def undo(self):
+        """
+        Revert the changes in the last step of the journal. Returns False if there are no steps to undo.
+        """
+        if self.__journal is None:
+            raise ValueError("Journal is not enabled")
+        if self.__journal or self.__header() != self.__step_header:
+            self.end_step()
+        if self.__journal_position == 0:
+            return False
+        self.__journal_position -= 1
+        changes, header, _ = self.__journal_steps[self.__journal_position]
+        self.__apply_changes(reversed(changes), header, False)
+        return True
+
+    def redo(self):
+        """
+        Reapply the changes in the last undone step of the journal. Returns False if there are no steps to redo.
+        """
+        if self.__journal is None:
+            raise ValueError("Journal is not enabled")
+        if self.__journal_position == len(self.__journal_steps):
+            return False
+        changes, _, header = self.__journal_steps[self.__journal_position]
+        self.__journal_position += 1
+        self.__apply_changes(changes, header, True)
+        return True
+
+    def __record(self, kind, key, old_value, new_value):
+        if self.__journal_position != len(self.__journal_steps):
+            raise ValueError("Cannot change the game while there are undone steps")
+        self.__journal.append((kind, key, old_value, new_value))
+
+    def __apply_changes(self, changes, header, forwards):
+        journal = self.__journal
+        # Don't record the changes that we're replaying
+        self.__journal = None
+        for kind, key, old_value, new_value in changes:
+            value = new_value if forwards else old_value
+            if kind == _CELL:
+                self.__set_cell(key, value)
+            elif kind == _POSITION:
+                self.__set_player_position(key, value)
+            elif kind == _BALL:
+                self.__set_ball(*value)
+            elif kind == _STATUS:
+                statuses, player = key
+                self.__set_status(statuses, player, value)
+            elif kind == _MOVES:
+                self.__set_moves(key, value)
+        self.__turn, self.turn_team, self.__receiving_team, score, rerolls, apothecaries, self.weather, \
+            self.kickoff_event, self.quick_snap_turn, self.__used_reroll, leader_reroll, touchdown_row, setups, \
+            self.__last_setup_turn = header
+        self.score = list(score)
+        self.__rerolls = list(rerolls)
+        self.apothecaries = list(apothecaries)
+        self.__leader_reroll = list(leader_reroll)
+        self.__touchdown_row = list(touchdown_row)
+        self.__setups = list(setups)
+        self.__step_header = header
+        self.__journal = journal
+
+    def __header(self):
+        # The small, fixed-size parts of the state, which are cheaper to record whole at each step
+        return (self.__turn, self.turn_team, self.__receiving_team, tuple(self.score), tuple(self.__rerolls),
+                tuple(self.apothecaries), self.weather, self.kickoff_event, self.quick_snap_turn, self.__used_reroll,
+                tuple(self.__leader_reroll), tuple(self.__touchdown_row), tuple(self.__setups),
+                self.__last_setup_turn)
+
+    def __decode_player(self, code):
+        return self.teams[code // MAX_PLAYER_COUNT].get_player(code % MAX_PLAYER_COUNT)
 
     def use_reroll(self, team):
         if self.__used_reroll:
@@ -283,7 +867,7 @@ class GameState:
         self.__used_reroll = True
 
     def use_leader_reroll(self, team, player):
-        self.__used_leaders.add(player)
+        self.__set_status(self.__used_leaders, player, True)
         self.__leader_reroll[team.value] = False
         self.__used_reroll = True
 
@@ -303,7 +887,21 @@ class GameState:
         self.apothecaries[team.value] -= 1
 
     def __reset_board(self):
-        self.__board = [[None] * PITCH_WIDTH for _ in range(PITCH_LENGTH)]
-        for team in self.teams:
-            for player in team.get_players():
-                player.position = OFF_PITCH_POSITION
+        if self.__journal is not None:
+            # Clear the board one change at a time so that the changes can be undone
+            for idx, contents in enumerate(self.__board):
+                if contents:
+                    self.__set_cell(idx, None)
+            for player in list(self.__positions):
+                self.__set_player_position(player, None)
+            return
+        self.__board = [None] * PITCH_CELLS
+        # Per-team counts of the tackle zones on each space, or None until get_tacklezone_counts() needs them
+        self.__tacklezones = None
+        # Zobrist hashes of the board and of the board rotated with Position.invert(), or None until they are needed
+        self.__hashes = None
+        # Cached parts of the last snapshot that can be shared until they change
+        self.__snapshot_rows = [None] * PITCH_LENGTH
+        self.__snapshot_positions = None
+        # Player positions are per-game, so that several replays can share the same Team and Player objects
+        self.__positions = {}
@@ -86,6 +86,8 @@ class Team:
         self._player_number_map[player.number] = idx
         self._players[idx] = player
         player.team = self
+        # Unique across both teams in a match, so that per-player state can be stored in fixed-size arrays
+        player.slot = self.team_type.value * MAX_PLAYER_COUNT + idx
 
     def get_players(self):
         return filter(None, self._players)
@@ -97,5 +99,8 @@ class Team:
         idx = self._player_number_map[int(number)]
         return self._players[idx]
 
+    def get_player_idx(self, player):
+        return self._player_number_map[player.number]
+
     def get_player_number(self, idx):
         return self._players[idx].number
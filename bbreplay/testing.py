@@ -0,0 +1,175 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+"""
+Synthetic matches for tests and benchmarks, built from commands and log entries in the same way as the
+ones that are read from replay files
+"""
+
+from . import TeamType, CoinToss, ScatterDirection, KickoffEvent, BlockResult, ActionResult
+from .command import CoinTossCommand, RoleCommand, SetupCommand, SetupCompleteCommand, KickoffCommand, \
+    PreKickoffCompleteCommand, MovementCommand, EndMovementCommand, EndTurnCommand, AbandonMatchCommand, \
+    TargetPlayerCommand, TargetSpaceCommand, DiceChoiceCommand, PushbackCommand, FollowUpChoiceCommand
+from .log import TossRandomisationEntry, MatchLogEntry, CoinTossLogEntry, RoleLogEntry, WeatherLogEntry, \
+    KickDirectionLogEntry, KickDistanceLogEntry, KickoffEventLogEntry, BounceLogEntry, BlockLogEntry, PickupEntry, \
+    DodgeEntry, ArmourValueRollEntry
+
+
+SETUP_ROWS = {TeamType.HOME: 10, TeamType.AWAY: 15}
+# Each team moves away from the other team so that there are no dodges
+MOVE_DIRECTIONS = {TeamType.HOME: -1, TeamType.AWAY: 1}
+
+
+def _match_start(home_team, away_team):
+    randomisation = TossRandomisationEntry()
+    randomisation.team = TeamType.AWAY
+    randomisation.result = CoinToss.HEADS
+    log_entries = [
+        randomisation,
+        MatchLogEntry(home_team.name, "HOM", away_team.name, "AWY"),
+        CoinTossLogEntry(TeamType.AWAY, "Heads"),
+        RoleLogEntry(TeamType.AWAY, "Receive"),
+        WeatherLogEntry("Nice")
+    ]
+    cmds = [
+        CoinTossCommand(1, 0, TeamType.AWAY, 6, [CoinToss.HEADS.value]),
+        RoleCommand(2, 0, TeamType.AWAY, 7, [1])
+    ]
+    return cmds, log_entries
+
+
+def create_match(home_team, away_team, turns, steps=1, all_players=False):
+    """
+    Create the commands and log entries for a simple first half where the away team receives and each team
+    moves its first player (or all of its players) `steps` spaces away from the other team and back again
+    on alternate turns before abandoning the match
+    """
+    cmds, log_entries = _match_start(home_team, away_team)
+    log_entries.extend([
+        KickDirectionLogEntry(TeamType.HOME, "1", ScatterDirection.S.value),
+        KickDistanceLogEntry(TeamType.HOME, "1", 1),
+        KickoffEventLogEntry(KickoffEvent.CHEERING_FANS.value),
+        BounceLogEntry(ScatterDirection.N.value)
+    ])
+    for team in [home_team, away_team]:
+        for idx, _ in enumerate(team.get_players()):
+            cmds.append(SetupCommand(len(cmds) + 1, 0, team.team_type, 8,
+                                     [team.team_type.value, idx, idx + 2, SETUP_ROWS[team.team_type]]))
+        cmds.append(SetupCompleteCommand(len(cmds) + 1, 0, team.team_type, 9, []))
+    cmds.append(KickoffCommand(len(cmds) + 1, 0, TeamType.HOME, 10, [7, 20]))
+    cmds.append(PreKickoffCompleteCommand(len(cmds) + 1, 0, TeamType.AWAY, 14, [TeamType.AWAY.value]))
+
+    team_types = [TeamType.AWAY, TeamType.HOME]
+    for turn in range(turns):
+        team_type = team_types[turn % 2]
+        team = home_team if team_type == TeamType.HOME else away_team
+        start_row = SETUP_ROWS[team_type]
+        direction = MOVE_DIRECTIONS[team_type]
+        if (turn // 2) % 2 == 1:
+            start_row += direction * steps
+            direction = -direction
+        players = list(team.get_players()) if all_players else [team.get_player(0)]
+        for idx, _ in enumerate(players):
+            for step in range(1, steps + 1):
+                command_type = EndMovementCommand if step == steps else MovementCommand
+                action_type = 24 if step == steps else 25
+                data = [team_type.value, idx, step - 1, 0, action_type, 0, 0, 0, idx + 2, start_row + direction * step]
+                cmds.append(command_type(len(cmds) + 1, turn, team_type, 25, data))
+        cmds.append(EndTurnCommand(len(cmds) + 1, turn, team_type, 17, [team_type.value]))
+    cmds.append(AbandonMatchCommand(len(cmds) + 1, turns, TeamType.HOME, 59, []))
+    return cmds, log_entries
+
+
+def create_eventful_match(home_team, away_team):
+    """
+    Create the commands and log entries for a match with more than movement. The away team's first player
+    picks up the kick-off, is blitzed by the home team's first player and knocked down so the ball bounces,
+    then dodges away to pick the ball up again and runs in a touchdown. The home team picks up the next
+    kick-off, the match goes through half-time and it is abandoned after the second half kick-off.
+
+    Only the first player of each team is set up, and they need a movement allowance of at least 4.
+    """
+    cmds, log_entries = _match_start(home_team, away_team)
+    home_player = home_team.get_player(0)
+    away_player = away_team.get_player(0)
+    turn = 0
+
+    def add(command_type, type_id, team, data):
+        cmds.append(command_type(len(cmds) + 1, turn, team, type_id, data))
+
+    def move(team, path, blitz=False):
+        for step, (x, y) in enumerate(path, start=1):
+            command_type = EndMovementCommand if step == len(path) and not blitz else MovementCommand
+            add(command_type, 25, team, [team.value, 0, step - 1, 0, 24 if step == len(path) else 25, 0, 0, 0, x, y])
+
+    def kickoff(kicking_team, home_position, away_position, target):
+        receiving_team = TeamType.HOME if kicking_team == TeamType.AWAY else TeamType.AWAY
+        positions = {TeamType.HOME: home_position, TeamType.AWAY: away_position}
+        for team_type in [kicking_team, receiving_team]:
+            add(SetupCommand, 8, team_type, [team_type.value, 0, *positions[team_type]])
+            add(SetupCompleteCommand, 9, team_type, [])
+        add(KickoffCommand, 10, kicking_team, list(target))
+        add(PreKickoffCompleteCommand, 14, receiving_team, [receiving_team.value])
+        # The ball scatters one space back towards the kicking team and bounces forwards again
+        log_entries.extend([
+            KickDirectionLogEntry(kicking_team, "1", ScatterDirection.S.value),
+            KickDistanceLogEntry(kicking_team, "1", 1),
+            KickoffEventLogEntry(KickoffEvent.CHEERING_FANS.value),
+            BounceLogEntry(ScatterDirection.N.value)
+        ])
+
+    def end_turn(team):
+        nonlocal turn
+        add(EndTurnCommand, 17, team, [team.value])
+        turn += 1
+
+    kickoff(TeamType.HOME, (7, 8), (7, 14), (8, 15))
+    # The ball lands at 8,15 and the away player picks it up
+    move(TeamType.AWAY, [(8, 15), (8, 14), (8, 13), (8, 12)])
+    log_entries.append(PickupEntry(TeamType.AWAY, away_player.number, "3+", "4", ActionResult.SUCCESS.name))
+    end_turn(TeamType.AWAY)
+
+    # The home player blitzes the ball carrier, pushes them back, follows up and knocks them down
+    add(TargetPlayerCommand, 26, TeamType.HOME, [TeamType.HOME.value, 0, TeamType.AWAY.value, 0, 8, 12])
+    move(TeamType.HOME, [(7, 9), (7, 10), (7, 11)], blitz=True)
+    add(TargetSpaceCommand, 25, TeamType.HOME, [TeamType.HOME.value, 0, 0, 0, 0, 0, 0, 0, 8, 12])
+    log_entries.append(BlockLogEntry(TeamType.HOME, home_player.number).complete([BlockResult.DEFENDER_DOWN]))
+    add(DiceChoiceCommand, 19, TeamType.HOME, [TeamType.HOME.value, 0, 0])
+    add(PushbackCommand, 46, TeamType.HOME, [TeamType.HOME.value, 0, 9, 13])
+    add(FollowUpChoiceCommand, 45, TeamType.HOME, [1])
+    log_entries.extend([
+        ArmourValueRollEntry(TeamType.AWAY, away_player.number, "9+", "5", ActionResult.FAILURE.name),
+        BounceLogEntry(ScatterDirection.E.value)
+    ])
+    end_turn(TeamType.HOME)
+
+    # The away player stands up and dodges away from the home player to pick up the ball at 10,13
+    move(TeamType.AWAY, [(10, 13)])
+    log_entries.extend([
+        DodgeEntry(TeamType.AWAY, away_player.number, "3+", "4", ActionResult.SUCCESS.name),
+        PickupEntry(TeamType.AWAY, away_player.number, "3+", "4", ActionResult.SUCCESS.name)
+    ])
+    end_turn(TeamType.AWAY)
+    end_turn(TeamType.HOME)
+
+    for start_row in [13, 9, 5]:
+        move(TeamType.AWAY, [(10, row) for row in range(start_row - 1, start_row - 5, -1)])
+        end_turn(TeamType.AWAY)
+        end_turn(TeamType.HOME)
+    # Touchdown ends the turn without an EndTurnCommand
+    move(TeamType.AWAY, [(10, 0)])
+    turn += 1
+
+    # The home team picks up the next kick-off, then both teams wait for half-time
+    kickoff(TeamType.AWAY, (7, 8), (7, 14), (7, 5))
+    move(TeamType.HOME, [(7, 7), (7, 6), (7, 5)])
+    log_entries.append(PickupEntry(TeamType.HOME, home_player.number, "3+", "4", ActionResult.SUCCESS.name))
+    end_turn(TeamType.HOME)
+    while turn < 16:
+        end_turn(TeamType.AWAY if turn % 2 == 0 else TeamType.HOME)
+
+    kickoff(TeamType.AWAY, (7, 8), (7, 14), (7, 5))
+    move(TeamType.HOME, [(7, 7), (7, 6)])
+    end_turn(TeamType.HOME)
+    add(AbandonMatchCommand, 59, TeamType.HOME, [])
+    return cmds, log_entries
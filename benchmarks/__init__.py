@@ -0,0 +1,35 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+import timeit
+from bbreplay import TeamType
+from bbreplay.player import Player
+from bbreplay.teams import Team
+from bbreplay.testing import create_match
+
+
+def create_teams(player_count=11):
+    teams = []
+    for team_type in [TeamType.HOME, TeamType.AWAY]:
+        team = Team(f"{team_type.name.title()} Team", "Human", 1000000, 3, 3, 1, team_type)
+        for idx in range(player_count):
+            team.add_player(idx, Player(idx + 1, f"Player{idx + 1}", 6, 3, 3, 8, 1, 0, 50000, []))
+        teams.append(team)
+    return teams
+
+
+def create_movement_match(home_team, away_team, turns, steps=3):
+    """
+    Create the commands and log entries for a match where every player on the active team moves `steps`
+    spaces away from the other team and back again on alternate turns
+    """
+    return create_match(home_team, away_team, turns, steps, all_players=True)
+
+
+def run_benchmark(name, func, number, repeat=5):
+    """
+    Print the best time per call of `func` over `repeat` runs of `number` calls
+    """
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"{name}: {best * 1000:.3f}ms per run")
+    return best
@@ -0,0 +1,72 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+"""
+Benchmark ball resolution for the bounce, catch and throw-in chains from `tests/test_replay__ball_movement.py`
+
+Run with `python -m benchmarks.ball_movement`
+"""
+
+from bbreplay import ActionResult, Peekable, Position, ScatterDirection, TeamType, ThrowInDirection
+from bbreplay.command import DeclineRerollCommand
+from bbreplay.log import BounceLogEntry, CatchEntry, ThrowInDirectionLogEntry, ThrowInDistanceLogEntry
+from bbreplay.replay import Replay
+from bbreplay.state import GameState
+from . import create_teams, run_benchmark
+
+
+def create_board(home_team, away_team, positions, prone_positions=()):
+    board = GameState(home_team, away_team, TeamType.HOME)
+    board.kickoff()
+    players = list(home_team.get_players()) + list(away_team.get_players())
+    for player, position in zip(players, positions + list(prone_positions)):
+        board.set_position(position, player)
+        if position in prone_positions:
+            board.set_prone(player)
+    board.setup_complete()
+    return board
+
+
+def resolve_ball(replay, board, ball_position, cmds, log_entries):
+    board.set_ball_carrier(None)
+    board.set_ball_position(ball_position)
+    for _ in replay._process_ball_movement(Peekable(iter(cmds)), Peekable(iter(log_entries)), board):
+        pass
+
+
+def main():
+    home_team, away_team = create_teams()
+    replay = Replay(home_team, away_team, [], [])
+
+    throwin_board = create_board(home_team, away_team, [Position(7, 12)])
+    throwin_log = [
+        BounceLogEntry(ScatterDirection.W.value),
+        ThrowInDirectionLogEntry(ThrowInDirection.DOWN_PITCH.value),
+        ThrowInDistanceLogEntry(3),
+        BounceLogEntry(ScatterDirection.W.value)
+    ]
+    run_benchmark("Bounce, throw-in and bounce",
+                  lambda: resolve_ball(replay, throwin_board, Position(0, 7), [], throwin_log), 2000)
+
+    fumble_board = create_board(home_team, away_team, [Position(13, 11)], [Position(14, 10)])
+    fumble_cmds = [DeclineRerollCommand(1, 1, TeamType.HOME, 1, [])]
+    fumble_log = [
+        BounceLogEntry(ScatterDirection.S.value),
+        CatchEntry(TeamType.HOME, 1, "3+", "1", ActionResult.FAILURE.name),
+        BounceLogEntry(ScatterDirection.SE.value),
+        BounceLogEntry(ScatterDirection.W.value)
+    ]
+    run_benchmark("Bounce, failed catch and prone bounce",
+                  lambda: resolve_ball(replay, fumble_board, Position(13, 12), fumble_cmds, fumble_log), 2000)
+
+    chain_board = create_board(home_team, away_team, [], [Position(7, 10), Position(7, 11)])
+    for length in [10, 100, 500]:
+        chain_log = [BounceLogEntry((ScatterDirection.N if i % 2 == 0 else ScatterDirection.S).value)
+                     for i in range(length)]
+        chain_log.append(BounceLogEntry(ScatterDirection.W.value))
+        run_benchmark(f"{length} bounces between prone players",
+                      lambda: resolve_ball(replay, chain_board, Position(7, 10), [], chain_log), 20000 // length)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+"""
+Benchmark `Replay.events(include=...)` and `Replay.run()` handlers against filtering all of `Replay.events()`
+for the same events
+
+Run with `python -m benchmarks.filtering [replays-dir]` to use a directory of replays and logs instead of
+a generated movement-heavy match
+"""
+
+import glob
+import os.path
+import sys
+from pathlib import Path
+from bbreplay.replay import Replay, EndTurn, Kickoff, Movement, SetupComplete, create_replay
+from . import create_teams, create_movement_match, run_benchmark
+
+
+def load_replays(replays_dir):
+    replays = []
+    for db_path in sorted(glob.glob(os.path.join(replays_dir, '*.db'))):
+        log_path = Path(db_path).with_suffix('.log')
+        if log_path.exists():
+            replays.append(create_replay(db_path, log_path))
+    return replays
+
+
+def filter_events(replays, event_types):
+    for replay in replays:
+        try:
+            for event in replay.events():
+                if isinstance(event, event_types):
+                    pass
+        except Exception:
+            # Partial replays fail in the same place for both APIs, so it's still a fair comparison
+            pass
+
+
+def include_events(replays, event_types):
+    for replay in replays:
+        try:
+            for _ in replay.events(include=event_types):
+                pass
+        except Exception:
+            pass
+
+
+def run_handlers(replays, event_types):
+    handlers = {event_type: (lambda event: None) for event_type in event_types}
+    for replay in replays:
+        try:
+            replay.run(handlers)
+        except Exception:
+            pass
+
+
+def main():
+    if len(sys.argv) > 1:
+        replays = load_replays(sys.argv[1])
+        number = 1
+    else:
+        home_team, away_team = create_teams()
+        cmds, log_entries = create_movement_match(home_team, away_team, 16)
+        replays = [Replay(home_team, away_team, cmds, log_entries)]
+        number = 20
+
+    # The turn-by-turn map only wants the setup, kickoff and end of each turn
+    for event_types in [(SetupComplete, Kickoff, EndTurn), (Movement, EndTurn)]:
+        names = ", ".join(event_type.__name__ for event_type in event_types)
+        run_benchmark(f"events() filtered to {names}", lambda: filter_events(replays, event_types), number)
+        run_benchmark(f"events() including {names}", lambda: include_events(replays, event_types), number)
+        run_benchmark(f"run() with handlers for {names}", lambda: run_handlers(replays, event_types), number)
+
+
+if __name__ == '__main__':
+    main()
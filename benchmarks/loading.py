@@ -0,0 +1,41 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+"""
+Benchmark loading replays with `create_replay()` sequentially and with the database and log loaded in parallel
+
+Run with `python -m benchmarks.loading replays-dir`
+"""
+
+import glob
+import os.path
+import sys
+from pathlib import Path
+from bbreplay.replay import create_replay
+from . import run_benchmark
+
+
+def load_replays(replay_files, parallel):
+    for db_path, log_path in replay_files:
+        try:
+            create_replay(db_path, log_path, parallel=parallel)
+        except Exception:
+            # Some replays don't validate, but they've still been loaded by then
+            pass
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python -m benchmarks.loading replays-dir")
+    replay_files = []
+    for db_path in sorted(glob.glob(os.path.join(sys.argv[1], '*.db'))):
+        log_path = Path(db_path).with_suffix('.log')
+        if log_path.exists():
+            replay_files.append((db_path, log_path))
+
+    for parallel in [False, 'thread', 'process']:
+        run_benchmark(f"create_replay(parallel={parallel!r})", lambda: load_replays(replay_files, parallel), 1)
+
+
+if __name__ == '__main__':
+    main()
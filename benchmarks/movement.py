@@ -0,0 +1,52 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+"""
+Benchmark movement-heavy turns, where every player on the active team moves each turn
+
+Run with `python -m benchmarks.movement`
+"""
+
+from bbreplay import Position, TeamType
+from bbreplay.replay import Replay
+from bbreplay.state import GameState
+from . import create_teams, create_movement_match, run_benchmark
+
+
+def replay_match(home_team, away_team, cmds, log_entries):
+    for _ in Replay(home_team, away_team, cmds, log_entries).events():
+        pass
+
+
+def move_players(board, players):
+    for turn in range(16):
+        board.start_turn(TeamType.HOME)
+        direction = 1 if turn % 2 == 0 else -1
+        for player in players:
+            position = board.get_player_position(player)
+            for _ in range(3):
+                new_position = Position(position.x, position.y + direction)
+                if not board.is_prone(player) and board.get_tacklezones(TeamType.AWAY, position) == 0 \
+                   and board.get_distance_moved(player) < player.MA:
+                    board.move(player, position, new_position)
+                position = new_position
+        board.end_turn(TeamType.HOME)
+        board.end_turn(TeamType.AWAY)
+
+
+def main():
+    home_team, away_team = create_teams()
+    cmds, log_entries = create_movement_match(home_team, away_team, 16)
+    run_benchmark("Replay 16 movement turns", lambda: replay_match(home_team, away_team, cmds, log_entries), 20)
+
+    players = list(home_team.get_players())
+    board = GameState(home_team, away_team, TeamType.HOME)
+    for idx, player in enumerate(players):
+        board.set_position(Position(idx + 2, 5), player)
+    board.setup_complete()
+    board.kickoff()
+    run_benchmark("GameState 16 movement turns", lambda: move_players(board, players), 50)
+
+
+if __name__ == '__main__':
+    main()
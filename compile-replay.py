@@ -0,0 +1,22 @@
+# Copyright © 2021, IBBoard
+# Licensed under GPLv3 or later - see COPYING
+
+import argparse
+import os.path
+from pathlib import Path
+from bbreplay.compiled import write_compiled_replay
+from bbreplay.replay import create_replay
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Process a Blood Bowl replay file and save the events as a compiled '
+                                                 'replay that can be read without re-processing the replay')
+    parser.add_argument('replay_file', metavar='replay-file', help='the replay database to parse')
+    parser.add_argument('log_file', metavar='log-file', help='the replay log to parse')
+    parser.add_argument('--output', '-o',
+                        help='output file for the compiled replay (defaults to the replay file with a .bbrc suffix)')
+    args = parser.parse_args()
+
+    output = args.output or Path(args.replay_file).with_suffix('.bbrc')
+    write_compiled_replay(create_replay(args.replay_file, args.log_file), output)
+    print(f"Compiled {os.path.basename(args.replay_file)} to {output}")
@@ -3,7 +3,7 @@
 
 import argparse
 import os.path
-from bbreplay import Peekable, TeamType
+from bbreplay import Peekable, TeamType, TraceBuffer, format_trace
 from bbreplay.replay import create_replay
 
 
@@ -45,12 +45,17 @@ if __name__ == '__main__':
                         help='include verbose messages (including suspected network traffic)')
     parser.add_argument('--debug', action='store_true',
                         help='include debug messages to track progress')
+    parser.add_argument('--trace', type=int, metavar='N',
+                        help='print the last N commands and log entries that were consumed if processing fails, '
+                             'instead of printing every one with --debug')
     args = parser.parse_args()
 
     print(f"{os.path.basename(args.replay_file)}\n")
     replay = create_replay(args.replay_file, args.log_file)
 
-    if args.debug:
+    if args.trace:
+        replay.set_generator(TraceBuffer(args.trace))
+    elif args.debug:
         replay.set_generator(LoggingGenrator)
 
     home_team, away_team = replay.get_teams()
@@ -75,10 +80,17 @@ if __name__ == '__main__':
 
     print("\n+++ Events")
 
-    for event in replay.events():
-        # Fudge the output so that we're not dumping the board each time,
-        # because it gets messy and unreadable
-        event_details = event._asdict()
-        if 'board' in event_details:
-            del(event_details['board'])
-        print(f"{type(event).__name__}{event_details}")
+    try:
+        for event in replay.events():
+            # Fudge the output so that we're not dumping the board each time,
+            # because it gets messy and unreadable
+            event_details = event._asdict()
+            if 'board' in event_details:
+                del(event_details['board'])
+            print(f"{type(event).__name__}{event_details}")
+    except Exception as ex:
+        if hasattr(ex, 'replay_trace'):
+            print("\n+++ Last consumed")
+            for line in format_trace(ex.replay_trace):
+                print(f"\tConsumed {line}")
+        raise
@@ -55,7 +55,7 @@ def player_to_text(player, pretty, board=None):
     if pretty:
         # TODO: Can we pull this from the team? Relies on 24-bit terminals
         colour = HOME_TEAM_COLOUR if team_type == TeamType.HOME else AWAY_TEAM_COLOUR
-    if board and board.get_ball_position() == player.position:
+    if board and board.get_ball_position() == board.get_player_position(player):
         if pretty:
             player_str = BALL_COLOUR + "●" + colour
         else:
@@ -147,7 +147,8 @@ if __name__ == '__main__':
     args = parser.parse_args()
 
     print(f"{os.path.basename(args.replay_file)}")
-    replay = create_replay(args.replay_file, args.log_file)
+    # Someone is waiting on this one replay, so load the database while the log is parsed
+    replay = create_replay(args.replay_file, args.log_file, parallel=True)
     home_team, away_team = replay.get_teams()
 
     print_team(home_team, args.pretty)
@@ -168,13 +169,20 @@ if __name__ == '__main__':
             print("\n", text)
 
     needs_reset = args.from_turn <= 1
+    # The replay skips the events before the first turn to map instead of us discarding them
+    from_turn = args.from_turn if args.from_turn > 0 else None
+
+    if args.pretty and args.animate:
+        events = replay.events(from_turn=from_turn, checkpoints=True,
+                               exclude=[KickoffEventTuple, WeatherTuple, FailedMovement, TeamSetupComplete])
+    else:
+        # Without animation, we only map the setup, kickoff and end of each turn
+        events = replay.events(from_turn=from_turn, checkpoints=True, include=[SetupComplete, Kickoff, EndTurn])
 
     try:
-        for event in replay.events():
+        for event in events:
             event_type = type(event)
-            if event_type in [KickoffEventTuple, WeatherTuple, FailedMovement, TeamSetupComplete]:
-                continue
-            if args.pretty and args.animate and board and board.turn >= args.from_turn:
+            if args.pretty and args.animate and board:
                 if needs_reset:
                     time.sleep(SLEEP_TIME)
                     reset_console()
@@ -182,8 +190,6 @@ if __name__ == '__main__':
                     needs_reset = True
             if hasattr(event, 'board'):
                 board = event.board
-            if board and board.turn < args.from_turn:
-                continue
             if event_type is SetupComplete:
                 print_title("Setup")
                 print(draw_map(event.board, args.pretty))
@@ -4,74 +4,350 @@
 import argparse
 import glob
 import json
+import multiprocessing
+import multiprocessing.connection
 import os.path
 import sqlite3
 import sys
+import time
+import traceback
+from collections import namedtuple
 from pathlib import Path
-from bbreplay import TeamType
+from bbreplay import Peekable, TeamType, TraceBuffer, format_trace
+from bbreplay.cache import ReplayCache, source_fingerprint
 from bbreplay.command import create_commands
+from bbreplay.compiled import CompiledReplayWriter
 from bbreplay.log import parse_log_entries
+from bbreplay.prescan import prescan_replay
+from bbreplay.profiling import ReplayProfiler
 from bbreplay.replay import Replay
 from bbreplay.teams import create_team
 
 
+# The command line options that affect how each replay is measured, in a form that can be sent to other processes
+MeasureOptions = namedtuple('MeasureOptions', ['cache_dir', 'fingerprint', 'cache_events', 'prescan',
+                                               'skip_misaligned', 'profile', 'trace'])
+
+
+def process_replay(db_path, log_path, compiled_path=None, profiler=None, trace=None):
+    """
+    Process a replay and return the metrics for it, the description of the error that stopped processing, and the
+    trace of the last commands and log entries that were consumed before the error.
+    With `compiled_path`, the events that were processed are also saved as a compiled replay. With `profiler`,
+    the processing is profiled with that ReplayProfiler. With `trace`, the replay uses that TraceBuffer as its
+    generator, otherwise there is no trace.
+    """
+    # Duplicate the `create_replay()` function because we need to wrap the commands
+    db = sqlite3.connect(db_path)
+    home_team = create_team(db, TeamType.HOME)
+    away_team = create_team(db, TeamType.AWAY)
+
+    commands = create_commands(db)
+    log_entries = parse_log_entries(log_path)
+    num_commands = len(commands)
+
+    # Wrap commands so we can track how far the process got
+    commands = Peekable(commands)
+    replay = Replay(home_team, away_team, commands, log_entries)
+    if profiler:
+        profiler.attach(replay)
+    if trace:
+        replay.set_generator(trace)
+
+    i = 0
+    error = None
+    error_trace = None
+    compiled_file = open(compiled_path, 'wb') if compiled_path else None
+    writer = CompiledReplayWriter(compiled_file, replay.get_teams()) if compiled_file else None
+
+    try:
+        replay.validate()
+        # We can't just do len() because it might throw an exception
+        # But we don't care about the content, just the number
+        for event in replay.events():
+            i += 1
+            if writer:
+                writer.write_event(event)
+    except Exception as ex:  # We explicitly don't want to stop on any processing failure
+        error = f"{type(ex).__name__}: {ex}"
+        error_trace = getattr(ex, 'replay_trace', None)
+    finally:
+        if writer:
+            writer.close()
+            compiled_file.close()
+
+    num_commands_processed = commands.consumed
+    return {
+        "commands": num_commands,
+        "events": i,
+        "processed": num_commands_processed,
+        "unprocessed": num_commands - num_commands_processed,
+        "proportion": num_commands_processed / num_commands
+    }, error, error_trace
+
+
+def measure_replay(db_path, log_path, options):
+    """
+    Get the result for a replay with the given MeasureOptions, using the cache if there is one,
+    or None if the replay was skipped
+    """
+    predicted_failure = None
+    if options.prescan:
+        problems = prescan_replay(db_path, log_path).problems
+        if problems:
+            problem = problems[0]
+            predicted_failure = {
+                "drive": problem.drive,
+                "turn": problem.turn,
+                "team": problem.team.name if problem.team else None,
+                "message": problem.message
+            }
+            if options.skip_misaligned:
+                print(f"Skipping {db_path} - turn {problem.turn}: {problem.message}", file=sys.stderr)
+                return None
+
+    cache = ReplayCache(options.cache_dir, options.fingerprint) if options.cache_dir else None
+    cached = None
+    if cache:
+        key = cache.key(db_path, log_path)
+        # Profiles aren't cached because they're timings of this run, and traces because they depend on their size
+        cached = cache.get(key) if not options.profile and not options.trace else None
+        if cached and options.cache_events and not cache.compiled_replay_path(key).exists():
+            cached = None
+
+    profiler = ReplayProfiler() if options.profile else None
+    trace = TraceBuffer(options.trace) if options.trace else None
+    if cached:
+        result = cached['result']
+    else:
+        compiled_path = cache.compiled_replay_path(key) if options.cache_events else None
+        result, error, error_trace = process_replay(db_path, log_path, compiled_path, profiler, trace)
+        if cache:
+            cache.put(key, {'result': result, 'error': error})
+        if error_trace:
+            result = dict(result, error=error, replay_trace=format_trace(error_trace))
+
+    if profiler:
+        result = dict(result, profile=profiler.get_stats())
+    if options.prescan:
+        result = dict(result, predicted_failure=predicted_failure)
+    return result
+
+
+def _unprocessed_result(db_path):
+    db = sqlite3.connect(db_path)
+    try:
+        num_commands = db.execute('SELECT COUNT(*) FROM Replay_NetCommands').fetchone()[0]
+    except sqlite3.Error:
+        # A database that can't be read has no commands that could be processed
+        num_commands = 0
+    finally:
+        db.close()
+    return {
+        "commands": num_commands,
+        "events": 0,
+        "processed": 0,
+        "unprocessed": num_commands,
+        "proportion": 0.0
+    }
+
+
+def timeout_result(db_path):
+    """
+    Get the result for a replay that took too long to process, which counts as processing none of it
+    """
+    return dict(_unprocessed_result(db_path), timeout=True)
+
+
+def failed_result(db_path, failure):
+    """
+    Get the result for a replay whose process failed or was killed without a result, which counts as processing
+    none of it
+    """
+    return dict(_unprocessed_result(db_path), failure=failure)
+
+
+def measure_replays(replays, options):
+    """
+    Measure (db path, log path) replays one at a time in this process. Replays that fail outside of processing
+    (such as with a corrupt database) get a `failed_result()`, in the same way as for
+    `measure_replays_in_processes()`. Generates (db path, result) as each replay finishes.
+    """
+    for db_path, log_path in replays:
+        try:
+            result = measure_replay(db_path, log_path, options)
+        except Exception:
+            failure = traceback.format_exc()
+            print(f"Failed to measure {db_path}:\n{failure}", file=sys.stderr)
+            result = failed_result(db_path, failure.strip().splitlines()[-1])
+        yield db_path, result
+
+
+def _measure_in_worker(connection, options):
+    # Measure (db path, log path) replays from the connection until it sends None or is closed
+    try:
+        while True:
+            replay = connection.recv()
+            if replay is None:
+                break
+            db_path, log_path = replay
+            try:
+                connection.send((True, measure_replay(db_path, log_path, options)))
+            except Exception:
+                connection.send((False, traceback.format_exc()))
+    except EOFError:
+        pass
+    finally:
+        connection.close()
+
+
+def _start_worker(options):
+    connection, worker_connection = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_measure_in_worker, args=(worker_connection, options))
+    process.start()
+    worker_connection.close()
+    return process, connection
+
+
+def _stop_worker(process, connection, kill=False):
+    if not kill:
+        try:
+            connection.send(None)
+        except OSError:
+            kill = True
+    if kill:
+        process.kill()
+    process.join()
+    connection.close()
+
+
+def measure_replays_in_processes(replays, options, jobs, timeout=None):
+    """
+    Measure (db path, log path) replays in up to `jobs` worker processes at once, reusing each worker for later
+    replays. Workers that take more than `timeout` seconds are killed and the replay gets a `timeout_result()`.
+    Workers that fail or that are killed by something else (such as running out of memory) give the replay a
+    `failed_result()`. Generates (db path, result) as each replay finishes.
+    """
+    pending = list(replays)
+    idle = []
+    running = {}
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                db_path, log_path = pending.pop(0)
+                process, connection = idle.pop() if idle else _start_worker(options)
+                try:
+                    connection.send((db_path, log_path))
+                except OSError:
+                    # The idle worker died while it was waiting, so replace it
+                    _stop_worker(process, connection, kill=True)
+                    process, connection = _start_worker(options)
+                    connection.send((db_path, log_path))
+                deadline = time.monotonic() + timeout if timeout else None
+                running[connection] = (process, db_path, deadline)
+
+            deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+            wait_time = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            for connection in multiprocessing.connection.wait(list(running), wait_time):
+                process, db_path, _ = running.pop(connection)
+                try:
+                    succeeded, value = connection.recv()
+                except EOFError:
+                    _stop_worker(process, connection, kill=True)
+                    failure = f"Process ended without a result (exit code {process.exitcode})"
+                    print(f"Failed to measure {db_path}: {failure}", file=sys.stderr)
+                    yield db_path, failed_result(db_path, failure)
+                    continue
+                idle.append((process, connection))
+                if not succeeded:
+                    print(f"Failed to measure {db_path}:\n{value}", file=sys.stderr)
+                    value = failed_result(db_path, value.strip().splitlines()[-1])
+                yield db_path, value
+
+            now = time.monotonic()
+            for connection, (process, db_path, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    del running[connection]
+                    _stop_worker(process, connection, kill=True)
+                    print(f"Timed out processing {db_path}", file=sys.stderr)
+                    yield db_path, timeout_result(db_path)
+    finally:
+        for connection, (process, _, _) in running.items():
+            _stop_worker(process, connection, kill=True)
+        for process, connection in idle:
+            _stop_worker(process, connection)
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Process a batch of Blood Bowl replay files to calculate'
                                                  ' coverage/completeness metrics')
     parser.add_argument('replays_dir', metavar='replays-dir', help='input directory of replays and logs')
     parser.add_argument('--output', '-o', help='output file for metrics (otherwise prints to stdout)')
     parser.add_argument('--plot', '-p', help='output file for plot values')
+    parser.add_argument('--cache', help='directory to cache results in, so that replays are only processed again '
+                                        'when they or BBReplay change')
+    parser.add_argument('--cache-events', action='store_true',
+                        help='also cache the processed events as compiled replays. Requires --cache')
+    parser.add_argument('--prescan', action='store_true',
+                        help='check that the commands and log line up before processing and include the predicted '
+                             'failure in the results')
+    parser.add_argument('--skip-misaligned', action='store_true',
+                        help='skip processing replays that the pre-scan predicts will fail. Implies --prescan')
+    parser.add_argument('--profile', action='store_true',
+                        help='profile the time spent in each part of processing, for each replay and in total. '
+                             'Replays are always processed, even if they are cached')
+    parser.add_argument('--trace', type=int, metavar='N',
+                        help='include the error and the last N commands and log entries that were consumed before it '
+                             'in the results of replays that fail. Replays are always processed, even if they are '
+                             'cached')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='number of replays to process at once in separate processes')
+    parser.add_argument('--timeout', type=float,
+                        help='seconds to allow for each replay before recording it as a timeout')
     args = parser.parse_args()
 
-    total_commands = 0
-    total_processed = 0
-    total_unprocessed = 0
-    results = {}
+    if args.cache_events and not args.cache:
+        parser.error("--cache-events requires --cache")
+    if args.skip_misaligned:
+        args.prescan = True
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    # Work out the fingerprint once rather than in every process
+    fingerprint = source_fingerprint() if args.cache else None
+    options = MeasureOptions(args.cache, fingerprint, args.cache_events, args.prescan, args.skip_misaligned,
+                             args.profile, args.trace)
 
-    for db_path in glob.glob(os.path.join(args.replays_dir, '*.db')):
+    replays = []
+    # Sort so that the output is the same however the replays are processed
+    for db_path in sorted(glob.glob(os.path.join(args.replays_dir, '*.db'))):
         log_path = Path(db_path).with_suffix('.log')
         if not log_path.exists():
-            print(f"Found replay file with no matching log - {db_path}", sys.stderr)
+            print(f"Found replay file with no matching log - {db_path}", file=sys.stderr)
             continue
+        replays.append((db_path, log_path))
 
-        # Duplicate the `create_replay()` function because we need to wrap the commands
-        db = sqlite3.connect(db_path)
-        home_team = create_team(db, TeamType.HOME)
-        away_team = create_team(db, TeamType.AWAY)
-
-        commands = create_commands(db)
-        log_entries = parse_log_entries(log_path)
-        num_commands = len(commands)
-        total_commands += num_commands
-
-        # Wrap commands in an iter so we can track how far the process got
-        commands = iter(commands)
-        replay = Replay(home_team, away_team, commands, log_entries)
+    if args.jobs > 1 or args.timeout:
+        # Timeouts need a process that can be killed, even when there's only one job
+        measured = dict(measure_replays_in_processes(replays, options, args.jobs, args.timeout))
+    else:
+        measured = dict(measure_replays(replays, options))
 
-        i = 0
+    total_commands = 0
+    total_processed = 0
+    total_unprocessed = 0
+    results = {}
+    batch_profiler = ReplayProfiler() if args.profile else None
 
-        try:
-            replay.validate()
-            # We can't just do len() because it might throw an exception
-            # But we don't care about the content, just the number
-            for _ in replay.events():
-                i += 1
-        except:  # noqa: E722 - we explicitly don't want to stop on anything
-            pass
-        finally:
-            num_commands_unprocessed = len(list(commands))
-            num_commands_processed = num_commands - num_commands_unprocessed
-
-            total_processed += num_commands_processed
-            total_unprocessed += num_commands_unprocessed
-
-            results[db_path] = {
-                "commands": num_commands,
-                "events": i,
-                "processed": num_commands_processed,
-                "unprocessed": num_commands_unprocessed,
-                "proportion": num_commands_processed / num_commands
-            }
+    for db_path, _ in replays:
+        result = measured[db_path]
+        if result is None:
+            continue
+        if batch_profiler and 'profile' in result:
+            batch_profiler.merge(result['profile'])
+        total_commands += result['commands']
+        total_processed += result['processed']
+        total_unprocessed += result['unprocessed']
+        results[db_path] = result
 
     score_weight = 1.0 / len(results)
     scores = sorted(result['proportion'] for result in results.values())
@@ -83,6 +359,8 @@ if __name__ == '__main__':
         'weighted_proportion': sum(score * score_weight for score in scores),
         'results': results
     }
+    if batch_profiler:
+        metrics['profile'] = batch_profiler.get_stats()
 
     if args.output:
         with open(args.output, 'w') as f:
@@ -1,8 +1,10 @@
 import pytest
 from bbreplay import Peekable, TeamType
+from bbreplay.command import EndMovementCommand, DiceChoiceCommand
 from bbreplay.player import Player
 from bbreplay.state import GameState
 from bbreplay.teams import Team
+from bbreplay.testing import create_match
 
 
 class iter_(Peekable):
@@ -58,3 +60,37 @@ def board(home_team, away_team):
     gamestate = GameState(home_team, away_team, TeamType.HOME)
     gamestate.kickoff()
     return gamestate
+
+
+def create_match_with_unknown_command(home_team, away_team):
+    """
+    Create a match from `create_match()` where the home team's first turn starts with a command that can't
+    be processed
+    """
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    # Home's first turn (turn 1 in the commands) starts with a dice choice that we can't process
+    home_move = next(idx for idx, cmd in enumerate(cmds) if cmd.turn == 1 and isinstance(cmd, EndMovementCommand))
+    cmds.insert(home_move, DiceChoiceCommand(0, 1, TeamType.HOME, 19, [TeamType.HOME.value, 0, 0]))
+    return cmds, log_entries
+
+
+def describe_event(event):
+    """
+    Get the type and fields of an event without its board, to compare events from different streams
+    """
+    details = event._asdict()
+    details.pop('board', None)
+    return type(event).__name__, details
+
+
+def describe_board(board):
+    """
+    Get the parts of a board (or a snapshot of one) that events change, to compare boards from different streams
+    """
+    players = [player for team in board.teams for player in team.get_players()]
+    # Compare the ball carrier by slot, because compiled replays have their own copies of the players
+    ball_carrier = board.get_ball_carrier()
+    return (board.turn, tuple(board.score), board.get_ball_position(), ball_carrier.slot if ball_carrier else None,
+            [(board.get_player_position(player), board.is_prone(player), board.is_injured(player))
+             for player in players],
+            board.board_hash)
@@ -0,0 +1,60 @@
+from bbreplay.cache import ReplayCache, source_fingerprint
+from bbreplay.compiled import FORMAT_VERSION
+
+
+def _write_replay(tmp_path, db_content, log_content):
+    db_path = tmp_path / "replay.db"
+    log_path = tmp_path / "replay.log"
+    db_path.write_bytes(db_content)
+    log_path.write_bytes(log_content)
+    return db_path, log_path
+
+
+def test_cache_key_depends_on_content(tmp_path):
+    cache = ReplayCache(tmp_path / "cache", fingerprint="abc")
+    db_path, log_path = _write_replay(tmp_path, b"db", b"log")
+    key = cache.key(db_path, log_path)
+    assert cache.key(db_path, log_path) == key
+
+    log_path.write_bytes(b"other log")
+    assert cache.key(db_path, log_path) != key
+    log_path.write_bytes(b"log")
+    assert cache.key(db_path, log_path) == key
+
+    other_cache = ReplayCache(tmp_path / "cache", fingerprint="def")
+    assert other_cache.key(db_path, log_path) != key
+
+
+def test_cache_stores_results(tmp_path):
+    cache = ReplayCache(tmp_path / "cache", fingerprint="abc")
+    db_path, log_path = _write_replay(tmp_path, b"db", b"log")
+    key = cache.key(db_path, log_path)
+    assert cache.get(key) is None
+
+    result = {"result": {"commands": 10, "events": 5}, "error": "ValueError: Oops"}
+    cache.put(key, result)
+    assert cache.get(key) == result
+    assert ReplayCache(tmp_path / "cache", fingerprint="abc").get(key) == result
+    assert cache.compiled_replay_path(key).parent == tmp_path / "cache"
+    assert cache.compiled_replay_path(key).name == f"{key}.v{FORMAT_VERSION}.bbrc"
+
+
+def test_corrupt_cache_entry_is_a_miss(tmp_path):
+    cache = ReplayCache(tmp_path, fingerprint="abc")
+    (tmp_path / "key.json").write_text("{\"result\":")
+    assert cache.get("key") is None
+
+
+def test_source_fingerprint_follows_sources(tmp_path):
+    (tmp_path / "replay.py").write_text("x = 1\n")
+    (tmp_path / "cache.py").write_text("y = 1\n")
+    (tmp_path / "profiling.py").write_text("z = 1\n")
+    fingerprint = source_fingerprint(tmp_path)
+    assert source_fingerprint(tmp_path) == fingerprint
+
+    (tmp_path / "cache.py").write_text("y = 2\n")
+    (tmp_path / "profiling.py").write_text("z = 2\n")
+    assert source_fingerprint(tmp_path) == fingerprint
+
+    (tmp_path / "replay.py").write_text("x = 2\n")
+    assert source_fingerprint(tmp_path) != fingerprint
@@ -0,0 +1,138 @@
+import pytest
+from . import *
+from bbreplay import Skills
+from bbreplay.player import Player
+from bbreplay.compiled import CompiledReplay, CompiledReplayWriter, write_compiled_replay, _frame_delta, \
+    _apply_frame_delta
+from bbreplay.replay import *
+from bbreplay.state import BoardSnapshot, GameState
+from bbreplay.testing import SETUP_ROWS, create_eventful_match
+
+
+def _describe_value(value):
+    if isinstance(value, Player):
+        # Compiled replays have their own copies of the players
+        return 'Player', value.slot
+    elif hasattr(value, '_fields'):
+        # Check namedtuples by their type and attributes so that they can't come back as plain tuples
+        return type(value).__name__, {key: _describe_value(item) for key, item in value._asdict().items()}
+    elif isinstance(value, (list, tuple)):
+        return type(value).__name__, [_describe_value(item) for item in value]
+    return value
+
+
+def _describe(event):
+    details = {key: _describe_value(value) for key, value in event._asdict().items()}
+    board = details.pop('board', None)
+    if board is not None:
+        details['board'] = (board.turn, board.board_hash, board.get_ball_position(), tuple(board.score))
+    return type(event).__name__, details
+
+
+def test_compiled_replay_has_same_events(home_team, away_team, tmp_path):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    path = tmp_path / "match.bbrc"
+    write_compiled_replay(replay, path)
+    expected = [_describe(event) for event in replay.events(snapshots=True)]
+
+    compiled = CompiledReplay(path)
+    events = list(compiled.events())
+    assert len(compiled) == len(events)
+    assert [_describe(event) for event in events] == expected
+    assert compiled.get_turns() == [(1, TeamType.AWAY), (1, TeamType.HOME), (2, TeamType.AWAY), (2, TeamType.HOME)]
+
+    setup = next(event for event in events if isinstance(event, TeamSetupComplete))
+    player_position = setup.player_positions[0]
+    assert isinstance(player_position, PlayerPosition)
+    assert player_position.player.team.team_type == setup.team
+    assert player_position.position == Position(2, SETUP_ROWS[setup.team])
+    assert player_position.number == player_position.player.number
+
+    movement = next(event for event in events if isinstance(event, Movement))
+    assert isinstance(movement.board, BoardSnapshot)
+    assert movement.board.get_player_position(movement.player) == movement.target_space
+    assert movement.player.team is compiled.away_team
+
+
+def test_compiled_replay_has_rosters(home_team, away_team, tmp_path):
+    home_team.get_player(1).skills.append(Skills.DODGE)
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    path = tmp_path / "match.bbrc"
+    write_compiled_replay(Replay(home_team, away_team, cmds, log_entries), path)
+
+    compiled = CompiledReplay(path)
+    for team, compiled_team in zip([home_team, away_team], compiled.get_teams()):
+        assert compiled_team.name == team.name
+        assert compiled_team.team_type == team.team_type
+        assert compiled_team.rerolls == team.rerolls
+        assert [(player.slot, player.number, player.name, player.skills) for player in compiled_team.get_players()] \
+            == [(player.slot, player.number, player.name, player.skills) for player in team.get_players()]
+
+
+def test_compiled_replay_seeks_to_turn(home_team, away_team, tmp_path):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    path = tmp_path / "match.bbrc"
+    write_compiled_replay(replay, path)
+    expected = [_describe(event) for event in replay.events(snapshots=True, from_turn=2)]
+
+    events = [_describe(event) for event in CompiledReplay(path).events(from_turn=2)]
+    assert events[0][0] == "StartTurn"
+    assert events == expected
+    assert not list(CompiledReplay(path).events(from_turn=3))
+
+
+def test_compiled_replay_boards_match_through_blocks_and_drives(home_team, away_team, tmp_path):
+    cmds, log_entries = create_eventful_match(home_team, away_team)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    path = tmp_path / "match.bbrc"
+    write_compiled_replay(replay, path)
+    expected = [(_describe(event), describe_board(event.board) if getattr(event, 'board', None) else None)
+                for event in replay.events(snapshots=True)]
+
+    events = [(_describe(event), describe_board(event.board) if getattr(event, 'board', None) else None)
+              for event in CompiledReplay(path).events()]
+    assert events == expected
+    assert any(event[0][0] == "Touchdown" for event in events)
+    assert any(event[0][0] == "HalfTime" for event in events)
+
+
+def test_compiled_replay_rejects_snapshot_boards(home_team, away_team, tmp_path):
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    with open(tmp_path / "match.bbrc", 'wb') as f:
+        writer = CompiledReplayWriter(f, replay.get_teams())
+        with pytest.raises(ValueError, match="BoardSnapshot"):
+            for event in replay.events(snapshots=True):
+                writer.write_event(event)
+
+
+def test_compiled_replay_rejects_other_files(tmp_path):
+    path = tmp_path / "match.bbrc"
+    path.write_bytes(b"SQLite format 3\x00")
+    with pytest.raises(ValueError):
+        CompiledReplay(path)
+
+
+def test_compiled_replay_deltas_rebuild_board(board):
+    home_team, away_team = board.teams
+    player = home_team.get_player(0)
+    opponent = away_team.get_player(0)
+    board.set_position(Position(5, 5), player)
+    board.set_position(Position(6, 6), opponent)
+    keyframe = board.checkpoint()
+    board.move(player, Position(5, 5), Position(5, 6))
+    board.set_prone(opponent)
+    board.reset_position(Position(6, 6))
+    board.set_ball_carrier(player)
+    board.score[0] += 1
+    frame = board.checkpoint()
+
+    delta = _frame_delta(keyframe, frame)
+    # Only the changed parts of the board are in the delta
+    assert len(delta) < 2 * len(frame)
+    _apply_frame_delta(keyframe, delta)
+    restored = GameState(home_team, away_team, TeamType.HOME)
+    restored.restore(keyframe)
+    assert restored.checkpoint() == frame
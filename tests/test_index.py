@@ -0,0 +1,88 @@
+from . import *
+from bbreplay import Position, TeamType
+from bbreplay.index import IndexEntry, PositionIndex
+from bbreplay.replay import *
+from bbreplay.state import GameState
+
+
+def test_board_hash_depends_on_layout_not_history(board):
+    home_team, away_team = board.teams
+    player = home_team.get_player(0)
+    empty_hash = board.board_hash
+    board.set_position(Position(1, 1), player)
+    assert board.board_hash != empty_hash
+    board.move(player, Position(1, 1), Position(2, 2))
+    board.move(player, Position(2, 2), Position(1, 1))
+    board.set_prone(player)
+    prone_hash = board.board_hash
+    board.unset_prone(player)
+    assert board.board_hash != prone_hash
+
+    other_board = GameState(home_team, away_team, TeamType.HOME)
+    other_board.set_position(Position(1, 1), home_team.get_player(1))
+    assert other_board.board_hash == board.board_hash
+    board.reset_position(Position(1, 1))
+    assert board.board_hash == empty_hash
+
+
+def test_board_hash_includes_ball(board):
+    home_team, _ = board.teams
+    player = home_team.get_player(0)
+    board.set_position(Position(1, 1), player)
+    player_hash = board.board_hash
+    board.set_ball_position(Position(1, 1))
+    loose_hash = board.board_hash
+    board.set_ball_carrier(player)
+    carried_hash = board.board_hash
+    assert len({player_hash, loose_hash, carried_hash}) == 3
+    board.move(player, Position(1, 1), Position(2, 2))
+    board.set_ball_carrier(None)
+    board.move(player, Position(2, 2), Position(1, 1))
+    board.set_ball_position(Position(1, 1))
+    assert board.board_hash == loose_hash
+    board.set_ball_position(OFF_PITCH_POSITION)
+    assert board.board_hash == player_hash
+
+
+def test_mirrored_board_hash_matches_inverted_layout(home_team, away_team):
+    board = GameState(home_team, away_team, TeamType.HOME)
+    inverted_board = GameState(home_team, away_team, TeamType.HOME)
+    positions = [Position(7, 10), Position(0, 12), Position(14, 3)]
+    for i, position in enumerate(positions):
+        board.set_position(position, home_team.get_player(i))
+        inverted_board.set_position(position.invert(), home_team.get_player(i))
+    board.set_ball_position(Position(3, 20))
+    inverted_board.set_ball_position(Position(3, 20).invert())
+    assert board.board_hash != inverted_board.board_hash
+    assert board.mirrored_board_hash == inverted_board.board_hash
+    assert inverted_board.mirrored_board_hash == board.board_hash
+
+
+def test_board_hash_restored_from_checkpoint(board):
+    home_team, away_team = board.teams
+    board.set_position(Position(1, 1), home_team.get_player(0))
+    board.set_position(Position(5, 5), away_team.get_player(0))
+    board.set_prone(away_team.get_player(0))
+    board.set_ball_carrier(home_team.get_player(0))
+    restored = GameState(home_team, away_team, TeamType.HOME)
+    restored.restore(board.checkpoint())
+    assert restored.board_hash == board.board_hash
+    assert restored.mirrored_board_hash == board.mirrored_board_hash
+    assert board.snapshot().board_hash == board.board_hash
+
+
+def test_index_finds_repeated_layouts(home_team, away_team):
+    index = PositionIndex()
+    for replay_id in ["first", "second"]:
+        cmds, log_entries = create_match(home_team, away_team, 2)
+        index.add_replay(replay_id, Replay(home_team, away_team, cmds, log_entries))
+    assert len(index) == 6
+
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    setup = next(event for event in replay.events() if isinstance(event, SetupComplete))
+    matches = index.find(setup.board.board_hash)
+    assert matches == [IndexEntry("first", "SetupComplete", 1, TeamType.AWAY),
+                       IndexEntry("second", "SetupComplete", 1, TeamType.AWAY)]
+    assert not index.find_mirrored(setup.board.board_hash)
+    assert index.find_mirrored(setup.board.mirrored_board_hash) == matches
@@ -1,7 +1,8 @@
 from bbreplay import ActionResult, ScatterDirection, TeamType
 from bbreplay.log import ApothecaryLogEntry, ArmourValueRollEntry, BlockLogEntry, BounceLogEntry, CatchEntry, \
     DodgeEntry, FireballEntry, FoulAppearanceEntry, GoingForItEntry, InjuryRollEntry, RerollEntry, SkillEntry, \
-    TurnOverEntry, WildAnimalEntry, parse_log_entry, parse_log_entry_lines, CasualtyRollEntry
+    TurnOverEntry, WildAnimalEntry, parse_log_entry, parse_log_entry_lines, CasualtyRollEntry, \
+    MatchLogEntry, parse_match_log_entry_lines, iter_log_entry_lines
 
 
 STARTING_LINE = "|  +- Enter CStateMatchTossCreateResults"
@@ -372,3 +373,46 @@ def test_parse_log_entries():
 
     assert log_entries[0] == DodgeEntry(TeamType.HOME, 3, "3+", "0", ActionResult.FAILURE.name)
     assert log_entries[1] == DodgeEntry(TeamType.HOME, 3, "3+", "6", ActionResult.SUCCESS.name)
+
+
+def test_parse_match_log_entry_stops_at_match_entry():
+    log_lines = STARTING_LINES + \
+        [
+            "|  | GameLog(-1): Home Halflings(HOM) vs Away Amazons(AWY)",
+        ] \
+        + ENDING_LINES
+    # Anything after the match entry would fail if it was parsed
+    match_log_entry = parse_match_log_entry_lines(iter(log_lines + [None]))
+    assert isinstance(match_log_entry, MatchLogEntry)
+    assert match_log_entry.home_name == "Home Halflings"
+    assert match_log_entry.away_abbrev == "AWY"
+
+
+def test_parse_match_log_entry_not_first():
+    log_lines = STARTING_LINES + \
+        [
+            "|  | GameLog(-1): WAR suffer a TURNOVER! : Knocked Down!",
+            "|  | GameLog(-1): Home Halflings(HOM) vs Away Amazons(AWY)",
+        ] \
+        + ENDING_LINES
+    assert parse_match_log_entry_lines(log_lines) is None
+
+
+def test_iter_log_entries_releases_entries_before_the_end():
+    log_lines = STARTING_LINES + \
+        [
+            "|  | GameLog(02): WAR #05 Pinky Injury  : 6 + 3 = 9 -> KO'd",
+            "|  | GameLog(-1): WAR suffer a TURNOVER! : Knocked Down!",
+        ] \
+        + ENDING_LINES + STARTING_LINES + \
+        [
+            "|  | GameLog(13): WAR call on their Apothecary to attempt to heal #05 Pinky.",
+            "|  | GameLog(02): WAR #05 Pinky Armour Value  (9+) : 6 + 5 = 11 -> Success",
+            "|  | GameLog(02): WAR #05 Pinky Injury  : 6 + 3 = 9 -> KO'd",
+        ]
+    lines = iter(log_lines)
+    log_entries = iter_log_entry_lines(lines)
+    assert isinstance(next(log_entries), InjuryRollEntry)
+    assert isinstance(next(log_entries), TurnOverEntry)
+    # The rest of the log hadn't been needed yet
+    assert next(lines, None) is not None
@@ -0,0 +1,134 @@
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+import pytest
+import metrics
+from metrics import MeasureOptions, measure_replay, measure_replays, measure_replays_in_processes
+from . import *
+
+OPTIONS = MeasureOptions(None, None, False, False, False, False, None)
+_measure_replay = metrics.measure_replay
+
+# The pool tests replace measure_replay() in the worker processes, which only works when they are forked
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason="Workers need to be forked to use the fake measure_replay()")
+
+
+def _write_replay(tmp_path, name, commands=3):
+    db_path = tmp_path / f"{name}.db"
+    log_path = tmp_path / f"{name}.log"
+    db = sqlite3.connect(db_path)
+    db.execute('CREATE TABLE Replay_NetCommands (ID INTEGER)')
+    db.executemany('INSERT INTO Replay_NetCommands VALUES (?)', [(i,) for i in range(commands)])
+    db.commit()
+    db.close()
+    log_path.write_text("")
+    return str(db_path), log_path
+
+
+def _fake_measure_replay(db_path, log_path, options):
+    # Each replay's name says how its fake measurement behaves
+    name = Path(db_path).stem
+    if name.startswith('hang'):
+        time.sleep(60)
+    elif name.startswith('crash'):
+        os._exit(1)
+    elif name.startswith('error'):
+        raise ValueError("Bad replay")
+    elif name.startswith('corrupt'):
+        return _measure_replay(db_path, log_path, options)
+    elif name.startswith('exit'):
+        # Exit once the result has been sent, so the worker dies while it is idle
+        threading.Timer(0.1, os._exit, [1]).start()
+    return {'commands': 3, 'events': 1, 'processed': 3, 'unprocessed': 0, 'proportion': 1.0, 'name': name}
+
+
+def test_measure_replays_records_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'measure_replay', _fake_measure_replay)
+    good = _write_replay(tmp_path, "good")
+    corrupt_db = tmp_path / "corrupt.db"
+    corrupt_db.write_bytes(b"not a database" * 100)
+    corrupt = (str(corrupt_db), tmp_path / "corrupt.log")
+    corrupt[1].write_text("")
+
+    results = dict(measure_replays([corrupt, good], OPTIONS))
+    assert results[corrupt[0]]['processed'] == 0
+    assert results[corrupt[0]]['commands'] == 0
+    assert results[corrupt[0]]['failure'] == "sqlite3.DatabaseError: file is not a database"
+    # A failure doesn't stop the other replays being measured
+    assert 'failure' not in results[good[0]]
+
+
+def test_measure_replay_traces_failures(tmp_path, monkeypatch, home_team, away_team):
+    cmds, log_entries = create_match_with_unknown_command(home_team, away_team)
+    teams = {TeamType.HOME: home_team, TeamType.AWAY: away_team}
+    monkeypatch.setattr(metrics, 'create_team', lambda db, team_type: teams[team_type])
+    monkeypatch.setattr(metrics, 'create_commands', lambda db: cmds)
+    monkeypatch.setattr(metrics, 'parse_log_entries', lambda log_path: log_entries)
+    db_path, log_path = _write_replay(tmp_path, "replay", commands=len(cmds))
+
+    result = measure_replay(db_path, log_path, OPTIONS)
+    assert 'replay_trace' not in result
+
+    result = measure_replay(db_path, log_path, OPTIONS._replace(trace=3))
+    assert result['error'].startswith("NotImplementedError")
+    assert len(result['replay_trace']) == 3
+    assert result['replay_trace'][-1].startswith("EndTurnCommand")
+    assert 0 < result['processed'] < result['commands']
+
+
+@needs_fork
+def test_measure_replays_in_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'measure_replay', _fake_measure_replay)
+    replays = [_write_replay(tmp_path, f"good{i}") for i in range(5)]
+
+    results = dict(measure_replays_in_processes(replays, OPTIONS, 2))
+    assert {db_path: result['name'] for db_path, result in results.items()} == \
+        {db_path: Path(db_path).stem for db_path, _ in replays}
+
+
+@needs_fork
+def test_measure_replays_in_processes_times_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'measure_replay', _fake_measure_replay)
+    hang = _write_replay(tmp_path, "hang", commands=4)
+    good = _write_replay(tmp_path, "good")
+
+    start = time.monotonic()
+    results = dict(measure_replays_in_processes([hang, good], OPTIONS, 2, timeout=1))
+    assert time.monotonic() - start < 30
+    assert results[hang[0]] == {'commands': 4, 'events': 0, 'processed': 0, 'unprocessed': 4, 'proportion': 0.0,
+                                'timeout': True}
+    assert results[good[0]]['name'] == "good"
+
+
+@needs_fork
+def test_measure_replays_in_processes_records_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'measure_replay', _fake_measure_replay)
+    crash = _write_replay(tmp_path, "crash", commands=2)
+    error = _write_replay(tmp_path, "error")
+    good = _write_replay(tmp_path, "good")
+
+    # One job, so the later replays are measured by the worker that failed or by its replacement
+    results = dict(measure_replays_in_processes([crash, error, good], OPTIONS, 1))
+    assert results[crash[0]]['processed'] == 0
+    assert results[crash[0]]['failure'] == "Process ended without a result (exit code 1)"
+    assert results[error[0]]['failure'] == "ValueError: Bad replay"
+    assert results[good[0]]['name'] == "good"
+
+
+@needs_fork
+def test_measure_replays_in_processes_replaces_dead_idle_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'measure_replay', _fake_measure_replay)
+    exit_replay = _write_replay(tmp_path, "exit")
+    good = _write_replay(tmp_path, "good")
+
+    measured = measure_replays_in_processes([exit_replay, good], OPTIONS, 1)
+    db_path, result = next(measured)
+    assert result['name'] == "exit"
+    # Give the idle worker time to exit before the next replay is sent to it
+    time.sleep(1)
+    db_path, result = next(measured)
+    assert (db_path, result['name']) == (good[0], "good")
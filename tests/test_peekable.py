@@ -1,5 +1,5 @@
 import pytest
-from bbreplay import Peekable
+from bbreplay import Peekable, TraceBuffer, format_trace
 
 CONTENTS = [1, 2, 3]
 
@@ -51,3 +51,45 @@ def test_peek_at_completion(peekable):
     for _ in peekable:
         pass
     assert peekable.peek() is None
+
+
+def test_peek_ahead(peekable):
+    assert peekable.peek(3) == 3
+    assert peekable.peek(4) is None
+    assert peekable.peek(2) == 2
+    assert next(peekable) == 1
+    assert peekable.peek(2) == 3
+    assert list(peekable) == [2, 3]
+
+
+def test_peek_with_none_items():
+    peekable = Peekable([None, 1])
+    assert peekable.peek() is None
+    assert peekable.peek(3, "end") == "end"
+    assert next(peekable) is None
+    assert next(peekable) == 1
+    assert peekable.peek(default="end") == "end"
+
+
+def test_consumed_count(peekable):
+    assert peekable.consumed == 0
+    peekable.peek(2)
+    assert peekable.consumed == 0
+    next(peekable)
+    next(peekable)
+    assert peekable.consumed == 2
+    list(peekable)
+    assert peekable.consumed == 3
+
+
+def test_trace_buffer_keeps_last_consumed():
+    trace = TraceBuffer(2)
+    numbers = trace(i for i in CONTENTS)
+    letters = trace(c for c in "ab")
+    assert next(numbers) == 1
+    assert numbers.peek() == 2
+    assert next(letters) == "a"
+    assert next(numbers) == 2
+    # Peeked items aren't in the trace until they're consumed and the oldest items are dropped
+    assert trace.get_items() == [(0, "a"), (1, 2)]
+    assert format_trace(trace.get_items()) == ["str 0: a", "int 1: 2"]
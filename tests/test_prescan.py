@@ -0,0 +1,75 @@
+from bbreplay import TeamType
+from bbreplay.command import EndTurnCommand
+from bbreplay.log import KickDirectionLogEntry, TurnOverEntry
+from bbreplay.prescan import prescan
+from bbreplay.replay import Replay, StartTurn
+from . import *
+
+
+def _remove_end_turn(cmds, turn):
+    return [cmd for cmd in cmds if not (isinstance(cmd, EndTurnCommand) and cmd.turn == turn)]
+
+
+def test_prescan_aligned_match(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    report = prescan(cmds, log_entries)
+    assert report.kickoff_commands == 1
+    assert report.kickoff_entries == 1
+    assert report.end_turn_commands == 4
+    assert report.turnover_entries == 0
+    assert [(turn.turn, turn.team, turn.end_turn_command) for turn in report.turns] == \
+        [(0, TeamType.AWAY, True), (1, TeamType.HOME, True), (2, TeamType.AWAY, True), (3, TeamType.HOME, True)]
+    assert not report.problems
+
+
+def test_prescan_turnover_matches_turn_without_end_turn(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    cmds = _remove_end_turn(cmds, 1)
+    log_entries.append(TurnOverEntry(TeamType.HOME, "Time limit exceeded!"))
+    report = prescan(cmds, log_entries)
+    assert report.end_turn_commands == 3
+    assert report.turnover_entries == 1
+    assert not report.problems
+
+
+def test_prescan_predicts_missing_turnover(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    cmds = _remove_end_turn(cmds, 1)
+    report = prescan(cmds, log_entries)
+    assert len(report.problems) == 1
+    problem = report.problems[0]
+    assert problem.drive == 0
+    assert problem.turn == 1
+    assert problem.team == TeamType.HOME
+
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    last_turn = None
+    try:
+        for event in replay.events():
+            if isinstance(event, StartTurn):
+                last_turn = event
+    except Exception:  # Running out of log entries is a RuntimeError rather than a ValueError
+        pass
+    else:
+        assert False, "Expected processing to fail"
+    assert last_turn.team == problem.team
+
+
+def test_prescan_predicts_unused_turnover(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    log_entries.append(TurnOverEntry(TeamType.HOME, "Time limit exceeded!"))
+    report = prescan(cmds, log_entries)
+    assert len(report.problems) == 1
+    assert report.problems[0].turn == 3
+    assert "1 more turnovers" in report.problems[0].message
+
+
+def test_prescan_kickoff_count_mismatch(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    log_entries.append(KickDirectionLogEntry(TeamType.AWAY, "1", 1))
+    report = prescan(cmds, log_entries)
+    assert report.kickoff_commands == 1
+    assert report.kickoff_entries == 2
+    assert len(report.problems) == 1
+    assert report.problems[0].drive == 1
+    assert "kick-off" in report.problems[0].message
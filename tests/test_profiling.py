@@ -0,0 +1,74 @@
+from bbreplay import Position, ScatterDirection, ThrowInDirection
+from bbreplay.log import BounceLogEntry, ThrowInDirectionLogEntry, ThrowInDistanceLogEntry
+from bbreplay.profiling import ReplayProfiler
+from bbreplay.replay import Replay, Bounce, EndTurn, Movement, ThrowIn
+from . import *
+
+
+def test_profiler_records_process_methods(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    expected = [type(event) for event in Replay(home_team, away_team, cmds, log_entries).events()]
+
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    profiler = ReplayProfiler()
+    profiler.attach(replay)
+    assert [type(event) for event in replay.events()] == expected
+
+    stats = profiler.get_stats()
+    assert stats['_process_kickoff']['calls'] == 1
+    # The last turn is the one that the match is abandoned in
+    assert stats['_process_turn']['calls'] == 5
+    assert stats['_process_movement']['calls'] == 4
+    assert stats['_process_movement']['events'] == expected.count(Movement)
+    assert stats['_process_turn']['events'] > stats['_process_movement']['events']
+    assert stats['_process_turn']['time'] >= stats['_process_movement']['time'] > 0
+    assert '_process_block' not in stats
+
+
+def test_profiler_merges_stats(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    batch_profiler = ReplayProfiler()
+    for _ in range(2):
+        replay = Replay(home_team, away_team, cmds, log_entries)
+        profiler = ReplayProfiler()
+        profiler.attach(replay)
+        list(replay.events())
+        batch_profiler.merge(profiler.get_stats())
+    assert batch_profiler.get_stats()['_process_turn']['calls'] == 6
+
+
+def test_profiler_records_methods_that_return_generators(board):
+    home_team, away_team = board.teams
+    replay = Replay(home_team, away_team, [], [])
+    profiler = ReplayProfiler()
+    profiler.attach(replay)
+    board.set_position(Position(7, 12), home_team.get_player(0))
+    board.set_ball_position(Position(0, 7))
+    board.setup_complete()
+    log_entries = [
+        BounceLogEntry(ScatterDirection.W.value),
+        ThrowInDirectionLogEntry(ThrowInDirection.DOWN_PITCH.value),
+        ThrowInDistanceLogEntry(3),
+        BounceLogEntry(ScatterDirection.W.value)
+    ]
+    events = list(replay._process_ball_movement(iter_([]), iter_(log_entries), board))
+    assert [type(event) for event in events] == [Bounce, ThrowIn, Bounce]
+
+    stats = profiler.get_stats()
+    # _process_ball_movement returns the generator from the private __resolve_ball method
+    assert stats['_process_ball_movement']['calls'] == 1
+    assert stats['_process_ball_movement']['events'] == 3
+    assert stats['_process_ball_movement']['time'] > 0
+    assert stats['__resolve_ball']['events'] == 3
+
+
+def test_profiler_records_copies_used_by_filtered_events(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    profiler = ReplayProfiler()
+    profiler.attach(replay)
+    assert len(list(replay.events(include=[EndTurn]))) == 4
+
+    stats = profiler.get_stats()
+    assert stats['_process_turn']['calls'] == 5
+    assert stats['__process_movement_list']['calls'] == 4
@@ -169,7 +169,7 @@ def test_apothecary_not_used_for_stunned(board):
     assert event.result == InjuryRollResult.STUNNED
 
     assert not board.is_injured(player)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
     assert board.get_position(Position(6, 7)) == player
 
     assert not next(events, None)
@@ -316,3 +316,32 @@ def test_ghost_bounce_due_to_no_catch(board):
     assert event.end_space == Position(14, 11)
 
     assert not next(events, None)
+
+
+def test_long_prone_bounce_chain(board):
+    home_team, away_team = board.teams
+    player = home_team.get_player(0)
+    board.set_position(Position(7, 10), player)
+    board.set_prone(player)
+    opponent = away_team.get_player(0)
+    board.set_position(Position(7, 11), opponent)
+    board.set_prone(opponent)
+    replay = Replay(home_team, away_team, [], [])
+    board.set_ball_position(Position(7, 10))
+    board.setup_complete()
+    cmds = iter_([])
+    # Far more bounces between the prone players than the recursion limit would have allowed when each
+    # bounce was resolved with a nested generator
+    bounce_count = 2000
+    log_entries = [BounceLogEntry((ScatterDirection.N if i % 2 == 0 else ScatterDirection.S).value)
+                   for i in range(bounce_count)]
+    log_entries.append(BounceLogEntry(ScatterDirection.W.value))
+    log_entries_iter = iter_(log_entries)
+    events = list(replay._process_ball_movement(cmds, log_entries_iter, board))
+
+    assert len(events) == bounce_count + 1
+    assert all(isinstance(event, Bounce) for event in events)
+    assert events[-1].start_space == Position(7, 10)
+    assert events[-1].end_space == Position(6, 10)
+    assert board.get_ball_position() == Position(6, 10)
+    assert not next(log_entries_iter, None)
@@ -223,8 +223,8 @@ def test_blitz_pushback_fend_prevents_followup(board):
     assert event.player == opponent
     assert event.skill == Skills.FEND
 
-    assert player.position == Position(7, 7)
-    assert opponent.position == Position(9, 8)
+    assert board.get_player_position(player) == Position(7, 7)
+    assert board.get_player_position(opponent) == Position(9, 8)
 
     assert not board.is_prone(player)
     assert not board.is_prone(opponent)
@@ -286,8 +286,8 @@ def test_blitz_single_destination_pushback_fend_prevents_followup(board):
     assert event.player == opponent
     assert event.skill == Skills.FEND
 
-    assert player.position == Position(7, 7)
-    assert opponent.position == Position(9, 8)
+    assert board.get_player_position(player) == Position(7, 7)
+    assert board.get_player_position(opponent) == Position(9, 8)
 
     assert not board.is_prone(player)
     assert not board.is_prone(opponent)
@@ -414,8 +414,8 @@ def test_blitz_pushback_juggernaut_cancels_fend(board):
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(8, 7)
 
-    assert player.position == Position(8, 7)
-    assert opponent.position == Position(9, 8)
+    assert board.get_player_position(player) == Position(8, 7)
+    assert board.get_player_position(opponent) == Position(9, 8)
 
     assert not board.is_prone(player)
     assert not board.is_prone(opponent)
@@ -904,3 +904,18 @@ def test_failed_stupid_prevents_block(board):
     assert not next(events, None)
     assert not next(cmds, None)
     assert not next(log_entries, None)
+
+
+def test_pushbacks_skip_occupied_spaces(board):
+    home_team, _ = board.teams
+    board.set_position(Position(9, 8), home_team.get_player(1))
+    assert calculate_pushbacks(Position(7, 7), Position(8, 7), board) == [Position(9, 6), Position(9, 7)]
+    assert calculate_pushbacks(Position(7, 6), Position(8, 7), board) == [Position(9, 7), Position(8, 8)]
+
+
+def test_pushbacks_off_pitch_only_when_no_space(board):
+    home_team, _ = board.teams
+    assert calculate_pushbacks(Position(1, 4), Position(0, 5), board) == [Position(0, 6)]
+    board.set_position(Position(0, 6), home_team.get_player(1))
+    assert calculate_pushbacks(Position(1, 4), Position(0, 5), board) == [OFF_PITCH_POSITION]
+    assert calculate_pushbacks(Position(1, 5), Position(0, 5), board) == [OFF_PITCH_POSITION]
@@ -0,0 +1,123 @@
+import json
+import pytest
+from bbreplay import Peekable, Position
+from bbreplay.replay import Replay, EndTurn, StartTurn
+from bbreplay.state import GameState
+from bbreplay.testing import create_eventful_match
+from . import *
+
+
+def test_checkpoint_recorded_at_each_turn(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 6)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    for _ in replay.events():
+        pass
+    assert not replay.get_checkpoints()
+    for _ in replay.events(checkpoints=True):
+        pass
+    checkpoints = replay.get_checkpoints()
+    assert [(checkpoint.turn, checkpoint.team) for checkpoint in checkpoints] == \
+        [(1, TeamType.AWAY), (1, TeamType.HOME), (2, TeamType.AWAY), (2, TeamType.HOME),
+         (3, TeamType.AWAY), (3, TeamType.HOME)]
+    assert json.loads(json.dumps(checkpoints[0].state)) == checkpoints[0].state
+
+
+def test_events_resume_from_checkpoint(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 6)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    full_events = [describe_event(event) for event in replay.events(checkpoints=True)]
+    assert replay.get_checkpoint(2).turn == 2
+    resumed_events = list(replay.events(from_turn=2))
+    assert isinstance(resumed_events[0], StartTurn)
+    assert resumed_events[0].number == 2
+    resumed_events = [describe_event(event) for event in resumed_events]
+    assert resumed_events == full_events[-len(resumed_events):]
+    assert full_events[-len(resumed_events) - 1][0] == 'EndTurn'
+
+
+def test_events_from_turn_without_checkpoints(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 6)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    events = list(replay.events(from_turn=3))
+    assert isinstance(events[0], StartTurn)
+    assert events[0].number == 3
+    assert len(events) == 7
+    assert not replay.get_checkpoints()
+
+
+def test_events_from_turn_same_with_and_without_checkpoints(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 6)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    skipped = [describe_event(event) for event in replay.events(from_turn=2)]
+    # Only record the checkpoints for the first turns, so resuming has to skip from the nearest one
+    for event in replay.events(checkpoints=True):
+        if isinstance(event, EndTurn):
+            break
+    assert [checkpoint.turn for checkpoint in replay.get_checkpoints()] == [1]
+    assert replay.get_checkpoint(2).turn == 1
+    assert replay.get_checkpoint(0) is None
+    assert [describe_event(event) for event in replay.events(from_turn=2)] == skipped
+
+
+def test_events_from_turn_through_blocks_and_drives(home_team, away_team):
+    cmds, log_entries = create_eventful_match(home_team, away_team)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    full_events = [(describe_event(event), describe_board(event.board) if getattr(event, 'board', None) else None)
+                   for event in replay.events(checkpoints=True)]
+    start_turns = [idx for idx, (event, _) in enumerate(full_events) if event[0] == 'StartTurn']
+    # Include turns after the blitz, the touchdown and half-time
+    for turn in range(2, 10):
+        expected = full_events[next(idx for idx in start_turns if full_events[idx][0][1]['number'] >= turn):]
+        for use_checkpoints in [True, False]:
+            resumed = replay if use_checkpoints else Replay(home_team, away_team, cmds, log_entries)
+            resumed_events = [(describe_event(event),
+                               describe_board(event.board) if getattr(event, 'board', None) else None)
+                              for event in resumed.events(from_turn=turn)]
+            assert resumed_events == expected
+
+
+def test_checkpoints_need_consumed_count(home_team, away_team):
+    class Lookahead:
+        # A generator with peek() but no consumed count
+        def __init__(self, data):
+            self.__peekable = Peekable(data)
+
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            return next(self.__peekable)
+
+        def peek(self):
+            return self.__peekable.peek()
+
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    replay.set_generator(Lookahead)
+    assert sum(1 for event in replay.events() if isinstance(event, EndTurn)) == 2
+    with pytest.raises(ValueError, match="consumed count"):
+        list(replay.events(checkpoints=True))
+
+
+def test_checkpoint_restores_state(board):
+    home_team, away_team = board.teams
+    player = home_team.get_player(0)
+    opponent = away_team.get_player(0)
+    board.set_position(Position(5, 5), player)
+    board.set_position(Position(6, 6), opponent)
+    board.setup_complete()
+    board.set_prone(opponent)
+    board.set_ball_carrier(player)
+    board.use_reroll(TeamType.HOME)
+    checkpoint = board.checkpoint()
+
+    restored = GameState(home_team, away_team, TeamType.HOME)
+    restored.restore(json.loads(json.dumps(checkpoint)))
+    assert restored.get_position(Position(5, 5)) == player
+    assert restored.get_position(Position(6, 6)) == opponent
+    assert restored.is_prone(opponent)
+    assert restored.get_ball_carrier() == player
+    assert restored.rerolls == board.rerolls
+    assert not restored.can_reroll(TeamType.HOME)
+    assert restored.get_tacklezones(TeamType.AWAY, Position(5, 5)) == 0
+    assert restored.checkpoint() == checkpoint
@@ -0,0 +1,121 @@
+import sqlite3
+import pytest
+from bbreplay import TeamType
+from bbreplay.command import CoinTossCommand
+from bbreplay.replay import LazyReplay, create_replay
+from bbreplay.teams import CoachType
+
+
+@pytest.fixture
+def replay_files(tmp_path):
+    db_path = tmp_path / "replay.db"
+    sqlite3.connect(db_path).close()
+    log_path = tmp_path / "replay.log"
+    log_path.write_text("")
+    return db_path, log_path
+
+
+@pytest.fixture
+def team_db_path(tmp_path):
+    # Just enough of a replay database for the teams, without any players or commands
+    db_path = tmp_path / "teams.db"
+    db = sqlite3.connect(db_path)
+    db.execute("CREATE TABLE SavedGameInfo (Match_strSave TEXT)")
+    db.execute("INSERT INTO SavedGameInfo VALUES (?)",
+               ("<Match><Home><ePlayerType>0</ePlayerType></Home><Away><ePlayerType>1</ePlayerType></Away></Match>",))
+    for prefix, name, race in [("Home", "Home Halflings", "Halfling"), ("Away", "Away Amazons", "Amazon")]:
+        db.execute(f"CREATE TABLE {prefix}_Team_Listing (strName TEXT, idRaces INTEGER, iValue INTEGER, "
+                   "iPopularity INTEGER, iRerolls INTEGER, bApothecary INTEGER)")
+        db.execute(f"INSERT INTO {prefix}_Team_Listing VALUES (?, 1, 1000, 2, 3, 1)", (name,))
+        db.execute(f"CREATE TABLE {prefix}_Races (ID INTEGER, DATA_CONSTANT TEXT)")
+        db.execute(f"INSERT INTO {prefix}_Races VALUES (1, ?)", (race,))
+        db.execute(f"CREATE TABLE {prefix}_Player_Listing (ID INTEGER, iNumber INTEGER, strName TEXT, "
+                   "Characteristics_fMovementAllowance REAL, Characteristics_fStrength REAL, "
+                   "Characteristics_fAgility REAL, Characteristics_fArmourValue REAL, idPlayer_Levels INTEGER, "
+                   "iExperience INTEGER, iValue INTEGER, idPlayer_Types INTEGER)")
+        db.execute(f"CREATE TABLE {prefix}_Player_Type_Skills (idPlayer_Types INTEGER, idSkill_Listing INTEGER, "
+                   "description TEXT)")
+        db.execute(f"CREATE TABLE {prefix}_Player_Skills (idPlayer_Listing INTEGER, idSkill_Listing INTEGER)")
+    db.commit()
+    db.close()
+    return db_path
+
+
+def _write_log(log_path, match_line):
+    log_path.write_text("\n".join([
+        "|  +- Enter CStateMatchTossCreateResults",
+        "|  |  Team   : 1",
+        "|  |  Result : 0",
+        "|  +- Exit CStateMatchTossCreateResults",
+        "|  +- Enter CStateMatchSelectChoice",
+        f"|  | GameLog(-1): {match_line}",
+        "|  | GameLog(-1): This line is never parsed (",
+        "|  +- Exit CStateMatchSelectChoice",
+    ]))
+
+
+def test_lazy_replay_loads_teams_without_log_or_commands(team_db_path, tmp_path):
+    replay = LazyReplay(team_db_path, tmp_path / "missing.log")
+    home_team, away_team = replay.get_teams()
+    assert home_team.name == "Home Halflings"
+    assert home_team.race == "Halfling"
+    assert home_team.coach_type == CoachType.LOCAL
+    assert away_team.name == "Away Amazons"
+    assert away_team.coach_type == CoachType.AI
+    assert replay.get_team(TeamType.HOME) is home_team
+    # The database has no commands table, so they can't have been loaded yet
+    with pytest.raises(sqlite3.OperationalError):
+        list(replay.get_commands())
+
+
+def test_lazy_replay_validates_from_match_entry(team_db_path, tmp_path):
+    log_path = tmp_path / "replay.log"
+    _write_log(log_path, "Home Halflings(HOM) vs Away Amazons(AWY)")
+    replay = create_replay(team_db_path, log_path, lazy=True)
+    assert isinstance(replay, LazyReplay)
+    assert not replay.get_log_entries().loaded
+
+    _write_log(log_path, "Home Halflings(HOM) vs Other Amazons(AWY)")
+    with pytest.raises(ValueError):
+        create_replay(team_db_path, log_path, lazy=True)
+
+
+def test_create_replay_lazy_cannot_be_parallel(team_db_path, tmp_path):
+    with pytest.raises(ValueError):
+        create_replay(team_db_path, tmp_path / "replay.log", parallel=True, lazy=True)
+
+
+def test_create_replay_streaming(team_db_path, tmp_path):
+    db = sqlite3.connect(team_db_path)
+    db.execute("CREATE TABLE Replay_NetCommands (ID INTEGER, iTurn INTEGER, idPlayer INTEGER, iCommand INTEGER, "
+               "iData INTEGER)")
+    db.executemany("INSERT INTO Replay_NetCommands VALUES (?, 0, 2, 6, 0)", [(1,), (2,)])
+    db.commit()
+    db.close()
+    log_path = tmp_path / "replay.log"
+    _write_log(log_path, "Home Halflings(HOM) vs Away Amazons(AWY)")
+
+    replay = create_replay(team_db_path, log_path, streaming=True)
+    commands = replay.get_commands()
+    assert isinstance(next(commands), CoinTossCommand)
+    assert next(commands).id == 2
+    assert next(commands, None) is None
+    with pytest.raises(ValueError):
+        create_replay(team_db_path, log_path, streaming=True, lazy=True)
+
+
+def test_create_replay_missing_database(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        create_replay(tmp_path / "missing.db", tmp_path / "missing.log")
+
+
+def test_create_replay_unknown_parallel_mode(replay_files):
+    with pytest.raises(ValueError):
+        create_replay(*replay_files, parallel="fork")
+
+
+@pytest.mark.parametrize("parallel", [False, True, "thread", "process"])
+def test_create_replay_database_errors_are_raised(replay_files, parallel):
+    # Errors in the worker are raised in the caller, the same as when loading sequentially
+    with pytest.raises(sqlite3.OperationalError):
+        create_replay(*replay_files, parallel=parallel)
@@ -0,0 +1,26 @@
+from bbreplay.replay import Replay, EndTurn, Movement, TeamSetupComplete
+from . import *
+
+
+def test_events_include_and_exclude_types(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    all_events = [describe_event(event) for event in replay.events()]
+
+    included = [describe_event(event) for event in replay.events(include=[EndTurn, Movement])]
+    assert included == [event for event in all_events if event[0] in ["EndTurn", "Movement"]]
+
+    excluded = [describe_event(event) for event in replay.events(exclude=[Movement, TeamSetupComplete])]
+    assert excluded == [event for event in all_events if event[0] not in ["Movement", "TeamSetupComplete"]]
+
+
+def test_events_filter_still_changes_board(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    end_turns = list(replay.events(snapshots=True, include=[EndTurn]))
+    assert [end_turn.board.turn for end_turn in end_turns] == [1, 1, 2, 2]
+    for end_turn, expected in zip(end_turns, [event for event in replay.events(snapshots=True)
+                                              if isinstance(event, EndTurn)]):
+        assert end_turn.board.board_hash == expected.board.board_hash
+        assert end_turn.board.get_player_position(home_team.get_player(0)) == \
+            expected.board.get_player_position(home_team.get_player(0))
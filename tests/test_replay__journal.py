@@ -0,0 +1,53 @@
+import pytest
+from bbreplay.replay import Replay, EndTurn
+from bbreplay.testing import create_eventful_match
+from . import *
+
+
+def test_journal_steps_back_through_events(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    events = replay.events(journal=True)
+    board = None
+    checkpoints = []
+    for event in events:
+        if getattr(event, 'board', None):
+            board = event.board
+            checkpoints.append(board.checkpoint())
+        if isinstance(event, EndTurn) and event.number == 2:
+            break
+    for checkpoint in reversed(checkpoints[:-1]):
+        assert board.undo()
+        assert board.checkpoint() == checkpoint
+    assert not board.undo()
+    while board.redo():
+        pass
+    assert board.checkpoint() == checkpoints[-1]
+    remaining = [event for event in events if isinstance(event, EndTurn)]
+    assert [(event.team, event.number) for event in remaining] == [(TeamType.HOME, 2)]
+
+
+def test_journal_steps_back_and_forward_through_blocks_and_drives(home_team, away_team):
+    cmds, log_entries = create_eventful_match(home_team, away_team)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    board = None
+    states = []
+    for event in replay.events(journal=True):
+        if getattr(event, 'board', None):
+            board = event.board
+            states.append((board.checkpoint(), describe_board(board)))
+    for state in reversed(states[:-1]):
+        assert board.undo()
+        assert (board.checkpoint(), describe_board(board)) == state
+    assert not board.undo()
+    for state in states[1:]:
+        assert board.redo()
+        assert (board.checkpoint(), describe_board(board)) == state
+    assert not board.redo()
+
+
+def test_journal_cannot_be_used_with_snapshots(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    with pytest.raises(ValueError):
+        replay.events(snapshots=True, journal=True)
@@ -580,3 +580,48 @@ def test_riot_at_end_of_second_half_rolls_backwards(board):
     assert not next(cmds, None)
     assert not next(log_entries, None)
 
+
+def test_registered_kickoff_handler(board):
+    home_team, away_team = board.teams
+    replay = Replay(home_team, away_team, [], [])
+
+    def throw_a_rock(replay, kickoff_result, cmds, log_entries, board):
+        yield PlayerDown(home_team.get_player(0))
+
+    replay.register_kickoff_handler(KickoffEvent.THROW_A_ROCK, throw_a_rock)
+    cmds = iter_([])
+    log_entries = iter_([
+        KickoffEventLogEntry(KickoffEvent.THROW_A_ROCK.value)
+    ])
+    events = replay._process_kickoff_event(cmds, log_entries, board)
+
+    event = next(events)
+    assert isinstance(event, KickoffEventTuple)
+    assert event.result == KickoffEvent.THROW_A_ROCK
+
+    event = next(events)
+    assert isinstance(event, PlayerDown)
+    assert event.player == home_team.get_player(0)
+
+    assert not next(events, None)
+    assert replay.get_handler_counts() == {"throw_a_rock": 1}
+
+
+def test_team_setup_complete_positions_work_like_players(board):
+    home_team, away_team = board.teams
+    replay = Replay(home_team, away_team, [], [])
+    player = away_team.get_player(0)
+    cmds = iter_([
+        SetupCommand(1, 0, TeamType.AWAY, 0, [TeamType.AWAY.value, 0, 7, 15]),
+        SetupCompleteCommand(1, 0, TeamType.AWAY, 0, [])
+    ])
+    event = next(replay._process_team_setup(TeamType.AWAY, cmds, board))
+    assert isinstance(event, TeamSetupComplete)
+    [player_position] = event.player_positions
+    setup_player, position = player_position
+    assert setup_player is player
+    assert position == board.get_player_position(player)
+    # Code written when the event had a list of Players still works
+    assert player_position.position == position
+    assert player_position.number == player.number
+    assert player_position.name == player.name
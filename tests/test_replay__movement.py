@@ -16,7 +16,7 @@ def test_single_movement(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(0, 0)
     assert event.target_space == Position(1, 1)
-    assert player.position == Position(1, 1)
+    assert board.get_player_position(player) == Position(1, 1)
 
 
 def test_multi_movement(board):
@@ -41,8 +41,8 @@ def test_multi_movement(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
-    assert player.position == end_move
+        assert board.get_player_position(player) == expected_end
+    assert board.get_player_position(player) == end_move
     assert not board.is_prone(player)
     assert not next(events, None)
     assert not next(cmds_iter, None)
@@ -181,7 +181,7 @@ def test_move_from_prone_defender_is_not_dodge(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
 
     assert not board.is_prone(player)
     assert not next(events, None)
@@ -202,7 +202,7 @@ def test_move_from_stupid_defender_is_not_dodge(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
 
     assert not board.is_prone(player)
     assert not next(events, None)
@@ -231,7 +231,7 @@ def test_single_successful_dodge(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
 
     assert not board.is_prone(player)
     assert not next(events, None)
@@ -276,7 +276,7 @@ def test_single_failed_dodge(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
     assert board.is_prone(player)
 
     event = next(events)
@@ -327,7 +327,7 @@ def test_single_failed_dodge_with_ball(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
 
     event = next(events)
     assert isinstance(event, Bounce)
@@ -390,7 +390,7 @@ def test_single_failed_dodge_into_ball(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
     assert board.is_prone(player)
 
     event = next(events)
@@ -449,7 +449,7 @@ def test_single_failed_dodge_with_more_moves(board):
         assert event.target_space == expected_end
 
     assert board.is_prone(player)
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
 
     event = next(events)
     assert isinstance(event, EndTurn)
@@ -507,7 +507,7 @@ def test_failed_leap_onto_ball(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(8, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
     assert board.is_prone(player)
 
     event = next(events)
@@ -535,7 +535,7 @@ def test_standup_is_not_dodge(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(7, 7)
-    assert player.position == Position(7, 7)
+    assert board.get_player_position(player) == Position(7, 7)
     assert not board.is_prone(player)
 
     assert not next(events, None)
@@ -570,7 +570,7 @@ def test_going_for_it_success(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -585,7 +585,7 @@ def test_going_for_it_success(board):
     assert event.source_space == expected_start
     assert event.target_space == expected_end
 
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert not board.is_prone(player)
     assert not next(events, None)
     assert not next(cmds_iter, None)
@@ -623,7 +623,7 @@ def test_going_for_it_success_with_dodge(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -643,7 +643,7 @@ def test_going_for_it_success_with_dodge(board):
     assert event.source_space == expected_start
     assert event.target_space == expected_end
 
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert not board.is_prone(player)
     assert not next(events, None)
     assert not next(cmds_iter, None)
@@ -684,7 +684,7 @@ def test_going_for_it_fail_no_reroll(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -708,7 +708,7 @@ def test_going_for_it_fail_no_reroll(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert board.is_prone(player)
 
     event = next(events)
@@ -753,7 +753,7 @@ def test_going_for_it_fail_with_ball(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
     move += 1
 
     event = next(events)
@@ -778,7 +778,7 @@ def test_going_for_it_fail_with_ball(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert board.is_prone(player)
 
     event = next(events)
@@ -829,7 +829,7 @@ def test_going_for_it_fail_reroll(board):
         assert event == Movement(player, expected_start, expected_end, board)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -864,7 +864,7 @@ def test_going_for_it_fail_reroll(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert board.is_prone(player)
 
     event = next(events)
@@ -906,7 +906,7 @@ def test_going_for_it_fail_success_on_reroll(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -932,9 +932,9 @@ def test_going_for_it_fail_success_on_reroll(board):
     assert isinstance(event, Movement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == expected_end
+    assert board.get_player_position(player) == expected_end
 
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert not board.is_prone(player)
 
     assert not next(events, None)
@@ -977,7 +977,7 @@ def test_going_for_it_fail_first_success_on_reroll(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -1003,7 +1003,7 @@ def test_going_for_it_fail_first_success_on_reroll(board):
     assert isinstance(event, Movement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == expected_end
+    assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -1018,9 +1018,9 @@ def test_going_for_it_fail_first_success_on_reroll(board):
     assert isinstance(event, Movement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == expected_end
+    assert board.get_player_position(player) == expected_end
 
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert not board.is_prone(player)
 
     assert not next(events, None)
@@ -1063,7 +1063,7 @@ def test_going_for_it_twice_fail_first_no_reroll(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -1087,7 +1087,7 @@ def test_going_for_it_twice_fail_first_no_reroll(board):
         assert isinstance(event, FailedMovement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == end_move
+        assert board.get_player_position(player) == end_move
         assert board.is_prone(player)
 
     event = next(events)
@@ -1133,7 +1133,7 @@ def test_going_for_it_twice_fail_second_no_reroll(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -1148,7 +1148,7 @@ def test_going_for_it_twice_fail_second_no_reroll(board):
     assert isinstance(event, Movement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == expected_end
+    assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -1172,7 +1172,7 @@ def test_going_for_it_twice_fail_second_no_reroll(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert board.is_prone(player)
 
     event = next(events)
@@ -1217,7 +1217,7 @@ def test_going_for_it_twice_fail_second_success_on_reroll(board):
         assert isinstance(event, Movement)
         assert event.source_space == expected_start
         assert event.target_space == expected_end
-        assert player.position == expected_end
+        assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -1232,7 +1232,7 @@ def test_going_for_it_twice_fail_second_success_on_reroll(board):
     assert isinstance(event, Movement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == expected_end
+    assert board.get_player_position(player) == expected_end
 
     event = next(events)
     assert isinstance(event, Action)
@@ -1258,8 +1258,8 @@ def test_going_for_it_twice_fail_second_success_on_reroll(board):
     assert isinstance(event, Movement)
     assert event.source_space == expected_start
     assert event.target_space == expected_end
-    assert player.position == expected_end
-    assert player.position == end_move
+    assert board.get_player_position(player) == expected_end
+    assert board.get_player_position(player) == end_move
     assert not board.is_prone(player)
 
     assert not next(events, None)
@@ -1298,7 +1298,7 @@ def test_single_failed_tentacled(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(7, 7)
+    assert board.get_player_position(player) == Position(7, 7)
     assert not board.is_prone(player)
 
     assert not next(events, None)
@@ -1323,7 +1323,7 @@ def test_standup_is_not_tentacled(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(7, 7)
-    assert player.position == Position(7, 7)
+    assert board.get_player_position(player) == Position(7, 7)
     assert not board.is_prone(player)
 
     assert not next(events, None)
@@ -1345,7 +1345,7 @@ def test_move_from_prone_defender_is_not_tentacled(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
 
     assert not board.is_prone(player)
     assert not next(events, None)
@@ -1380,7 +1380,7 @@ def test_single_sucessful_break_tentacled(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(6, 7)
-    assert player.position == Position(6, 7)
+    assert board.get_player_position(player) == Position(6, 7)
 
     assert not next(events, None)
 
@@ -1425,7 +1425,7 @@ def test_single_failed_tentacled_with_more_moves(board):
         assert event.source_space == expected_start
         assert event.target_space == expected_end
 
-    assert player.position == end_move
+    assert board.get_player_position(player) == end_move
     assert not board.is_prone(player)
     assert not next(events, None)
 
@@ -1460,7 +1460,7 @@ def test_leap_success(board):
     assert isinstance(event, Movement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(9, 7)
-    assert player.position == Position(9, 7)
+    assert board.get_player_position(player) == Position(9, 7)
 
     assert not board.is_prone(player)
     assert not next(events, None)
@@ -1511,7 +1511,7 @@ def test_leap_failure(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(9, 7)
-    assert player.position == Position(9, 7)
+    assert board.get_player_position(player) == Position(9, 7)
     assert board.is_prone(player)
 
     event = next(events)
@@ -1567,21 +1567,21 @@ def test_leap_failure_with_more_movement(board):
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(7, 7)
     assert event.target_space == Position(9, 7)
-    assert player.position == Position(9, 7)
+    assert board.get_player_position(player) == Position(9, 7)
     assert board.is_prone(player)
 
     event = next(events)
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(9, 7)
     assert event.target_space == Position(10, 7)
-    assert player.position == Position(9, 7)
+    assert board.get_player_position(player) == Position(9, 7)
     assert board.is_prone(player)
 
     event = next(events)
     assert isinstance(event, FailedMovement)
     assert event.source_space == Position(10, 7)
     assert event.target_space == Position(11, 7)
-    assert player.position == Position(9, 7)
+    assert board.get_player_position(player) == Position(9, 7)
     assert board.is_prone(player)
 
     event = next(events)
@@ -0,0 +1,16 @@
+from bbreplay.replay import Replay, Movement
+from . import *
+
+
+def test_concurrent_event_streams_share_teams(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    expected = [(describe_event(event), event.board.get_player_position(event.player))
+                for event in replay.events(snapshots=True) if isinstance(event, Movement)]
+    first = replay.events()
+    second = replay.events()
+    next(first)
+    for event_1, event_2 in zip(first, second):
+        if isinstance(event_2, Movement):
+            assert (describe_event(event_2), event_2.board.get_player_position(event_2.player)) == expected.pop(0)
+    assert not expected
@@ -0,0 +1,96 @@
+import pytest
+from bbreplay import KickoffEvent, Position, ScatterDirection
+from bbreplay.log import PickupEntry, ArmourValueRollEntry, BounceLogEntry, KickoffEventLogEntry
+from bbreplay.command import TargetPlayerCommand
+from bbreplay.replay import Replay, AbandonMatch, EndTurn, Movement, ProcessingError, StartTurn, END_REASON_ERROR
+from bbreplay.testing import create_eventful_match
+from . import *
+
+
+def test_events_without_recovery_stop_at_error(home_team, away_team):
+    cmds, log_entries = create_match_with_unknown_command(home_team, away_team)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    with pytest.raises(NotImplementedError):
+        list(replay.events())
+
+
+def test_events_recover_from_failed_turn(home_team, away_team):
+    cmds, log_entries = create_match_with_unknown_command(home_team, away_team)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    player = home_team.get_player(0)
+    events = list(replay.events(snapshots=True, recover=True))
+
+    errors = [event for event in events if isinstance(event, ProcessingError)]
+    assert len(errors) == 1
+    assert errors[0].team == TeamType.HOME
+    assert errors[0].turn == 1
+    assert errors[0].error_type == "NotImplementedError"
+
+    end_turns = [event for event in events if isinstance(event, EndTurn)]
+    assert [(end_turn.team, end_turn.reason) for end_turn in end_turns] == [
+        (TeamType.AWAY, "End Turn"), (TeamType.HOME, END_REASON_ERROR),
+        (TeamType.AWAY, "End Turn"), (TeamType.HOME, "End Turn")]
+    # The skipped movement still happened, so the next movement starts from the right place
+    assert end_turns[1].board.get_player_position(player) == Position(2, 9)
+    movements = [event for event in events if isinstance(event, Movement) and event.player == player]
+    assert [(movement.source_space, movement.target_space) for movement in movements] == \
+        [(Position(2, 9), Position(2, 10))]
+    assert isinstance(events[-1], AbandonMatch)
+
+
+def test_events_recover_applies_skipped_log_entries(home_team, away_team):
+    cmds, log_entries = create_match_with_unknown_command(home_team, away_team)
+    player = home_team.get_player(0)
+    # The skipped turn's log has the player picking up the ball, then being knocked down and dropping it
+    log_entries.extend([PickupEntry(TeamType.HOME, player.number, 3, 4, "Success"),
+                        ArmourValueRollEntry(TeamType.HOME, player.number, 8, 5, "Failure"),
+                        BounceLogEntry(ScatterDirection.E.value)])
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    events = replay.events(snapshots=True, recover=True)
+    end_turn = next(event for event in events if isinstance(event, EndTurn) and event.reason == END_REASON_ERROR)
+    board = end_turn.board
+    assert board.is_prone(player)
+    assert board.get_ball_carrier() is None
+    assert board.get_ball_position() == board.get_player_position(player).add(1, 0)
+
+
+def test_events_recover_from_failed_kickoff(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    kickoff_event = next(idx for idx, log_entry in enumerate(log_entries)
+                         if isinstance(log_entry, KickoffEventLogEntry))
+    log_entries[kickoff_event] = KickoffEventLogEntry(KickoffEvent.THROW_A_ROCK.value)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    with pytest.raises(NotImplementedError):
+        list(replay.events())
+
+    events = list(replay.events(recover=True))
+    assert isinstance(events[-1], ProcessingError)
+    assert events[-1].team == TeamType.HOME
+    assert events[-1].error_type == "NotImplementedError"
+    assert not any(isinstance(event, StartTurn) for event in events)
+
+
+def test_events_recover_from_failed_blitz_turn(home_team, away_team):
+    cmds, log_entries = create_eventful_match(home_team, away_team)
+    expected = _describe_from_turn(Replay(home_team, away_team, cmds, log_entries).events(snapshots=True), 2)
+    blitz_idx = next(i for i, cmd in enumerate(cmds) if isinstance(cmd, TargetPlayerCommand))
+    cmds.insert(blitz_idx, DiceChoiceCommand(0, cmds[blitz_idx].turn, TeamType.HOME, 19, [TeamType.HOME.value, 0, 0]))
+    events = list(Replay(home_team, away_team, cmds, log_entries).events(snapshots=True, recover=True))
+
+    errors = [event for event in events if isinstance(event, ProcessingError)]
+    assert [(error.team, error.turn) for error in errors] == [(TeamType.HOME, 1)]
+    end_turn = next(event for event in events if isinstance(event, EndTurn) and event.reason == END_REASON_ERROR)
+    # The skipped blitz pushed the away player, knocked them down and bounced the ball
+    assert end_turn.board.get_player_position(home_team.get_player(0)) == Position(8, 12)
+    assert end_turn.board.get_player_position(away_team.get_player(0)) == Position(9, 13)
+    assert end_turn.board.is_prone(away_team.get_player(0))
+    assert end_turn.board.get_ball_position() == Position(10, 13)
+    assert _describe_from_turn(events, 2) == expected
+
+
+def _describe_from_turn(events, number):
+    events = list(events)
+    start = next(i for i, event in enumerate(events)
+                 if isinstance(event, StartTurn) and event.team == TeamType.AWAY and event.number == number)
+    return [(describe_event(event), describe_board(event.board) if getattr(event, 'board', None) else None)
+            for event in events[start:]]
@@ -0,0 +1,44 @@
+import itertools
+from bbreplay.replay import Replay, EndTurn, Movement
+from . import *
+
+
+def test_run_calls_handlers_for_event_types(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    expected = [describe_event(event) for event in replay.events() if isinstance(event, (Movement, EndTurn))]
+    handled = []
+    replay.run({Movement: lambda event: handled.append(describe_event(event)),
+                EndTurn: lambda event: handled.append(describe_event(event))})
+    assert handled == expected
+
+
+def test_run_from_turn(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    end_turns = []
+    replay.run({EndTurn: end_turns.append}, from_turn=2)
+    assert [(event.team, event.number) for event in end_turns] == [(TeamType.AWAY, 2), (TeamType.HOME, 2)]
+
+
+def test_skipping_events_does_not_affect_other_streams(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    events = replay.events()
+    movements = [event for event in itertools.islice(events, 12) if isinstance(event, Movement)]
+    end_turns = list(replay.events(include=[EndTurn]))
+    movements.extend(event for event in events if isinstance(event, Movement))
+    assert len(end_turns) == 4
+    assert len(movements) == 4
+
+
+def test_run_skipping_events_does_not_affect_other_streams(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    events = replay.events()
+    movements = [event for event in itertools.islice(events, 12) if isinstance(event, Movement)]
+    end_turns = []
+    replay.run({EndTurn: end_turns.append})
+    movements.extend(event for event in events if isinstance(event, Movement))
+    assert len(end_turns) == 4
+    assert len(movements) == 4
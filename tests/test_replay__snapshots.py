@@ -0,0 +1,55 @@
+from bbreplay import Position
+from bbreplay.replay import Replay, Block, Bounce, EndTurn, HalfTime, Movement, Pushback, Touchdown
+from bbreplay.state import BoardSnapshot
+from bbreplay.testing import create_eventful_match
+from . import *
+
+
+def test_events_share_live_board_by_default(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    movements = [event for event in replay.events() if isinstance(event, Movement)]
+    assert len(movements) == 4
+    assert all(movement.board is movements[0].board for movement in movements)
+
+
+def test_events_with_snapshots_keep_board_at_time_of_event(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 4)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    events = list(replay.events(snapshots=True))
+    movements = [event for event in events if isinstance(event, Movement)]
+    assert len(movements) == 4
+    for movement in movements:
+        assert isinstance(movement.board, BoardSnapshot)
+        assert movement.board.get_position(movement.target_space) == movement.player
+        assert not movement.board.get_position(movement.source_space)
+        assert movement.board.get_player_position(movement.player) == movement.target_space
+    end_turns = [event for event in events if isinstance(event, EndTurn)]
+    assert [end_turn.board.turn for end_turn in end_turns] == [1, 1, 2, 2]
+
+
+def test_snapshots_match_live_board_through_blocks_and_drives(home_team, away_team):
+    cmds, log_entries = create_eventful_match(home_team, away_team)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    live = [(describe_event(event), describe_board(event.board))
+            for event in replay.events() if getattr(event, 'board', None)]
+    events = list(replay.events(snapshots=True))
+    assert {Block, Pushback, Bounce, Touchdown, HalfTime} <= {type(event) for event in events}
+    snapshots = [(describe_event(event), describe_board(event.board))
+                 for event in events if getattr(event, 'board', None)]
+    assert snapshots == live
+
+
+def test_snapshots_share_unchanged_rows(board):
+    home_team, _ = board.teams
+    player = home_team.get_player(0)
+    board.set_position(Position(1, 1), player)
+    first = board.snapshot()
+    board.move(player, Position(1, 1), Position(2, 1))
+    second = board.snapshot()
+    assert first[1][1] == player
+    assert second[1][2] == player
+    assert first[1] is not second[1]
+    assert first[20] is second[20]
+    assert first.get_player_position(player) == Position(1, 1)
+    assert second.get_player_position(player) == Position(2, 1)
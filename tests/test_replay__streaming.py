@@ -0,0 +1,62 @@
+import tracemalloc
+import pytest
+from bbreplay.command import Command, EndMovementCommand
+from bbreplay.replay import Replay, EndTurn
+from . import *
+
+
+def stream_padded_match(home_team, away_team, padding):
+    """
+    Generate the commands of a short match with `padding` unknown commands after each movement, without
+    holding them all in memory at once
+    """
+    cmds, _ = create_match(home_team, away_team, 4)
+    for cmd in cmds:
+        yield cmd
+        if isinstance(cmd, EndMovementCommand):
+            for _ in range(padding):
+                yield Command(0, cmd.turn, cmd.team, 99, list(range(8)))
+
+
+def peak_memory(home_team, away_team, padding, streaming):
+    _, log_entries = create_match(home_team, away_team, 0)
+    tracemalloc.start()
+    try:
+        cmds = stream_padded_match(home_team, away_team, padding)
+        if not streaming:
+            cmds = list(cmds)
+        replay = Replay(home_team, away_team, cmds, iter(log_entries) if streaming else log_entries,
+                        streaming=streaming)
+        del cmds
+        for _ in replay.events():
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_streaming_memory_is_bounded(home_team, away_team):
+    short_peak = peak_memory(home_team, away_team, 100, True)
+    long_peak = peak_memory(home_team, away_team, 10000, True)
+    # A hundred times as many commands shouldn't need much more memory when they're released as they're used
+    assert long_peak < short_peak * 2
+    assert peak_memory(home_team, away_team, 10000, False) > long_peak * 10
+
+
+def test_streaming_events_only_once(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    replay = Replay(home_team, away_team, iter(cmds), iter(log_entries), streaming=True)
+    replay.validate()
+    events = list(replay.events())
+    assert sum(1 for event in events if isinstance(event, EndTurn)) == 2
+    assert not replay.get_checkpoints()
+    with pytest.raises(ValueError):
+        replay.events()
+
+
+def test_streaming_validate_team_mismatch(home_team, away_team):
+    cmds, log_entries = create_match(home_team, away_team, 2)
+    home_team.name = "Other Halflings"
+    replay = Replay(home_team, away_team, iter(cmds), iter(log_entries), streaming=True)
+    with pytest.raises(ValueError):
+        replay.validate()
@@ -47,7 +47,7 @@ def test_throwing_teammate_successful_landing(board):
     assert event.action == ActionType.LANDING
     assert event.result == ActionResult.SUCCESS
 
-    assert player_2.position == Position(10, 18)
+    assert board.get_player_position(player_2) == Position(10, 18)
     assert not board.is_prone(player_2)
 
     assert not next(events, None)
@@ -107,7 +107,7 @@ def test_throwing_teammate_failed_landing(board):
     assert event.player == player_2
     assert event.result == ActionResult.FAILURE
 
-    assert player_2.position == Position(10, 18)
+    assert board.get_player_position(player_2) == Position(10, 18)
     assert board.is_prone(player_2)
 
     assert not next(events, None)
@@ -160,7 +160,7 @@ def test_throwing_teammate_fumble_pickup_failed_landing(board):
     assert event.player == player_2
     assert event.result == ActionResult.FAILURE
 
-    assert player_2.position == Position(7, 11)
+    assert board.get_player_position(player_2) == Position(7, 11)
     assert board.is_prone(player_2)
 
     assert not next(events, None)
@@ -218,7 +218,7 @@ def test_throwing_teammate_successful_always_hungry(board):
     assert event.action == ActionType.LANDING
     assert event.result == ActionResult.SUCCESS
 
-    assert player_2.position == Position(10, 18)
+    assert board.get_player_position(player_2) == Position(10, 18)
     assert not board.is_prone(player_2)
 
     assert not next(events, None)
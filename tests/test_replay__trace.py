@@ -0,0 +1,43 @@
+import pytest
+from bbreplay import TraceBuffer
+from bbreplay.command import EndTurnCommand
+from bbreplay.replay import Replay
+from . import *
+
+
+def test_events_error_has_trace(home_team, away_team):
+    cmds, log_entries = create_match_with_unknown_command(home_team, away_team)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    replay.set_generator(TraceBuffer(3))
+    with pytest.raises(NotImplementedError) as ex:
+        list(replay.events())
+    trace = ex.value.replay_trace
+    assert len(trace) == 3
+    # The command that couldn't be processed was still waiting, so the last item is the end of the previous turn
+    index, item = trace[-1]
+    assert isinstance(item, EndTurnCommand)
+    assert item.team == TeamType.AWAY
+    assert cmds[index] is item
+
+
+def test_events_have_separate_traces(home_team, away_team):
+    cmds, log_entries = create_match_with_unknown_command(home_team, away_team)
+    replay = Replay(home_team, away_team, cmds, log_entries)
+    replay.set_generator(TraceBuffer(3))
+    first = replay.events()
+    for _ in range(5):
+        next(first)
+    first_items = first.trace.get_items()
+    assert first_items
+
+    second = replay.events()
+    with pytest.raises(NotImplementedError) as ex:
+        list(second)
+    assert ex.value.replay_trace == second.trace.get_items()
+    # The second stream neither cleared nor added to the first stream's trace
+    assert first.trace is not second.trace
+    assert first.trace.get_items() == first_items
+    with pytest.raises(NotImplementedError) as first_ex:
+        list(first)
+    assert [(index, type(item)) for index, item in first_ex.value.replay_trace] == \
+        [(index, type(item)) for index, item in ex.value.replay_trace]
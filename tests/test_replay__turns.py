@@ -35,3 +35,52 @@ def test_turnover_by_timeout_after_movement(board):
 
     assert not next(events, None)
     assert not next(log_entries, None)
+
+
+class CheerCommand(Command):
+    def __init__(self, id, turn, team, command_type, data):
+        super().__init__(id, turn, TeamType(team), command_type, data)
+
+
+def test_registered_command_handler(board):
+    home_team, away_team = board.teams
+    replay = Replay(home_team, away_team, [], [])
+    cheers = []
+
+    def handle_cheer(replay, cmd, prev_cmd_type, cmds, log_entries, board):
+        cheers.append(next(cmds))
+        return None
+
+    replay.register_command_handler(CheerCommand, handle_cheer)
+    cmds = iter_([
+        CheerCommand(1, 1, TeamType.HOME.value, 0, []),
+        CheerCommand(1, 1, TeamType.HOME.value, 0, []),
+        EndTurnCommand(1, 1, TeamType.HOME.value, 0, [TeamType.HOME.value])
+    ])
+    events = replay._process_turn(cmds, iter_([]), TeamType.HOME, board)
+
+    event = next(events)
+    assert isinstance(event, StartTurn)
+
+    event = next(events)
+    assert isinstance(event, EndTurn)
+    assert event.reason == "End Turn"
+
+    assert not next(events, None)
+    assert len(cheers) == 2
+    assert replay.get_handler_counts() == {"handle_cheer": 2, "_handle_end_turn": 1}
+
+
+def test_unregistered_command_raises(board):
+    home_team, away_team = board.teams
+    replay = Replay(home_team, away_team, [], [])
+    cmds = iter_([
+        CheerCommand(1, 1, TeamType.HOME.value, 0, [])
+    ])
+    events = replay._process_turn(cmds, iter_([]), TeamType.HOME, board)
+
+    event = next(events)
+    assert isinstance(event, StartTurn)
+
+    with pytest.raises(NotImplementedError):
+        next(events)
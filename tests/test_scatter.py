@@ -0,0 +1,25 @@
+from bbreplay import Position, PlayDirection, ScatterDirection, ThrowInDirection, scatter, throwin
+
+
+def test_scatter_on_pitch():
+    assert scatter(Position(7, 7), ScatterDirection.NW) == Position(6, 8)
+    assert scatter(Position(7, 7), ScatterDirection.SE, 6) == Position(13, 1)
+    assert scatter(Position(7, 7), ScatterDirection.E, 0) == Position(7, 7)
+
+
+def test_scatter_off_pitch():
+    assert scatter(Position(0, 7), ScatterDirection.W) == Position(-1, 7)
+    assert scatter(Position(0, 7), ScatterDirection.W).is_offpitch()
+    assert scatter(Position(-1, 7), ScatterDirection.SW, 2) == Position(-3, 5)
+    assert scatter(Position(7, 7), ScatterDirection.N, 20) == Position(7, 27)
+
+
+def test_throwin_from_sidelines():
+    assert throwin(Position(0, 7), PlayDirection.DOWN_PITCH, ThrowInDirection.DOWN_PITCH, 3) == Position(3, 4)
+    assert throwin(Position(0, 7), PlayDirection.UP_PITCH, ThrowInDirection.DOWN_PITCH, 3) == Position(3, 10)
+    assert throwin(Position(14, 7), PlayDirection.DOWN_PITCH, ThrowInDirection.CENTRE, 12) == Position(2, 7)
+    assert throwin(Position(14, 7), PlayDirection.DOWN_PITCH, ThrowInDirection.UP_PITCH, 12) == Position(2, 19)
+
+
+def test_throwin_away_from_sidelines():
+    assert throwin(Position(7, 0), PlayDirection.DOWN_PITCH, ThrowInDirection.CENTRE, 2) == Position(5, 0)
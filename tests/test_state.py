@@ -1,4 +1,4 @@
-from bbreplay import TeamType
+from bbreplay import PlayerStatus, TeamType
 from bbreplay.log import *
 from bbreplay.command import *
 from bbreplay.player import Player
@@ -128,3 +128,164 @@ def test_rerolls_regen_at_halftime(board):
     board.prepare_setup()
     board.setup_complete()
     assert board.rerolls[TeamType.HOME.value] == 3
+
+
+def test_row_view_reads_and_writes_board(board):
+    home_team, _ = board.teams
+    player = home_team.get_player(0)
+    board.set_position(Position(3, 7), player)
+    assert board[7][3] == player
+    assert board[7][-12] == player
+    assert list(board[7]).count(player) == 1
+    board[7][3] = None
+    assert not board.get_position(Position(3, 7))
+
+
+def test_surrounding_players_stay_on_pitch(board):
+    home_team, away_team = board.teams
+    board.set_position(Position(0, 1), home_team.get_player(0))
+    board.set_position(Position(14, 0), home_team.get_player(1))
+    board.set_position(Position(1, 0), away_team.get_player(0))
+    assert board.get_surrounding_players(Position(0, 0)) == [home_team.get_player(0), away_team.get_player(0)]
+    assert board.get_surrounding_players(Position(-1, 1)) == [home_team.get_player(0)]
+    assert not board.get_position(Position(-1, 0))
+
+
+def test_tacklezones_follow_player_movement(board):
+    _, away_team = board.teams
+    opponent = away_team.get_player(0)
+    board.set_position(Position(5, 5), opponent)
+    assert board.get_tacklezones(TeamType.AWAY, Position(4, 4)) == 1
+    assert board.get_tacklezones(TeamType.AWAY, Position(5, 5)) == 0
+    assert board.get_tacklezones(TeamType.HOME, Position(4, 4)) == 0
+    board.move(opponent, Position(5, 5), Position(6, 5))
+    assert board.get_tacklezones(TeamType.AWAY, Position(4, 4)) == 0
+    assert board.get_tacklezones(TeamType.AWAY, Position(7, 6)) == 1
+
+
+def test_tacklezones_removed_for_prone_and_stupid_players(board):
+    home_team, _ = board.teams
+    player_1 = home_team.get_player(0)
+    player_2 = home_team.get_player(1)
+    board.set_position(Position(5, 5), player_1)
+    board.set_position(Position(6, 6), player_2)
+    assert board.get_tacklezones(TeamType.HOME, Position(5, 6)) == 2
+    board.set_prone(player_1)
+    assert board.get_tacklezones(TeamType.HOME, Position(5, 6)) == 1
+    board.stupidity_test(player_2, ActionResult.FAILURE)
+    assert board.get_tacklezones(TeamType.HOME, Position(5, 6)) == 0
+    board.unset_prone(player_1)
+    board.stupidity_test(player_2, ActionResult.SUCCESS)
+    assert board.get_tacklezones(TeamType.HOME, Position(5, 6)) == 2
+    board.reset_position(Position(6, 6))
+    assert board.get_tacklezones(TeamType.HOME, Position(5, 6)) == 1
+
+
+def test_tacklezone_counts_match_tacklezones_and_follow_changes(board):
+    home_team, _ = board.teams
+    player_1 = home_team.get_player(0)
+    player_2 = home_team.get_player(1)
+    board.set_position(Position(5, 5), player_1)
+    board.set_position(Position(6, 6), player_2)
+    counts = board.get_tacklezone_counts(TeamType.HOME)
+    assert counts[Position(5, 6).idx] == 2
+    assert counts[Position(4, 4).idx] == 1
+    assert counts[Position(5, 5).idx] == 1
+    assert not any(board.get_tacklezone_counts(TeamType.AWAY))
+    assert board.get_tacklezones(TeamType.HOME, Position(5, 6)) == 2
+    board.set_prone(player_1)
+    assert board.get_tacklezone_counts(TeamType.HOME)[Position(5, 6).idx] == 1
+    assert board.get_tacklezones(TeamType.HOME, Position(5, 6)) == 1
+    board.move(player_2, Position(6, 6), Position(10, 10))
+    assert board.get_tacklezone_counts(TeamType.HOME)[Position(5, 6).idx] == 0
+    assert board.get_tacklezones(TeamType.HOME, Position(5, 6)) == 0
+
+
+def test_player_positions_are_independent_between_games(home_team, away_team):
+    board_1 = GameState(home_team, away_team, TeamType.HOME)
+    board_2 = GameState(home_team, away_team, TeamType.HOME)
+    player = home_team.get_player(0)
+    board_1.set_position(Position(1, 1), player)
+    board_2.set_position(Position(2, 2), player)
+    assert board_1.get_player_position(player) == Position(1, 1)
+    assert board_2.get_player_position(player) == Position(2, 2)
+    assert board_1.get_position(Position(2, 2)) is None
+    board_2.reset_position(Position(2, 2))
+    board_2.set_position(OFF_PITCH_POSITION, player)
+    assert board_1.is_on_pitch(player)
+    assert not board_2.is_on_pitch(player)
+
+
+def test_player_status_derived_from_state(board):
+    home_team, _ = board.teams
+    player = home_team.get_player(0)
+    board.set_position(Position(1, 1), player)
+    assert board.get_player_status(player) == PlayerStatus.OKAY
+    board.set_prone(player)
+    assert board.get_player_status(player) == PlayerStatus.PRONE
+    board.set_injured(player)
+    assert board.get_player_status(player) == PlayerStatus.INJURED
+
+
+def test_player_position_and_status_point_to_state(board):
+    home_team, _ = board.teams
+    player = home_team.get_player(0)
+    with pytest.raises(AttributeError, match="get_player_position"):
+        player.position
+    with pytest.raises(AttributeError, match="get_player_status"):
+        player.status
+
+
+def test_journal_undo_and_redo_steps(board):
+    home_team, away_team = board.teams
+    player = home_team.get_player(0)
+    opponent = away_team.get_player(0)
+    board.set_position(Position(5, 5), player)
+    board.set_position(Position(6, 6), opponent)
+    board.setup_complete()
+    board.kickoff()
+    board.enable_journal()
+    start = board.checkpoint()
+
+    board.start_turn(TeamType.HOME)
+    board.move(player, Position(5, 5), Position(4, 5))
+    board.set_ball_carrier(player)
+    board.end_step()
+    moved = board.checkpoint()
+
+    board.set_prone(player)
+    board.set_injured(opponent)
+    board.reset_position(Position(6, 6))
+    board.set_position(OFF_PITCH_POSITION, opponent)
+    board.use_reroll(TeamType.HOME)
+    board.use_apothecary(TeamType.AWAY)
+    board.end_turn(TeamType.HOME)
+    board.end_step()
+    ended = board.checkpoint()
+    ended_hash = board.board_hash
+
+    assert board.undo()
+    assert board.checkpoint() == moved
+    assert board.get_tacklezones(TeamType.AWAY, Position(5, 5)) == 1
+    assert board.undo()
+    assert board.checkpoint() == start
+    assert board.get_player_position(player) == Position(5, 5)
+    assert not board.undo()
+
+    assert board.redo()
+    assert board.redo()
+    assert not board.redo()
+    assert board.checkpoint() == ended
+    assert board.board_hash == ended_hash
+    assert board.get_tacklezones(TeamType.AWAY, Position(5, 5)) == 0
+
+
+def test_journal_blocks_changes_while_steps_are_undone(board):
+    home_team, _ = board.teams
+    player = home_team.get_player(0)
+    board.enable_journal()
+    board.set_position(Position(5, 5), player)
+    board.end_step()
+    board.undo()
+    with pytest.raises(ValueError):
+        board.set_position(Position(5, 5), player)